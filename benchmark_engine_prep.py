@@ -0,0 +1,105 @@
+"""
+Micro-benchmark: per-turn tool declaration / config preparation in AnuEngine.
+
+Compares building a new GenerateContentConfig from the registry's tool
+catalog on each tool-loop iteration with the engine's cached config, which
+is only rebuilt when the registry version changes.
+
+The engine gets a throwaway history in a temp directory and no summarizer,
+so the benchmark never touches the real conversation history.
+
+Usage:
+    python benchmark_engine_prep.py               # synthetic registry (45 tools)
+    python benchmark_engine_prep.py --skills      # load the real skills/ directory
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from google.genai import types
+from core.registry import SkillRegistry
+from core.conversation_history import ConversationHistory
+from core.engine import AnuEngine
+
+
+def build_synthetic_registry(num_tools: int) -> SkillRegistry:
+    registry = SkillRegistry()
+    for i in range(num_tools):
+        registry.register(
+            name=f"tool_{i}",
+            func=lambda **kwargs: "ok",
+            description=f"Synthetic tool number {i} used for benchmarking the engine",
+            parameters={
+                "query": {"type": "string", "description": "Free text query"},
+                "count": {"type": "integer", "description": "How many results"}
+            },
+            required=["query"]
+        )
+    return registry
+
+
+def uncached_prepare(engine: AnuEngine, iterations_per_turn: int):
+    """No config cache: a new config from the catalog on every iteration."""
+    for _ in range(iterations_per_turn):
+        gemini_tools = engine.registry.catalog.gemini_tools()
+        types.GenerateContentConfig(
+            system_instruction=engine.system_instruction,
+            tools=gemini_tools,
+            temperature=engine.temperature,
+            max_output_tokens=engine.max_output_tokens
+        )
+
+
+def cached_prepare(engine: AnuEngine, iterations_per_turn: int):
+    engine._get_generation_config()
+
+
+def time_it(func, engine, turns, iterations_per_turn) -> float:
+    start = time.perf_counter()
+    for _ in range(turns):
+        func(engine, iterations_per_turn)
+    return (time.perf_counter() - start) / turns * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-turn engine prep time")
+    parser.add_argument("--skills", action="store_true", help="Load the real skills directory")
+    parser.add_argument("--tools", type=int, default=45, help="Number of synthetic tools")
+    parser.add_argument("--turns", type=int, default=500, help="Number of simulated turns")
+    parser.add_argument("--iterations", type=int, default=2, help="Tool-loop iterations per turn")
+    args = parser.parse_args()
+
+    # The client is never used for network calls here
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+    if args.skills:
+        registry = SkillRegistry()
+        registry.load_skills(os.path.join(os.path.dirname(__file__), "skills"))
+    else:
+        registry = build_synthetic_registry(args.tools)
+
+    tmp = tempfile.mkdtemp(prefix="anu_prep_bench_")
+    history = ConversationHistory(history_file=os.path.join(tmp, "history.jsonl"),
+                                  legacy_file=os.path.join(tmp, "history.json"),
+                                  db_file=os.path.join(tmp, "history.db"))
+    engine = AnuEngine(registry, history=history, summarize=False)
+    num_tools = len(registry.get_tools_schema())
+
+    # Warm both paths once
+    uncached_prepare(engine, args.iterations)
+    cached_prepare(engine, args.iterations)
+
+    before = time_it(uncached_prepare, engine, args.turns, args.iterations)
+    after = time_it(cached_prepare, engine, args.turns, args.iterations)
+
+    print(f"Tools: {num_tools}, turns: {args.turns}, iterations/turn: {args.iterations}")
+    print(f"Before (build per iteration):   {before:.4f} ms/turn")
+    print(f"After  (cached by version):     {after:.4f} ms/turn")
+    if after > 0:
+        print(f"Speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
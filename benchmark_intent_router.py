@@ -0,0 +1,85 @@
+"""
+Offline accuracy / latency benchmark for the local intent router.
+
+Runs every utterance in fixtures/intent_utterances.json through
+IntentRouter.route() (no tools are executed) and reports:
+  - precision: dispatched utterances that hit the right tool and args
+  - recall:    fast-path utterances that were dispatched correctly
+  - false dispatches of utterances that should go to the LLM
+  - routing latency percentiles and histogram
+
+Usage:
+    python benchmark_intent_router.py [--threshold 0.8] [--fixtures path]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from core.registry import SkillRegistry
+from core.intent_router import IntentRouter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local intent router")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Confidence threshold")
+    parser.add_argument("--fixtures", default=os.path.join(os.path.dirname(__file__), "fixtures", "intent_utterances.json"))
+    parser.add_argument("--repeat", type=int, default=200, help="Latency repetitions per utterance")
+    args = parser.parse_args()
+
+    with open(args.fixtures, 'r') as f:
+        corpus = json.load(f)
+
+    registry = SkillRegistry()
+    registry.load_skills(os.path.join(os.path.dirname(__file__), "skills"))
+    router = IntentRouter(registry, threshold=args.threshold)
+
+    dispatched = correct = expected_fast = false_dispatch = 0
+    failures = []
+
+    for case in corpus:
+        match = router.route(case["text"])
+        if case["tool"]:
+            expected_fast += 1
+        if not match:
+            if case["tool"]:
+                failures.append((case["text"], case["tool"], None))
+            continue
+
+        dispatched += 1
+        if match["tool"] == case["tool"] and match["args"] == case.get("args", {}):
+            correct += 1
+        else:
+            if not case["tool"]:
+                false_dispatch += 1
+            failures.append((case["text"], case["tool"], match["tool"]))
+
+    # Latency (routing only)
+    timings = []
+    for case in corpus:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            router.classify(case["text"])
+            timings.append((time.perf_counter() - start) * 1_000_000)
+    timings.sort()
+
+    def percentile(p):
+        return timings[min(len(timings) - 1, int(len(timings) * p))]
+
+    print(f"Utterances: {len(corpus)} ({expected_fast} fast-path, {len(corpus) - expected_fast} LLM)")
+    print(f"Threshold: {args.threshold}")
+    print(f"Precision: {correct / dispatched if dispatched else 0.0:.2%} ({correct}/{dispatched})")
+    print(f"Recall:    {correct / expected_fast if expected_fast else 0.0:.2%} ({correct}/{expected_fast})")
+    print(f"False dispatches of LLM queries: {false_dispatch}")
+    print(f"Latency: p50 {percentile(0.5):.1f}us, p95 {percentile(0.95):.1f}us, p99 {percentile(0.99):.1f}us")
+    print(f"Histogram (route() calls): {router.latency_histogram()}")
+
+    if failures:
+        print("\nMismatches (text, expected, got):")
+        for failure in failures:
+            print(f"  {failure}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
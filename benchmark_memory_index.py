@@ -0,0 +1,86 @@
+"""
+Benchmark: memory similarity index.
+
+Indexes a synthetic memory store (paraphrased facts such as "my_bday" plus
+random filler facts) and reports:
+  - hit rate of paraphrased lookups ("birthday" -> "my_bday") at top-1
+  - incremental add/remove cost
+  - query latency (mean / p99) as the store grows
+
+Usage:
+    python benchmark_memory_index.py [--facts 5000] [--queries 1000]
+"""
+
+import sys
+import time
+import random
+import string
+import argparse
+from core.memory_index import MemoryIndex
+
+# (stored key, stored value, how the model might ask for it)
+PARAPHRASES = [
+    ("my_bday", "12 March", "birthday"),
+    ("wifi_pwd", "hunter2", "wifi password"),
+    ("favourite_color", "blue", "favorite colour"),
+    ("mom_phone", "+91 98765 43210", "mother phone number"),
+    ("car_model", "Honda City", "which car"),
+    ("dentist_appt", "Tuesday 4pm", "dentist appointment"),
+    ("home_addr", "12 Lake Road", "home address"),
+    ("gf_name", "Priya", "girlfriend name"),
+    ("anniv_date", "5 June", "anniversary"),
+    ("passport_no", "K1234567", "passport number"),
+]
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the memory similarity index")
+    parser.add_argument("--facts", type=int, default=5000, help="Filler facts to index")
+    parser.add_argument("--queries", type=int, default=1000, help="Timed queries")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocab = [random_word(rng) for _ in range(3000)]
+    index = MemoryIndex()
+
+    start = time.perf_counter()
+    for i in range(args.facts):
+        index.add(f"{rng.choice(vocab)}_{rng.choice(vocab)}_{i}", " ".join(rng.choices(vocab, k=6)))
+    for key, value, _ in PARAPHRASES:
+        index.add(key, value)
+    add_us = (time.perf_counter() - start) / (args.facts + len(PARAPHRASES)) * 1e6
+
+    hits = 0
+    for key, _, query in PARAPHRASES:
+        best = index.search(query, top_k=1)
+        hits += bool(best and best[0][1] == key)
+
+    queries = [" ".join(rng.choices(vocab, k=2)) for _ in range(args.queries)]
+    queries += [query for _, _, query in PARAPHRASES]
+    latencies = []
+    for query in queries:
+        t = time.perf_counter()
+        index.search(query, top_k=3)
+        latencies.append((time.perf_counter() - t) * 1e6)
+    latencies.sort()
+
+    start = time.perf_counter()
+    for key, value, _ in PARAPHRASES:
+        index.remove(key)
+        index.add(key, value)
+    update_us = (time.perf_counter() - start) / len(PARAPHRASES) * 1e6
+
+    print(f"Indexed facts:      {len(index)}")
+    print(f"Paraphrase hits@1:  {hits}/{len(PARAPHRASES)}")
+    print(f"Add (cold build):   {add_us:.0f} us/fact")
+    print(f"Update (rm + add):  {update_us:.0f} us/fact")
+    print(f"Query latency:      mean {sum(latencies) / len(latencies):.0f} us, "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.0f} us")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Benchmark: response cache hit rate.
+
+Replays a simulated week of everyday use (greetings, jokes, quick maths,
+small talk, follow-ups like "tell me another one", questions about the
+conversation itself, plus time-sensitive questions that are never cached)
+through ResponseCache and reports:
+  - hit rate with the current keys (prompt + tool set + recent context;
+    known standalone prompts leave the context out)
+  - hit rate when every key includes the recent context, for comparison
+  - stale answers: hits whose cached response differs from what the model
+    would have said in that context (should be 0)
+
+The "model" is a stand-in: prompts in STANDALONE_PROMPTS always get the
+same answer, everything else depends on the previous reply.
+
+Usage:
+    python benchmark_response_cache.py [--days 7] [--turns 40] [--seed 3]
+"""
+
+import os
+import sys
+import random
+import hashlib
+import argparse
+import tempfile
+from core.response_cache import ResponseCache
+
+# (prompt, weight, cacheable): cacheable turns are tool-free or use pure tools
+SESSION_PROMPTS = [
+    ("hello anu", 6, True),
+    ("good morning anu", 4, True),
+    ("thank you", 5, True),
+    ("tell me a joke", 6, True),
+    ("tell me a fun fact", 3, True),
+    ("motivate me", 2, True),
+    ("what is 15 percent of 200", 2, True),
+    ("convert 10 km to miles", 2, True),
+    ("how are you", 4, True),
+    ("who are you", 1, True),
+    ("what can you do", 1, True),
+    ("why is the sky blue", 1, True),
+    ("what did i just say", 1, True),
+    ("what is my name", 1, True),
+    ("summarize our conversation", 1, True),
+    ("what time is it", 6, False),
+    ("what's the weather", 4, False),
+    ("any new emails", 3, False),
+    ("what's on my calendar today", 2, False),
+]
+
+# Asked right after the previous answer; the reply depends on it
+FOLLOW_UPS = ["tell me another one", "why is that", "explain it again", "haha"]
+
+
+def model_reply(prompt: str, context):
+    if not ResponseCache.is_standalone(prompt) and context:
+        return f"{prompt} -> {hashlib.sha1(context[-1]['content'].encode()).hexdigest()[:8]}"
+    return f"answer to {ResponseCache.normalize(prompt)}"
+
+
+def legacy_key(cache: ResponseCache, prompt: str, context) -> str:
+    """Every key hashes the recent context, standalone prompts included."""
+    context_text = "\n".join(f"{m['role']}:{m['content']}" for m in context)
+    context_hash = hashlib.sha256(context_text.encode("utf-8")).hexdigest()
+    raw = f"{cache.normalize(prompt)}|{context_hash}|1"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def build_session(rng: random.Random, days: int, turns: int):
+    prompts = [p for p, _, _ in SESSION_PROMPTS]
+    weights = [w for _, w, _ in SESSION_PROMPTS]
+    cacheable = {p: c for p, _, c in SESSION_PROMPTS}
+    sessions = []
+    for _ in range(days):
+        day = []
+        while len(day) < turns:
+            prompt = rng.choices(prompts, weights)[0]
+            day.append((prompt, cacheable[prompt]))
+            if rng.random() < 0.2:
+                day.append((rng.choice(FOLLOW_UPS), True))
+        sessions.append(day)
+    return sessions
+
+
+def replay(sessions, make_key, cache_file: str):
+    cache = ResponseCache(cache_file=cache_file, context_messages=2)
+    stale = 0
+    for day in sessions:
+        history = []
+        for prompt, cacheable in day:
+            context = history[-cache.context_messages:]
+            key = make_key(cache, prompt, context)
+            expected = model_reply(prompt, context)
+            cached = cache.get(key)
+            if cached is not None:
+                stale += cached != expected
+                response = cached
+            else:
+                response = expected
+                if cacheable:
+                    cache.put(key, response)
+            history += [{"role": "user", "content": prompt}, {"role": "assistant", "content": response}]
+    return cache.stats(), stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the response cache hit rate")
+    parser.add_argument("--days", type=int, default=7, help="Simulated days (history resets daily)")
+    parser.add_argument("--turns", type=int, default=40, help="Turns per day")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    sessions = build_session(random.Random(args.seed), args.days, args.turns)
+    total = sum(len(day) for day in sessions)
+    tmp = tempfile.mkdtemp(prefix="anu_cache_bench_")
+
+    current, stale = replay(sessions, lambda c, p, ctx: c.make_key(p, ctx, 1),
+                            os.path.join(tmp, "current.json"))
+    legacy, legacy_stale = replay(sessions, legacy_key, os.path.join(tmp, "legacy.json"))
+
+    print(f"{args.days} days x ~{args.turns} turns ({total} prompts)")
+    print(f"Current keys:        hit rate {current['hit_rate']:.1%} ({current['hits']}/{total}), "
+          f"{stale} stale answers")
+    print(f"Context in every key: hit rate {legacy['hit_rate']:.1%} ({legacy['hits']}/{total}), "
+          f"{legacy_stale} stale answers")
+    return 1 if stale else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Startup benchmark: eager vs. lazy (manifest-driven) skill loading.
+
+Each measurement runs a fresh interpreter so import costs are cold, and
+times SkillRegistry.load_skills() plus the imports it triggers.
+
+Usage:
+    python benchmark_startup.py [--runs 5]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+from core.registry import SkillRegistry
+registry = SkillRegistry()
+registry.load_skills({skills_dir!r}, lazy={lazy})
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "tools": len(registry.get_tools_schema())}}))
+"""
+
+
+def run_once(lazy: bool) -> dict:
+    code = CHILD.format(skills_dir=os.path.join(ROOT, "skills"), lazy=lazy)
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    # The registry prints progress; the JSON line is last
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark eager vs lazy skill loading")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per mode")
+    args = parser.parse_args()
+
+    # Make sure the manifest exists and is current before timing lazy starts
+    run_once(lazy=True)
+
+    for lazy in (False, True):
+        samples = [run_once(lazy) for _ in range(args.runs)]
+        times = sorted(s["seconds"] * 1000 for s in samples)
+        label = "Lazy " if lazy else "Eager"
+        print(f"{label}: median {times[len(times) // 2]:.1f} ms, "
+              f"min {times[0]:.1f} ms, max {times[-1]:.1f} ms ({samples[0]['tools']} tools)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Benchmark: speech-to-text backends.
+
+Streams every WAV file in a fixture directory through each backend in 30 ms
+frames (as fast as possible, the way AudioCapture feeds them) and reports:
+  - real-time factor (decode time / audio duration; < 1 is faster than real time)
+  - final latency: time from the last frame to the final transcript, i.e. how
+    long the user waits after they stop talking
+  - first partial: how far into the utterance the first partial hypothesis
+    appeared (streaming backends only)
+  - word error rate, for files listed in transcripts.json
+
+Fixtures: 16-bit mono WAV files, plus an optional transcripts.json mapping
+file name -> reference text.
+
+Usage:
+    python benchmark_stt.py [--dir fixtures/stt] [--backends google vosk whisper_cpp]
+"""
+
+import os
+import sys
+import json
+import time
+import wave
+import argparse
+from core.stt import create_stt, STT_BACKENDS
+
+FRAME_MS = 30
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    # Word-level edit distance, one row at a time
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def load_fixtures(directory: str):
+    """[(name, sample rate, frames)] for every usable WAV in directory."""
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(".wav"):
+            continue
+        with wave.open(os.path.join(directory, name), 'rb') as f:
+            if f.getsampwidth() != 2 or f.getnchannels() != 1:
+                print(f"Skipping {name}: needs 16-bit mono")
+                continue
+            rate = f.getframerate()
+            data = f.readframes(f.getnframes())
+        step = rate * FRAME_MS // 1000 * 2
+        fixtures.append((name, rate, [data[i:i + step] for i in range(0, len(data), step)]))
+    return fixtures
+
+
+def run_backend(backend, fixtures, references):
+    audio_seconds = decode_seconds = 0.0
+    final_latencies, first_partials, errors = [], [], []
+    for name, rate, frames in fixtures:
+        audio_seconds += len(frames) * FRAME_MS / 1000
+        start = time.perf_counter()
+        session = backend.start_stream(rate)
+        first_partial = None
+        for i, frame in enumerate(frames):
+            if session.feed(frame) and first_partial is None:
+                first_partial = (i + 1) * FRAME_MS / 1000
+        finish_start = time.perf_counter()
+        text = session.finish()
+        end = time.perf_counter()
+
+        decode_seconds += end - start
+        final_latencies.append(end - finish_start)
+        if first_partial is not None:
+            first_partials.append(first_partial)
+        if name in references:
+            errors.append(word_error_rate(references[name], text))
+        print(f"   {name}: {text!r}")
+
+    final_latencies.sort()
+    return {
+        "rtf": decode_seconds / audio_seconds if audio_seconds else 0.0,
+        "latency_mean_ms": sum(final_latencies) / len(final_latencies) * 1000,
+        "latency_p95_ms": final_latencies[min(len(final_latencies) - 1, int(len(final_latencies) * 0.95))] * 1000,
+        "first_partial_s": sum(first_partials) / len(first_partials) if first_partials else None,
+        "wer": sum(errors) / len(errors) if errors else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speech-to-text backends")
+    parser.add_argument("--dir", default=os.path.join("fixtures", "stt"), help="Directory of WAV fixtures")
+    parser.add_argument("--backends", nargs="+", default=sorted(STT_BACKENDS), choices=sorted(STT_BACKENDS))
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        print(f"No fixture directory at {args.dir}: add 16-bit mono WAV files (and transcripts.json)")
+        sys.exit(1)
+    fixtures = load_fixtures(args.dir)
+    if not fixtures:
+        print(f"No usable WAV files in {args.dir}")
+        sys.exit(1)
+    references = {}
+    transcripts_file = os.path.join(args.dir, "transcripts.json")
+    if os.path.exists(transcripts_file):
+        with open(transcripts_file, 'r', encoding='utf-8') as f:
+            references = json.load(f)
+
+    total_audio = sum(len(frames) for _, _, frames in fixtures) * FRAME_MS / 1000
+    print(f"{len(fixtures)} fixtures, {total_audio:.1f} s of audio\n")
+
+    rows = []
+    for name in args.backends:
+        try:
+            backend = create_stt(name)
+        except Exception as e:
+            print(f"{name}: unavailable ({e})\n")
+            continue
+        print(f"{name}:")
+        rows.append((name, run_backend(backend, fixtures, references)))
+        print()
+
+    print(f"{'backend':<12} {'RTF':>6} {'final ms':>9} {'p95 ms':>8} {'1st partial s':>14} {'WER':>6}")
+    for name, r in rows:
+        partial = f"{r['first_partial_s']:.2f}" if r['first_partial_s'] is not None else "-"
+        wer = f"{r['wer']:.1%}" if r['wer'] is not None else "-"
+        print(f"{name:<12} {r['rtf']:>6.2f} {r['latency_mean_ms']:>9.0f} {r['latency_p95_ms']:>8.0f} {partial:>14} {wer:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: parallel tool execution.
+
+Reports:
+  - wall time of one model turn with N slow, independent tool calls, run
+    serially vs through ToolExecutor's pool
+  - a parallel-writes check: N remember_fact calls issued in one batch
+    through ToolExecutor, then counts the facts that actually reached the
+    memory file (should be all of them)
+
+The memory skill writes into a temporary HOME, never the real memory file.
+
+Usage:
+    python benchmark_tool_executor.py [--calls 8] [--delay 0.2] [--writes 150]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+
+
+class FakeCall:
+    """Stands in for a Gemini FunctionCall."""
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel tool execution")
+    parser.add_argument("--calls", type=int, default=8, help="Slow tool calls per turn")
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds each slow call takes")
+    parser.add_argument("--writes", type=int, default=150, help="Parallel remember_fact calls")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="anu_bench_")
+    os.environ["HOME"] = home
+
+    from core.registry import SkillRegistry
+    from core.tool_executor import ToolExecutor
+    from core.persistence import writer
+    from skills.memory_ops import MemorySkill
+
+    registry = SkillRegistry()
+    registry.register(name="slow_lookup", func=lambda query: time.sleep(args.delay) or query,
+                      description="Sleeps, then echoes the query",
+                      parameters={"query": {"type": "string", "description": "Text"}}, required=["query"])
+    memory = MemorySkill()
+    registry.register_skill(memory)
+    executor = ToolExecutor(registry, max_workers=max(4, args.calls))
+
+    calls = [FakeCall("slow_lookup", {"query": str(i)}) for i in range(args.calls)]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        executor.execute(calls)
+    parallel = time.perf_counter() - start
+    print(f"{args.calls} x {args.delay}s calls: serial ~{args.calls * args.delay:.2f}s, "
+          f"parallel {parallel:.2f}s")
+
+    writes = [FakeCall("remember_fact", {"key": f"fact_{i}", "value": str(i)}) for i in range(args.writes)]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        executor.execute(writes)
+    elapsed = time.perf_counter() - start
+    writer.flush()
+    with open(memory.memory_file, 'r') as f:
+        stored = json.load(f)
+    kept = sum(1 for i in range(args.writes) if stored.get(f"fact_{i}") == str(i))
+    print(f"Parallel writes:    {kept}/{args.writes} facts kept ({elapsed * 1000:.0f} ms)")
+
+    executor.shutdown()
+    return 0 if kept == args.writes else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Benchmark: top-k tool selection against a recorded query set.
+
+For every query in fixtures/tool_selection_queries.json, selects the top-k
+tool declarations with ToolSelector and reports:
+  - recall@k: queries whose expected tools were all selected
+  - how often the full set was sent (nothing scored as relevant)
+  - average declarations and estimated input tokens sent vs. the full set
+
+Usage:
+    python benchmark_tool_selection.py [--top-k 10] [--fixtures path]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from core.registry import SkillRegistry
+from core.tool_selector import ToolSelector, estimate_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark top-k tool selection")
+    parser.add_argument("--top-k", type=int, default=10, help="Number of tools to send")
+    parser.add_argument("--fixtures", default=os.path.join(os.path.dirname(__file__), "fixtures", "tool_selection_queries.json"))
+    args = parser.parse_args()
+
+    with open(args.fixtures, 'r') as f:
+        queries = json.load(f)
+
+    registry = SkillRegistry()
+    registry.load_skills(os.path.join(os.path.dirname(__file__), "skills"))
+    tools_schema = registry.get_tools_schema()
+    available = {t["function"]["name"] for t in tools_schema}
+
+    selector = ToolSelector(top_k=args.top_k)
+    selector.index(tools_schema, registry.version)
+
+    full_declarations = registry.catalog.gemini_declarations()
+    full_tokens = estimate_tokens(full_declarations)
+
+    hits = full_set = evaluated = 0
+    sent_tokens = sent_declarations = 0
+    misses = []
+    start = time.perf_counter()
+
+    for case in queries:
+        expected = [name for name in case["expected"] if name in available]
+        if not expected:
+            continue  # skill not loaded in this environment
+        evaluated += 1
+
+        selected = selector.select(case["query"])
+        if selected is None:
+            full_set += 1
+            hits += 1
+            declarations = full_declarations
+        else:
+            declarations = [d for d in full_declarations if d["name"] in selected]
+            if set(expected) <= selected:
+                hits += 1
+            else:
+                misses.append((case["query"], expected))
+
+        sent_declarations += len(declarations)
+        sent_tokens += estimate_tokens(declarations)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if not evaluated:
+        print("No queries could be evaluated (no matching skills loaded).")
+        return 1
+
+    print(f"Tools registered: {len(full_declarations)} (~{full_tokens} tokens)")
+    print(f"Queries evaluated: {evaluated}, top-k: {args.top_k}")
+    print(f"Recall@{args.top_k}: {hits / evaluated:.2%} ({hits}/{evaluated}), full set sent {full_set} times")
+    print(f"Avg declarations sent: {sent_declarations / evaluated:.1f} / {len(full_declarations)}")
+    print(f"Avg input tokens for tools: {sent_tokens / evaluated:.0f} vs {full_tokens} "
+          f"({1 - sent_tokens / (full_tokens * evaluated):.1%} saved)")
+    print(f"Selection time: {elapsed_ms / evaluated:.3f} ms/query")
+
+    if misses:
+        print("\nMissed (query, expected):")
+        for miss in misses:
+            print(f"  {miss}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
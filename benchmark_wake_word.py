@@ -0,0 +1,191 @@
+"""
+Benchmark: wake word spotter.
+
+Runs the streaming "anu" spotter over recorded clips and reports:
+  - false rejects: wake word clips it missed
+  - false accepts: clips without the wake word that it fired on (also per
+    hour of negative audio)
+  - the same two rates across a sweep of thresholds
+  - CPU cost of always-on listening: capture + VAD + spotter over an idle
+    stretch (background noise with some chatter), in CPU seconds per hour
+    of audio and % of one core
+
+Fixtures (16-bit mono WAV, 16 kHz):
+    <dir>/templates/*.wav   enrolled wake word samples
+    <dir>/positive/*.wav    clips containing the wake word
+    <dir>/negative/*.wav    speech / noise without it
+
+Without fixtures, --synthetic builds a stand-in keyword (a fixed tone
+pattern, varied in speed, pitch and noise) and confusable negatives, which
+exercises the pipeline but says nothing about accuracy on real voices.
+
+Usage:
+    python benchmark_wake_word.py [--dir fixtures/wake_word] [--synthetic] [--idle-minutes 10]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from core.audio_capture import AudioCapture
+from core.wake_word import WakeWordDetector, WakeWordGate, MFCCExtractor, read_wav, template_features
+
+SAMPLE_RATE = 16000
+FRAME_BYTES = SAMPLE_RATE * 30 // 1000 * 2
+
+
+def load_dir(directory: str):
+    if not os.path.isdir(directory):
+        return []
+    return [read_wav(os.path.join(directory, n)) for n in sorted(os.listdir(directory)) if n.lower().endswith(".wav")]
+
+
+# ============================================================
+# SYNTHETIC FIXTURES
+# ============================================================
+
+def tone_word(rng, pattern, stretch=1.0, pitch=1.0, noise=0.02) -> bytes:
+    """A 'word' made of (frequency, seconds) tone segments with harmonics."""
+    pieces = []
+    for freq, seconds in pattern:
+        t = np.arange(int(SAMPLE_RATE * seconds * stretch)) / SAMPLE_RATE
+        f = freq * pitch
+        pieces.append(0.3 * np.sin(2 * np.pi * f * t) + 0.15 * np.sin(4 * np.pi * f * t))
+    signal = np.concatenate(pieces)
+    signal *= np.hanning(len(signal)) ** 0.3
+    return _pcm(signal, rng, noise)
+
+
+def _pcm(signal, rng, noise, pad=0.3) -> bytes:
+    silence = np.zeros(int(SAMPLE_RATE * pad))
+    signal = np.concatenate((silence, signal, silence))
+    signal = signal + rng.normal(0, noise, len(signal))
+    return (np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+KEYWORD = [(420, 0.12), (800, 0.18), (560, 0.2)]
+OTHER_WORDS = [
+    [(560, 0.2), (800, 0.18), (420, 0.12)],
+    [(300, 0.25), (300, 0.25)],
+    [(420, 0.12), (420, 0.2), (900, 0.15)],
+    [(700, 0.1), (350, 0.1), (700, 0.1), (350, 0.1)],
+    [(1000, 0.3), (600, 0.2)],
+]
+
+
+def synthetic_fixtures(rng):
+    def varied(pattern):
+        return tone_word(rng, pattern, stretch=rng.uniform(0.8, 1.25), pitch=rng.uniform(0.94, 1.06),
+                         noise=rng.uniform(0.005, 0.04))
+    templates = [varied(KEYWORD) for _ in range(4)]
+    positives = [varied(KEYWORD) for _ in range(60)]
+    negatives = [varied(OTHER_WORDS[i % len(OTHER_WORDS)]) for i in range(120)]
+    return templates, positives, negatives
+
+
+# ============================================================
+# MEASUREMENTS
+# ============================================================
+
+def best_distance(detector: WakeWordDetector, pcm: bytes) -> float:
+    """Lowest distance the streaming detector sees anywhere in the clip."""
+    threshold, detector.threshold = detector.threshold, float("inf")
+    best = float("inf")
+    detector.reset()
+    for i in range(0, len(pcm), FRAME_BYTES):
+        distance = detector.process(pcm[i:i + FRAME_BYTES])
+        if distance is not None:
+            best = min(best, distance)
+    detector.threshold = threshold
+    return best
+
+
+class NullListener:
+    def speech_started(self):
+        pass
+
+    def speech_frame(self, frame):
+        pass
+
+    def speech_ended(self, overlapping=False):
+        pass
+
+
+def idle_cpu(detector: WakeWordDetector, chatter, minutes: float, rng):
+    """Feed an idle stretch through capture + gate; returns (capture, gate)."""
+    capture = AudioCapture()
+    gate = WakeWordGate(NullListener(), detector, follow_up_s=0, clock=lambda: capture.frames * 0.03)
+    capture.add_listener(gate)
+    total_frames = int(minutes * 60 * 1000 / 30)
+    noise = (rng.normal(0, 0.004, SAMPLE_RATE * 5) * 32767).astype("<i2").tobytes()
+    fed = 0
+    while fed < total_frames:
+        # Mostly background noise, with a chatter clip now and then
+        clip = chatter[rng.integers(len(chatter))] if chatter and rng.random() < 0.3 else noise
+        for i in range(0, len(clip) - FRAME_BYTES + 1, FRAME_BYTES):
+            capture.feed(clip[i:i + FRAME_BYTES])
+            fed += 1
+    return capture, gate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the wake word spotter")
+    parser.add_argument("--dir", default=os.path.join("fixtures", "wake_word"), help="Fixture directory")
+    parser.add_argument("--synthetic", action="store_true", help="Use generated stand-in clips")
+    parser.add_argument("--idle-minutes", type=float, default=10.0, help="Idle audio for the CPU measurement")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    if args.synthetic:
+        templates, positives, negatives = synthetic_fixtures(rng)
+        print("Synthetic fixtures (pipeline check only, not real-voice accuracy)")
+    else:
+        templates = load_dir(os.path.join(args.dir, "templates"))
+        positives = load_dir(os.path.join(args.dir, "positive"))
+        negatives = load_dir(os.path.join(args.dir, "negative"))
+        if not templates or not (positives or negatives):
+            print(f"No fixtures in {args.dir} (templates/, positive/, negative/); try --synthetic")
+            sys.exit(1)
+
+    extractor = MFCCExtractor(SAMPLE_RATE)
+    detector = WakeWordDetector([template_features(t, extractor) for t in templates])
+    print(f"{len(templates)} templates, {len(positives)} positive / {len(negatives)} negative clips, "
+          f"threshold {detector.threshold:.2f}\n")
+
+    start = time.perf_counter()
+    pos_scores = np.array([best_distance(detector, clip) for clip in positives])
+    neg_scores = np.array([best_distance(detector, clip) for clip in negatives])
+    elapsed = time.perf_counter() - start
+    clip_seconds = sum(len(c) for c in positives + negatives) / 2 / SAMPLE_RATE
+    neg_hours = sum(len(c) for c in negatives) / 2 / SAMPLE_RATE / 3600
+
+    def rates(threshold):
+        frr = float((pos_scores > threshold).mean()) if len(pos_scores) else 0.0
+        far = float((neg_scores <= threshold).mean()) if len(neg_scores) else 0.0
+        fa_per_hour = float((neg_scores <= threshold).sum()) / neg_hours if neg_hours else 0.0
+        return frr, far, fa_per_hour
+
+    frr, far, fa_per_hour = rates(detector.threshold)
+    print(f"At threshold {detector.threshold:.2f}: false reject {frr:.1%}, false accept {far:.1%} "
+          f"({fa_per_hour:.0f}/hour of negative audio)")
+    print(f"Spotter speed: {elapsed / clip_seconds:.3f}x real time over {clip_seconds:.0f} s of clips\n")
+
+    print(f"{'threshold':>9} {'false reject':>13} {'false accept':>13}")
+    for scale in (0.6, 0.8, 0.9, 1.0, 1.1, 1.25, 1.5):
+        threshold = detector.threshold * scale
+        frr, far, _ = rates(threshold)
+        print(f"{threshold:>9.2f} {frr:>13.1%} {far:>13.1%}")
+
+    capture, gate = idle_cpu(detector, negatives, args.idle_minutes, rng)
+    audio_hours = capture.frames * 30 / 1000 / 3600
+    per_hour = capture.cpu_seconds_per_hour()
+    spotter_per_hour = gate.cpu_seconds / audio_hours
+    print(f"\nIdle listening ({args.idle_minutes:g} min simulated, {gate.segments} speech segments, "
+          f"{gate.accepted} sent to STT):")
+    print(f"  capture + VAD + spotter: {per_hour:.1f} CPU s per hour ({per_hour / 36:.2f}% of one core)")
+    print(f"  of which spotter:        {spotter_per_hour:.1f} CPU s per hour")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+asyncio-native ANU engine
+Runs the agent loop on client.aio inside one long-lived event loop so the
+HTTP connection pool is shared for the lifetime of the process
+"""
+
+import asyncio
+import queue
+import threading
+from typing import AsyncIterator, Iterator, Optional
+from core.registry import SkillRegistry
+from core.conversation_history import ConversationHistory
+from core.engine import AnuEngine, MAX_ITERATIONS, NO_RESPONSE, TOO_MANY_STEPS, STEP_RETRY, STEP_TOOLS
+from core.response_cache import ResponseCache
+from core.intent_router import IntentRouter
+from core.tool_selector import ToolSelector
+from core.tracing import tracer
+
+
+class AsyncAnuEngine(AnuEngine):
+    def __init__(self, registry: SkillRegistry, response_cache: Optional[ResponseCache] = None,
+                 intent_router: Optional[IntentRouter] = None,
+                 tool_selector: Optional[ToolSelector] = None,
+                 history: Optional[ConversationHistory] = None, summarize: bool = True):
+        super().__init__(registry, response_cache=response_cache, intent_router=intent_router,
+                         tool_selector=tool_selector, history=history, summarize=summarize)
+
+        # One event loop for the whole process: client.aio keeps its
+        # connection pool bound to the loop it was first used on.
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="anu-async-engine", daemon=True)
+        self._loop_thread.start()
+
+    async def _off_loop(self, func, *args):
+        """Run blocking work (history / cache file I/O) off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    # ============================================================
+    # MAIN AGENT LOOP (ASYNC)
+    # ============================================================
+    # Same loop as AnuEngine.run_conversation / stream_conversation; the
+    # steps are shared and only the model calls and tool runs are awaited.
+
+    async def run_conversation_async(self, user_prompt: str) -> str:
+
+        match = self._route_intent(user_prompt)
+        if match:
+            function_responses = await self.tool_executor.execute_async([self._intent_call(match)])
+            return await self._off_loop(self._finish_intent, user_prompt, match, function_responses)
+
+        cache_key, cached = await self._off_loop(self._lookup_cache, user_prompt)
+        if cached is not None:
+            return cached
+
+        turn = await self._off_loop(self._start_turn, user_prompt, cache_key)
+
+        while turn.iteration < MAX_ITERATIONS:
+            turn.begin_iteration()
+
+            try:
+                with tracer.span("model_call", iteration=turn.iteration):
+                    response = await self.client.aio.models.generate_content(
+                        model=self.model_name,
+                        contents=turn.messages,
+                        config=turn.generation_config
+                    )
+            except Exception as e:
+                return self._model_error(e)
+
+            error = self._read_response(turn, response)
+            if error:
+                return error
+
+            step = self._next_step(turn)
+            if step == STEP_RETRY:
+                continue
+            if step == STEP_TOOLS:
+                self._add_tool_results(turn, await self.tool_executor.execute_async(turn.function_calls))
+                continue  # Loop again to get final response
+
+            if turn.text:
+                await self._off_loop(self._finish_turn, turn, turn.text)
+                return turn.text
+
+            return NO_RESPONSE
+
+        return TOO_MANY_STEPS
+
+    async def stream_conversation_async(self, user_prompt: str) -> AsyncIterator[str]:
+        """Async generator version of stream_conversation()."""
+        match = self._route_intent(user_prompt)
+        if match:
+            function_responses = await self.tool_executor.execute_async([self._intent_call(match)])
+            yield await self._off_loop(self._finish_intent, user_prompt, match, function_responses)
+            return
+
+        cache_key, cached = await self._off_loop(self._lookup_cache, user_prompt)
+        if cached is not None:
+            for sentence in self._cached_sentences(cached):
+                yield sentence
+            return
+
+        turn = await self._off_loop(self._start_turn, user_prompt, cache_key)
+
+        while turn.iteration < MAX_ITERATIONS:
+            turn.begin_iteration()
+
+            try:
+                stream = await self.client.aio.models.generate_content_stream(
+                    model=self.model_name,
+                    contents=turn.messages,
+                    config=turn.generation_config
+                )
+                async for chunk in stream:
+                    for sentence in self._read_chunk(turn, chunk):
+                        yield sentence
+            except Exception as e:
+                yield self._model_error(e)
+                return
+
+            for sentence in self._end_stream(turn):
+                yield sentence
+
+            step = self._next_step(turn)
+            if step == STEP_RETRY:
+                continue
+            if step == STEP_TOOLS:
+                self._add_tool_results(turn, await self.tool_executor.execute_async(turn.function_calls))
+                continue  # Loop again to get final response
+
+            if turn.full_response:
+                await self._off_loop(self._finish_turn, turn, turn.full_response)
+            else:
+                yield NO_RESPONSE
+            return
+
+        yield TOO_MANY_STEPS
+
+    # ============================================================
+    # SYNCHRONOUS WRAPPERS
+    # ============================================================
+
+    def run_conversation(self, user_prompt: str) -> str:
+        """Blocking wrapper around run_conversation_async for non-async callers."""
+        future = asyncio.run_coroutine_threadsafe(self.run_conversation_async(user_prompt), self._loop)
+        return future.result()
+
+    def stream_conversation(self, user_prompt: str) -> Iterator[str]:
+        """Blocking generator wrapper around stream_conversation_async."""
+        pending = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for sentence in self.stream_conversation_async(user_prompt):
+                    pending.put(sentence)
+            finally:
+                pending.put(done)
+
+        asyncio.run_coroutine_threadsafe(pump(), self._loop)
+
+        while True:
+            sentence = pending.get()
+            if sentence is done:
+                return
+            yield sentence
+
+    def close(self):
+        """Close the shared async client session and stop the event loop."""
+        async def _close():
+            aclose = getattr(self.client.aio, "aclose", None)
+            if aclose:
+                await aclose()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result(timeout=5)
+        except Exception as e:
+            print(f"Error closing async client: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.tool_executor.shutdown()
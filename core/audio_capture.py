@@ -0,0 +1,271 @@
+"""
+Continuous microphone capture for ANU
+One input stream stays open for the whole session; a background thread reads
+fixed-size frames into a ring buffer and segments them into utterances with
+an energy voice-activity detector. The noise floor is tracked incrementally
+from non-speech frames, so there is no per-utterance calibration pause.
+Finished utterances wait in a queue for STT, so speech that arrives while
+ANU is thinking is not lost. Listeners (streaming STT) instead receive the
+speech frames as they are captured: speech_started(), speech_frame(frame)
+and speech_ended(overlapping), called on the capture thread, so they must
+not block.
+
+Capture keeps running while ANU talks. Utterances that overlap its speech
+are tagged as overlapping (speech_ended(True), or AudioData.overlapping), so
+the consumer can tell the user talking over ANU (barge-in) from ANU's own
+voice picked up by the microphone.
+"""
+
+import math
+import time
+import queue
+import threading
+from array import array
+from collections import deque
+from typing import Callable, Optional, Dict, Any
+
+import speech_recognition as sr
+
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+
+def frame_rms(frame: bytes) -> float:
+    """Root mean square energy of a 16-bit little-endian PCM frame."""
+    samples = array('h', frame)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class EnergyVAD:
+    """
+    Energy voice-activity detection against an adaptive noise floor.
+    A frame is speech when its energy exceeds floor * ratio (and min_energy).
+
+    The floor follows non-speech frames. During a long run of "speech" it
+    can also rise to the quietest frame of the last min_window frames: real
+    speech has pauses that keep that minimum low, while a noise source that
+    got louder (a fan, traffic) would otherwise count as speech forever.
+    """
+
+    def __init__(self, ratio: float = 3.0, min_energy: float = 150.0, adapt_rate: float = 0.05,
+                 min_window: int = 100):
+        self.ratio = ratio
+        self.min_energy = min_energy
+        # Weight of each new non-speech frame in the noise floor average
+        self.adapt_rate = adapt_rate
+        self.noise_floor: Optional[float] = None
+        # Sliding minimum over the last min_window frames (~3 s at 30 ms):
+        # (frame index, energy) with increasing energies
+        self.min_window = min_window
+        self._recent: "deque[tuple]" = deque()
+        self._frames = 0
+
+    @property
+    def threshold(self) -> float:
+        return max(self.min_energy, (self.noise_floor or 0.0) * self.ratio)
+
+    def _recent_min(self, energy: float) -> Optional[float]:
+        """Add a frame; the lowest energy of the window once it is full."""
+        while self._recent and self._recent[-1][1] >= energy:
+            self._recent.pop()
+        self._recent.append((self._frames, energy))
+        self._frames += 1
+        if self._recent[0][0] <= self._frames - 1 - self.min_window:
+            self._recent.popleft()
+        return self._recent[0][1] if self._frames >= self.min_window else None
+
+    def is_speech(self, energy: float) -> bool:
+        recent_min = self._recent_min(energy)
+        if self.noise_floor is None:
+            self.noise_floor = energy
+            return False
+        speech = energy > self.threshold
+        if not speech:
+            self.noise_floor += self.adapt_rate * (energy - self.noise_floor)
+        elif recent_min is not None and recent_min > self.noise_floor:
+            self.noise_floor += self.adapt_rate * (recent_min - self.noise_floor)
+        return speech
+
+
+class AudioCapture:
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 30, pre_roll_ms: int = 300,
+                 silence_ms: int = 800, start_ms: int = 90, max_utterance_s: float = 15.0,
+                 history_s: float = 10.0, vad: Optional[EnergyVAD] = None,
+                 playing: Optional[Callable[[], bool]] = None):
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_ms = frame_ms
+        self.vad = vad or EnergyVAD()
+        # True while ANU is talking: utterances overlapping it are tagged
+        self.playing = playing
+
+        # Frame counts for the segmenter
+        self.pre_roll_frames = max(1, pre_roll_ms // frame_ms)
+        self.silence_frames = max(1, silence_ms // frame_ms)
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.max_frames = int(max_utterance_s * 1000 / frame_ms)
+
+        # Ring buffer of the most recent audio, speech or not
+        self.ring: "deque[bytes]" = deque(maxlen=int(history_s * 1000 / frame_ms))
+        self.utterances: "queue.Queue[sr.AudioData]" = queue.Queue()
+        # With listeners attached, utterances go to them instead of the queue
+        self.listeners = []
+
+        self._pre_roll: "deque[bytes]" = deque(maxlen=self.pre_roll_frames)
+        self._voiced_run = 0
+        self._silent_run = 0
+        self._current: Optional[list] = None
+        self._overlapping = False
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+
+        self.frames = 0
+        self.utterance_count = 0
+        self.overlapping_count = 0
+        self.overflows = 0
+        # CPU spent in feed() (VAD, segmentation and listeners such as the
+        # wake word spotter), to report the cost of always-on listening
+        self.cpu_seconds = 0.0
+
+    # ============================================================
+    # LIFECYCLE
+    # ============================================================
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="audio-capture", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _run(self):
+        try:
+            with sr.Microphone(sample_rate=self.sample_rate, chunk_size=self.frame_samples) as source:
+                print("Microphone stream open")
+                while not self._stop.is_set():
+                    try:
+                        frame = source.stream.read(self.frame_samples)
+                    except OSError:
+                        # Input overflow: the frame is lost, keep going
+                        self.overflows += 1
+                        continue
+                    self.feed(frame)
+        except Exception as e:
+            print(f"Microphone Error: {e}")
+        finally:
+            self._thread = None
+
+    # ============================================================
+    # SEGMENTATION
+    # ============================================================
+
+    def feed(self, frame: bytes):
+        """Process one frame (called by the capture thread; usable directly for files)."""
+        start = time.thread_time()
+        try:
+            self._segment(frame)
+        finally:
+            self.cpu_seconds += time.thread_time() - start
+
+    def _segment(self, frame: bytes):
+        self.frames += 1
+        self.ring.append(frame)
+
+        speech = self.vad.is_speech(frame_rms(frame))
+        playing = self.playing() if self.playing else False
+
+        if self._current is None:
+            self._pre_roll.append(frame)
+            self._voiced_run = self._voiced_run + 1 if speech else 0
+            if self._voiced_run >= self.start_frames:
+                # Keep the lead-in so the first syllable isn't clipped
+                self._current = list(self._pre_roll)
+                self._pre_roll.clear()
+                self._silent_run = 0
+                self._overlapping = playing
+                for listener in self.listeners:
+                    listener.speech_started()
+                    for lead_in in self._current:
+                        listener.speech_frame(lead_in)
+            return
+
+        self._current.append(frame)
+        self._overlapping = self._overlapping or playing
+        for listener in self.listeners:
+            listener.speech_frame(frame)
+        self._silent_run = 0 if speech else self._silent_run + 1
+        if self._silent_run >= self.silence_frames or len(self._current) >= self.max_frames:
+            # Drop the trailing silence (keep a little of it)
+            keep = len(self._current) - max(0, self._silent_run - self.pre_roll_frames)
+            self._emit(self._current[:keep])
+            self._current = None
+            self._voiced_run = 0
+
+    def _emit(self, frames: list):
+        self.utterance_count += 1
+        if self._overlapping:
+            self.overlapping_count += 1
+        if self.listeners:
+            for listener in self.listeners:
+                listener.speech_ended(self._overlapping)
+            return
+        audio = sr.AudioData(b"".join(frames), self.sample_rate, SAMPLE_WIDTH)
+        audio.overlapping = self._overlapping
+        self.utterances.put(audio)
+
+    # ============================================================
+    # CONSUMERS
+    # ============================================================
+
+    def get_utterance(self, timeout: Optional[float] = None) -> Optional[sr.AudioData]:
+        """Next finished utterance, or None if none arrived within timeout."""
+        self.start()
+        try:
+            return self.utterances.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def discard(self) -> int:
+        """Drop utterances nobody consumed (e.g. captured while paused)."""
+        dropped = 0
+        while True:
+            try:
+                self.utterances.get_nowait()
+            except queue.Empty:
+                return dropped
+            dropped += 1
+
+    def recent_audio(self, seconds: float) -> bytes:
+        """The last `seconds` of raw audio from the ring buffer."""
+        count = int(seconds * 1000 / self.frame_ms)
+        frames = list(self.ring)[-count:] if count else []
+        return b"".join(frames)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "frames": self.frames,
+            "utterances": self.utterance_count,
+            "overlapping": self.overlapping_count,
+            "queued": self.utterances.qsize(),
+            "overflows": self.overflows,
+            "noise_floor": round(self.vad.noise_floor or 0.0, 1),
+            "threshold": round(self.vad.threshold, 1),
+            "cpu_s_per_hour": round(self.cpu_seconds_per_hour(), 1)
+        }
+
+    def cpu_seconds_per_hour(self) -> float:
+        """CPU seconds spent per hour of captured audio."""
+        audio_seconds = self.frames * self.frame_ms / 1000
+        return self.cpu_seconds / audio_seconds * 3600 if audio_seconds else 0.0
@@ -1,20 +1,105 @@
 """
 Conversation History Management for ANU
 Saves and loads chat history for context-aware responses
+
+Every message is kept in an SQLite database with a full-text index (see
+core/history_store.py), searchable with search(). max_messages only bounds
+the in-memory window used for context, not what is stored.
+
+If this SQLite build has no FTS5, messages are appended to a JSONL log
+instead (one message per line), so a write costs the same no matter how long
+the history is. fsync is batched, the log is compacted to the last
+max_messages when it grows past compact_factor times that, and loading only
+reads the tail of the file. Like the database inserts, appends and
+compactions run in order on the write-behind thread (core/persistence.py).
+
+Turns that fall out of the engine's context window are condensed by a
+RollingSummarizer (core/summarizer.py); its timestamped summary chunks are
+stored alongside the messages and survive restarts.
+
+Histories saved by older versions (conversation_history.json, or the JSONL
+log when switching to SQLite) are migrated on first load.
 """
 
 import json
 import os
+import time
+import atexit
+import threading
+from collections import deque
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Any, Optional, Callable
+from core.history_store import SQLiteHistoryStore, fts5_available
+from core.persistence import writer
+from core.summarizer import RollingSummarizer
+from core.tracing import tracer
+
+
+def _read_tail_lines(path: str, count: int, block_size: int = 8192) -> tuple:
+    """
+    Return (last `count` lines of the file, whether older lines exist).
+    Reads blocks backwards from the end instead of scanning the whole file.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        # count + 1 newlines guarantee `count` complete lines
+        while position > 0 and data.count(b"\n") <= count:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+
+    lines = [line for line in data.split(b"\n") if line.strip()]
+    if position > 0:
+        # The first line may be partial; it is older than what we need anyway
+        lines = lines[1:]
+    truncated = position > 0 or len(lines) > count
+    return lines[-count:], truncated
+
 
 class ConversationHistory:
-    def __init__(self, history_file="conversation_history.json", max_messages=100):
+    def __init__(self, history_file="conversation_history.jsonl", max_messages=100,
+                 legacy_file="conversation_history.json", fsync_interval=2.0, compact_factor=2,
+                 db_file="conversation_history.db", summary_budget=400):
         self.history_file = history_file
+        self.legacy_file = legacy_file
+        # Size of the in-memory context window (the database keeps everything)
         self.max_messages = max_messages
-        self.messages = []
+        # Seconds between fsyncs; appends are flushed to the OS immediately
+        self.fsync_interval = fsync_interval
+        self.compact_factor = compact_factor
+        self.messages = deque(maxlen=max_messages)
+
+        self._lock = threading.Lock()
+        # Lines in the log once every queued write is done (guarded by _lock)
+        self._lines = 0
+        # The log file itself is written on the write-behind thread
+        self._file_lock = threading.Lock()
+        self._file = None
+        self._last_fsync = time.monotonic()
+        self._dirty = False
+
+        self.store: Optional[SQLiteHistoryStore] = None
+        if db_file and fts5_available():
+            try:
+                self.store = SQLiteHistoryStore(db_file)
+            except Exception as e:
+                print(f"Error opening history database, using {history_file}: {e}")
+
+        # Running summary of turns that left the context window
+        self.summary_file = os.path.splitext(history_file)[0] + "_summary.json"
+        self.summarizer = RollingSummarizer(token_budget=summary_budget, on_update=self._save_summary)
+        # Called with the new summary text whenever it changes (the engine)
+        self.on_summary: Optional[Callable[[str], None]] = None
+
         self.load_history()
-    
+        self._load_summary()
+        if self.store:
+            self.store.start_session()
+        atexit.register(self.close)
+
     def add_message(self, role: str, content: str):
         """Add a message to history (role: 'user' or 'assistant')"""
         message = {
@@ -22,57 +107,264 @@ class ConversationHistory:
             "content": content,
             "timestamp": datetime.now().isoformat()
         }
-        self.messages.append(message)
-        
-        # Keep only last max_messages
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages:]
-        
-        self.save_history()
-    
+        with self._lock:
+            # deque(maxlen) keeps only the last max_messages
+            self.messages.append(message)
+            if self.store:
+                self._insert(message)
+            else:
+                self._queue_append(message)
+
     def get_recent_context(self, num_messages=10) -> List[Dict]:
         """Get recent messages for context"""
-        return self.messages[-num_messages:] if self.messages else []
-    
+        if not self.messages or num_messages <= 0:
+            return []
+        return list(self.messages)[-num_messages:]
+
     def get_all_messages(self) -> List[Dict]:
         """Get all messages"""
-        return self.messages
-    
+        return list(self.messages)
+
     def clear_history(self):
         """Clear all conversation history"""
-        self.messages = []
-        self.save_history()
-    
-    def save_history(self):
-        """Save history to JSON file"""
+        self.summarizer.load([])
+        if not self.store:
+            writer.write_json(self.summary_file, [])
+        with self._lock:
+            self.messages.clear()
+            if self.store:
+                # Ordered after any inserts still queued
+                writer.submit(None, self.store.clear)
+            else:
+                self._queue_rewrite()
+
+    # ============================================================
+    # ROLLING SUMMARY
+    # ============================================================
+
+    def summarize_turns(self, turns: List[tuple]):
+        """Fold turns that left the context window into the running summary (in the background)."""
+        self.summarizer.add_turns(turns)
+
+    def get_context_summary(self) -> str:
+        """The running summary of older turns, with timestamps ('' if none yet)."""
+        return self.summarizer.text()
+
+    def _save_summary(self, chunks: List[Dict[str, Any]]):
+        if self.store:
+            store = self.store
+            writer.submit(None, lambda: store.save_summary(chunks))
+        else:
+            writer.write_json(self.summary_file, chunks, indent=2)
+        if self.on_summary:
+            self.on_summary(self.summarizer.text())
+
+    def _load_summary(self):
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.messages, f, indent=2)
+            if self.store:
+                self.summarizer.load(self.store.load_summary())
+            elif os.path.exists(self.summary_file):
+                with open(self.summary_file, 'r') as f:
+                    self.summarizer.load(json.load(f))
+        except Exception as e:
+            print(f"Error loading conversation summary: {e}")
+
+    def search(self, query: str = "", since=None, until=None, limit: int = 10) -> List[Dict]:
+        """
+        Find past messages containing every word of `query`, optionally within
+        [since, until] (ISO strings or datetimes). Best matches first.
+        """
+        if self.store:
+            # Include messages whose insert is still queued
+            writer.flush()
+            return self.store.search(query, since, until, limit)
+
+        # JSONL fallback: scan the in-memory window, newest first
+        words = [w.lower() for w in query.split()]
+        since = since.isoformat() if isinstance(since, datetime) else since
+        until = until.isoformat() if isinstance(until, datetime) else until
+        results = []
+        for message in reversed(self.messages):
+            content = message["content"].lower()
+            if (all(w in content for w in words)
+                    and (since is None or message["timestamp"] >= since)
+                    and (until is None or message["timestamp"] <= until)):
+                results.append(message)
+                if len(results) >= limit:
+                    break
+        return results
+
+    # ============================================================
+    # PERSISTENCE
+    # ============================================================
+
+    def _insert(self, message: Dict):
+        # Committed by the write-behind thread, off the response path
+        store = self.store
+        writer.submit(None, lambda: store.add(message["role"], message["content"], message["timestamp"]))
+
+    def _queue_append(self, message: Dict):
+        """Queue an append, or a compaction once the log has grown too long (caller holds _lock)."""
+        self._lines += 1
+        if self._lines > self.max_messages * self.compact_factor:
+            self._queue_rewrite()
+        else:
+            writer.submit(None, lambda: self._append(message))
+
+    def _queue_rewrite(self):
+        """Queue a compaction to the messages in memory right now (caller holds _lock)."""
+        messages = list(self.messages)
+        self._lines = len(messages)
+        writer.submit(None, lambda: self._rewrite(messages))
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.history_file, 'a', encoding='utf-8')
+
+    def _append(self, message: Dict):
+        try:
+            with self._file_lock, tracer.span("history_append"):
+                self._open()
+                self._file.write(json.dumps(message) + "\n")
+                self._file.flush()
+                self._dirty = True
+
+                now = time.monotonic()
+                if now - self._last_fsync >= self.fsync_interval:
+                    os.fsync(self._file.fileno())
+                    self._last_fsync = now
+                    self._dirty = False
+        except Exception as e:
+            print(f"Error saving conversation history: {e}")
+
+    def _rewrite(self, messages: List[Dict]):
+        """Atomically replace the log with just the given messages."""
+        try:
+            with self._file_lock, tracer.span("history_save", messages=len(messages)):
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                tmp_path = self.history_file + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    for message in messages:
+                        f.write(json.dumps(message) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.history_file)
+                self._last_fsync = time.monotonic()
+                self._dirty = False
         except Exception as e:
             print(f"Error saving conversation history: {e}")
-    
+
+    def save_history(self):
+        """Compact the history log to the messages kept in memory"""
+        if self.store:
+            # Every message is already committed to the database
+            return
+        with self._lock:
+            self._queue_rewrite()
+
+    def flush(self):
+        """Finish queued log writes and fsync any that haven't been synced yet"""
+        if not self.store:
+            writer.flush()
+        with self._file_lock:
+            if self._file is not None and self._dirty:
+                try:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    self._last_fsync = time.monotonic()
+                    self._dirty = False
+                except Exception as e:
+                    print(f"Error saving conversation history: {e}")
+
+    def close(self):
+        try:
+            self.summarizer.flush(timeout=10)
+        except Exception:
+            # Interpreter shutdown already stopped the summarizer thread
+            pass
+        # Queued inserts / appends first
+        writer.flush()
+        self.flush()
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        with self._lock:
+            if self.store:
+                try:
+                    self.store.close()
+                except Exception:
+                    pass
+                self.store = None
+
     def load_history(self):
-        """Load history from JSON file"""
+        """Load the most recent messages from the history log"""
         try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r') as f:
-                    self.messages = json.load(f)
+            if self.store:
+                if self.store.count() == 0:
+                    self._migrate_to_store()
+                self.messages.extend(self.store.recent(self.max_messages))
+                print(f"Loaded {len(self.messages)} messages from history ({self.store.count()} stored)")
+            elif os.path.exists(self.history_file):
+                # One spare line in case the last one was torn by a crash mid-append
+                lines, truncated = _read_tail_lines(self.history_file, self.max_messages + 1)
+                for line in lines:
+                    try:
+                        self.messages.append(json.loads(line))
+                    except ValueError:
+                        truncated = True
+                self._lines = len(lines)
+                truncated = truncated or len(lines) > self.max_messages
+                if truncated:
+                    self._rewrite(list(self.messages))
+                    self._lines = len(self.messages)
                 print(f"Loaded {len(self.messages)} messages from history")
+            elif self.legacy_file and os.path.exists(self.legacy_file):
+                self._migrate_legacy()
         except Exception as e:
             print(f"Error loading conversation history: {e}")
-            self.messages = []
-    
+            self.messages.clear()
+
+    def _migrate_legacy(self):
+        """Convert the old single-JSON-array history file into the log."""
+        with open(self.legacy_file, 'r') as f:
+            self.messages.extend(json.load(f))
+        self._rewrite(list(self.messages))
+        self._lines = len(self.messages)
+        print(f"Migrated {len(self.messages)} messages from {self.legacy_file} to {self.history_file}")
+
+    def _migrate_to_store(self):
+        """Import the JSONL log (or the older JSON file) into an empty database."""
+        messages = []
+        if os.path.exists(self.history_file):
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        messages.append(json.loads(line))
+                    except ValueError:
+                        continue
+            source = self.history_file
+        elif self.legacy_file and os.path.exists(self.legacy_file):
+            with open(self.legacy_file, 'r') as f:
+                messages = json.load(f)
+            source = self.legacy_file
+        if messages:
+            self.store.import_messages(messages)
+            print(f"Migrated {len(messages)} messages from {source} to {self.store.db_file}")
+
     def get_summary(self) -> str:
         """Get a summary of conversation history"""
         if not self.messages:
             return "No conversation history"
-        
+
         user_messages = len([m for m in self.messages if m['role'] == 'user'])
         assistant_messages = len([m for m in self.messages if m['role'] == 'assistant'])
-        
+
         if self.messages:
             first_msg = datetime.fromisoformat(self.messages[0]['timestamp'])
             last_msg = datetime.fromisoformat(self.messages[-1]['timestamp'])
             return f"History: {user_messages} user messages, {assistant_messages} assistant messages. From {first_msg.strftime('%Y-%m-%d %H:%M')} to {last_msg.strftime('%Y-%m-%d %H:%M')}"
-        
+
         return "No history available"
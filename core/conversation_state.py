@@ -0,0 +1,192 @@
+"""
+Persistent in-memory conversation state for the engine
+Keeps a token-budgeted window of prior turns, including compacted tool calls
+and tool results, so follow-up questions don't re-run the same tools.
+Evicted turns can be handed to a summarizer (on_evict); its running summary
+is pinned at the start of the window and counts against the same budget.
+"""
+
+import json
+from collections import deque
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable
+
+SUMMARY_PREFIX = "Summary of our earlier conversation (for context only):\n"
+
+
+def _estimate_tokens(value: Any) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    if isinstance(value, str):
+        return len(value) // 4 + 1
+    return len(json.dumps(value, default=str)) // 4 + 1
+
+
+class ConversationState:
+    def __init__(self, token_budget: int = 3000, max_tool_result_chars: int = 600):
+        self.token_budget = token_budget
+        self.max_tool_result_chars = max_tool_result_chars
+
+        # Flat Gemini contents: [summary] + committed turns, oldest first
+        self.contents: List[Dict[str, Any]] = []
+        # (number of contents, tokens, timestamp) per committed turn, oldest first
+        self.turns = deque()
+        self.tokens = 0
+
+        # Index in self.contents where the in-progress turn starts
+        self._turn_start: Optional[int] = None
+
+        # Called with [(timestamp, lines)] for turns pushed out of the window
+        self.on_evict: Optional[Callable[[List[tuple]], None]] = None
+        # 1 while a summary content is pinned at contents[0]
+        self._prefix = 0
+        self._summary_tokens = 0
+        # Set from the summarizer's thread, applied between turns
+        self._pending_summary: Optional[str] = None
+
+    # ============================================================
+    # TURN LIFECYCLE
+    # ============================================================
+
+    def seed(self, messages: List[Dict[str, Any]]):
+        """Populate the window from ConversationHistory messages (text only)."""
+        turn = []
+        timestamp = None
+        for msg in messages:
+            role = "user" if msg["role"] == "user" else "model"
+            if role == "user" and turn:
+                self._commit(turn, timestamp)
+                turn = []
+            if not turn:
+                timestamp = msg.get("timestamp")
+            turn.append({"role": role, "parts": [{"text": msg["content"]}]})
+        if turn:
+            self._commit(turn, timestamp)
+
+    def begin_turn(self, user_prompt: str) -> List[Dict[str, Any]]:
+        """
+        Start a turn and return the live message list to send to the model.
+        The engine appends model/tool contents to it; end_turn() keeps them.
+        """
+        # A turn that never finished (error, early return) is dropped
+        self.abort_turn()
+        self._apply_summary()
+        self._turn_start = len(self.contents)
+        self.contents.append({"role": "user", "parts": [{"text": user_prompt}]})
+        return self.contents
+
+    def end_turn(self, final_text: str):
+        """Commit the in-progress turn with the model's final text."""
+        if self._turn_start is None:
+            return
+        turn = self.contents[self._turn_start:]
+        del self.contents[self._turn_start:]
+        self._turn_start = None
+
+        turn.append({"role": "model", "parts": [{"text": final_text}]})
+        self._commit([self._compact(content) for content in turn])
+
+    def abort_turn(self):
+        if self._turn_start is not None:
+            del self.contents[self._turn_start:]
+            self._turn_start = None
+
+    def add_exchange(self, user_prompt: str, reply: str):
+        """Record a turn that was answered without the model (fast path, cache)."""
+        self.abort_turn()
+        self._apply_summary()
+        self._commit([
+            {"role": "user", "parts": [{"text": user_prompt}]},
+            {"role": "model", "parts": [{"text": reply}]}
+        ])
+
+    def clear(self):
+        self.contents = []
+        self.turns.clear()
+        self.tokens = 0
+        self._turn_start = None
+        self._prefix = 0
+        self._summary_tokens = 0
+        self._pending_summary = None
+
+    # ============================================================
+    # SUMMARY
+    # ============================================================
+
+    def set_summary(self, text: str):
+        """Replace the pinned summary; takes effect when the next turn starts."""
+        self._pending_summary = text
+
+    def _apply_summary(self):
+        text, self._pending_summary = self._pending_summary, None
+        if text is None:
+            return
+        if self._prefix:
+            del self.contents[0]
+            self._prefix = 0
+            self._summary_tokens = 0
+        if text:
+            summary = {"role": "user", "parts": [{"text": SUMMARY_PREFIX + text}]}
+            self.contents.insert(0, summary)
+            self._prefix = 1
+            self._summary_tokens = _estimate_tokens(summary)
+        self._evict()
+
+    # ============================================================
+    # COMPACTION / EVICTION
+    # ============================================================
+
+    def _compact_part(self, part: Any) -> Dict[str, Any]:
+        if isinstance(part, dict):
+            if "function_response" in part:
+                response = part["function_response"].get("response")
+                serialized = response if isinstance(response, str) else json.dumps(response, default=str)
+                if len(serialized) > self.max_tool_result_chars:
+                    response = {"summary": serialized[:self.max_tool_result_chars] + "..."}
+                return {"function_response": {"name": part["function_response"].get("name"), "response": response}}
+            return part
+
+        # google.genai types.Part from a model response
+        function_call = getattr(part, "function_call", None)
+        if function_call:
+            return {"function_call": {
+                "name": function_call.name,
+                "args": dict(function_call.args) if function_call.args else {}
+            }}
+        return {"text": getattr(part, "text", None) or ""}
+
+    def _compact(self, content: Dict[str, Any]) -> Dict[str, Any]:
+        return {"role": content["role"], "parts": [self._compact_part(p) for p in content["parts"]]}
+
+    def _commit(self, turn: List[Dict[str, Any]], timestamp: Optional[str] = None):
+        tokens = _estimate_tokens(turn)
+        self.contents.extend(turn)
+        self.turns.append((len(turn), tokens, timestamp or datetime.now().isoformat()))
+        self.tokens += tokens
+        self._evict()
+
+    def _evict(self):
+        # Evict whole turns (keeps call/response pairs intact), but always
+        # keep the newest one
+        evicted = []
+        while self.tokens + self._summary_tokens > self.token_budget and len(self.turns) > 1:
+            count, old_tokens, timestamp = self.turns.popleft()
+            start = self._prefix
+            evicted.append((timestamp, self._turn_lines(self.contents[start:start + count])))
+            del self.contents[start:start + count]
+            self.tokens -= old_tokens
+
+        if evicted and self.on_evict:
+            self.on_evict(evicted)
+
+    @staticmethod
+    def _turn_lines(contents: List[Dict[str, Any]]) -> List[str]:
+        """Readable lines for the summarizer: the text, and which tools were used."""
+        lines = []
+        for content in contents:
+            speaker = "User" if content["role"] == "user" else "ANU"
+            for part in content["parts"]:
+                if part.get("text"):
+                    lines.append(f"{speaker}: {part['text']}")
+                elif "function_call" in part:
+                    lines.append(f"(ANU used {part['function_call'].get('name')})")
+        return lines
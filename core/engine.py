@@ -1,18 +1,101 @@
 import os
-import json
 import re
+import time
+from typing import List, Dict, Any, Optional, Iterator
 from google import genai
 from google.genai import types
 from core.registry import SkillRegistry
 from core.conversation_history import ConversationHistory
+from core.conversation_state import ConversationState
+from core.tool_executor import ToolExecutor
+from core.response_cache import ResponseCache
+from core.intent_router import IntentRouter
+from core.tool_selector import ToolSelector
+from core.tracing import tracer
+
+
+# A sentence ends with ., ! or ? (optionally followed by quotes/brackets)
+# and whitespace. Decimals like "3.5" have no whitespace after the dot.
+SENTENCE_END = re.compile(r'(?<=[.!?])["\')\]]*\s+')
+
+
+def split_sentences(buffer: str):
+    """Split off the complete sentences in buffer; returns (sentences, remainder)."""
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(buffer):
+        sentence = buffer[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    return sentences, buffer[start:]
+
+
+# Upper bound on model calls (tool rounds) per user turn
+MAX_ITERATIONS = 10
+
+NO_RESPONSE = "I'm not sure how to respond to that."
+TOO_MANY_STEPS = "I completed as much as I could, but the task required too many steps."
+
+# What the agent loop does after a model response (see AnuEngine._next_step)
+STEP_RETRY = "retry"  # asked for a tool outside the selected subset (nothing spoken yet): resend with all tools
+STEP_TOOLS = "tools"  # run the requested tools, then call the model again
+STEP_DONE = "done"    # final answer (or nothing usable)
+
+
+class AgentTurn:
+    """State of one user turn as it goes through the tool-calling loop."""
+
+    def __init__(self, messages: List[Dict[str, Any]], generation_config: types.GenerateContentConfig,
+                 selected_tools: Optional[frozenset], cache_key: Optional[str]):
+        self.messages = messages
+        self.generation_config = generation_config
+        self.selected_tools = selected_tools
+        self.cache_key = cache_key
+        self.used_tools: List[str] = []
+        # All streamed text of the turn, across iterations
+        self.full_response = ""
+        self.iteration = 0
+
+    def begin_iteration(self):
+        """Reset the per-model-call state."""
+        self.iteration += 1
+        self.function_calls = []
+        self.model_parts = []
+        # Non-streaming: the response text; streaming: text not yet yielded
+        self.text = ""
+        # Streaming: all text of this iteration (already spoken or about to be)
+        self.streamed_text = ""
+        self.call_start = time.perf_counter_ns()
+        self.first_text = None
 
 
 class AnuEngine:
-    def __init__(self, registry: SkillRegistry):
+    def __init__(self, registry: SkillRegistry, response_cache: Optional[ResponseCache] = None,
+                 intent_router: Optional[IntentRouter] = None,
+                 tool_selector: Optional[ToolSelector] = None,
+                 history: Optional[ConversationHistory] = None, summarize: bool = True):
         self.registry = registry
         self.client = genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
         self.model_name = "gemini-2.5-flash"  # Latest and fastest Gemini model
-        self.history = ConversationHistory()
+        self.history = history or ConversationHistory()
+        # Token-budgeted window of prior turns, appended to across turns
+        self.conversation = ConversationState()
+        self.conversation.seed(self.history.get_recent_context(num_messages=6))
+        self.conversation.set_summary(self.history.get_context_summary())
+        if summarize:
+            # Turns pushed out of the window are summarized in the background
+            # and the summary is sent ahead of the remaining turns
+            self.conversation.on_evict = self.history.summarize_turns
+            self.history.on_summary = self.conversation.set_summary
+            self.history.summarizer.summarize_fn = self._summarize_lines
+        self.tool_executor = ToolExecutor(registry)
+        # Opt-in cache for repeated tool-free queries
+        self.response_cache = response_cache
+        # Optional local fast path for trivial tool commands
+        self.intent_router = intent_router
+        # Optional top-k tool retrieval to shrink the declaration payload
+        self.tool_selector = tool_selector
 
         self.system_instruction = (
             "You are ANU, a warm, caring, and intelligent AI assistant. "
@@ -22,147 +105,396 @@ class AnuEngine:
             "Be supportive, friendly, and empathetic."
         )
 
+        self.temperature = 0.7
+        self.max_output_tokens = 200
+
+        # Compiled tool declarations / configs keyed by the selected tool
+        # names (None = full set), rebuilt only when the registry version changes
+        self._config_cache: Dict[Optional[frozenset], tuple] = {}
+        self._config_cache_version = None
+        self._config_cache_size = 32
+
+    # ============================================================
+    # TOOL DECLARATION CACHE
+    # ============================================================
+
+    def _get_compiled_tools(self, tool_names: Optional[frozenset] = None) -> tuple:
+        """Return (GenerateContentConfig, declarations) for a set of tools."""
+        version = self.registry.version
+        if self._config_cache_version != version:
+            self._config_cache = {}
+            self._config_cache_version = version
+
+        compiled = self._config_cache.get(tool_names)
+        if compiled is None:
+            # Declarations are pre-serialized per tool by the registry's catalog
+            gemini_tools = self.registry.catalog.gemini_tools(tool_names)
+            config = types.GenerateContentConfig(
+                system_instruction=self.system_instruction,
+                tools=gemini_tools,
+                temperature=self.temperature,
+                max_output_tokens=self.max_output_tokens
+            )
+            declarations = gemini_tools[0]["function_declarations"] if gemini_tools else []
+            if len(self._config_cache) >= self._config_cache_size:
+                self._config_cache = {None: self._config_cache[None]} if None in self._config_cache else {}
+            compiled = (config, declarations)
+            self._config_cache[tool_names] = compiled
+        return compiled
+
+    def _get_generation_config(self, tool_names: Optional[frozenset] = None) -> types.GenerateContentConfig:
+        """Return the GenerateContentConfig for the given (or full) set of tools."""
+        return self._get_compiled_tools(tool_names)[0]
+
+    # ============================================================
+    # TOOL SUBSET SELECTION
+    # ============================================================
+
+    def _select_generation_config(self, user_prompt: str) -> tuple:
+        """
+        Pick the tool declarations to send for this prompt.
+        Returns (config, selected tool names or None for the full set).
+        """
+        if not self.tool_selector:
+            return self._get_generation_config(), None
+
+        self.tool_selector.index(self.registry.get_tools_schema(), self.registry.version)
+        # Context: the messages before the current prompt
+        context = [m["content"] for m in self.history.get_recent_context(num_messages=3)[:-1]]
+        selected = self.tool_selector.select(user_prompt, context)
+
+        full_config, full_declarations = self._get_compiled_tools()
+        if selected is None:
+            self.tool_selector.record(full_declarations, full_declarations)
+            return full_config, None
+
+        selected = frozenset(selected)
+        config, declarations = self._get_compiled_tools(selected)
+        saved = self.tool_selector.record(full_declarations, declarations)
+        print(f"   Tools: {len(declarations)}/{len(full_declarations)} declarations (~{saved} tokens saved)")
+        return config, selected
+
+    def _outside_selection(self, function_calls: List[Any], selected: Optional[frozenset]) -> bool:
+        """True if the model asked for a tool that was not in the selected subset."""
+        if selected is None:
+            return False
+        missing = [call.name for call in function_calls if call.name not in selected]
+        if missing:
+            print(f"   Tool(s) {missing} outside selection, switching to the full set")
+            self.tool_selector.fallbacks += 1
+            return True
+        return False
+
+    # ============================================================
+    # LOCAL INTENT FAST PATH
+    # ============================================================
+
+    def _route_intent(self, user_prompt: str) -> Optional[Dict[str, Any]]:
+        if not self.intent_router:
+            return None
+        match = self.intent_router.route(user_prompt)
+        if match:
+            print(f"   Fast path: {match['tool']} ({match['confidence']:.2f})")
+        return match
+
+    @staticmethod
+    def _intent_call(match: Dict[str, Any]) -> types.FunctionCall:
+        return types.FunctionCall(name=match["tool"], args=match["args"])
+
+    def _finish_intent(self, user_prompt: str, match: Dict[str, Any],
+                       function_responses: List[Dict[str, Any]]) -> str:
+        tool_result = function_responses[0]["function_response"]["response"]
+        reply = self.intent_router.format_reply(match, tool_result)
+        self._record_exchange(user_prompt, reply)
+        return reply
+
+    # ============================================================
+    # RESPONSE CACHE
+    # ============================================================
+
+    def _lookup_cache(self, user_prompt: str) -> tuple:
+        """
+        Return (cache_key, cached_response). On a hit the exchange is still
+        recorded in history. Both are None when caching is disabled.
+        """
+        if not self.response_cache:
+            return None, None
+
+        num_context = self.response_cache.context_messages
+        context = self.history.get_recent_context(num_messages=num_context) if num_context else []
+        key = self.response_cache.make_key(user_prompt, context, self.registry.version)
+        cached = self.response_cache.get(key)
+
+        if cached is not None:
+            print("   (cached response)")
+            self._record_exchange(user_prompt, cached)
+        return key, cached
+
+    def _store_cache(self, cache_key: Optional[str], response: str, used_tools: List[str]):
+        if cache_key and self.response_cache.is_cacheable(used_tools):
+            self.response_cache.put(cache_key, response)
+
+    # ============================================================
+    # CONVERSATION SUMMARY
+    # ============================================================
+
+    def _summarize_lines(self, lines: List[str], max_tokens: int) -> str:
+        """Summarizer backend: condense old turns with the model (runs off the response path)."""
+        prompt = (
+            f"Summarize this earlier part of a conversation between a user and ANU in under "
+            f"{max_tokens * 3 // 4} words. Keep names, dates, numbers, preferences, requests "
+            f"and decisions; drop greetings and small talk.\n\n" + "\n".join(lines)
+        )
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=types.GenerateContentConfig(temperature=0.2, max_output_tokens=max_tokens)
+        )
+        return response.text or ""
+
+    # ============================================================
+    # AGENT LOOP STEPS
+    # ============================================================
+    # The sync and async engines run the same loop; only the model call and
+    # tool execution differ. Everything else happens in these steps.
+
+    def _build_messages(self, user_prompt: str) -> List[Dict[str, Any]]:
+        """
+        Record the user prompt and return the live Gemini message list:
+        the retained prior turns (with their tool calls/results) plus the prompt.
+        """
+        self.history.add_message("user", user_prompt)
+        return self.conversation.begin_turn(user_prompt)
+
+    def _start_turn(self, user_prompt: str, cache_key: Optional[str]) -> AgentTurn:
+        messages = self._build_messages(user_prompt)
+        # Compiled once per registry version / tool subset (see _get_compiled_tools)
+        generation_config, selected_tools = self._select_generation_config(user_prompt)
+        return AgentTurn(messages, generation_config, selected_tools, cache_key)
+
+    def _commit_turn(self, response: str):
+        """Persist the final response and keep this turn in the context window."""
+        self.history.add_message("assistant", response)
+        self.conversation.end_turn(response)
+
+    def _finish_turn(self, turn: AgentTurn, response: str):
+        self._commit_turn(response)
+        self._store_cache(turn.cache_key, response, turn.used_tools)
+
+    def _record_exchange(self, user_prompt: str, reply: str):
+        """Record a turn answered without the model (fast path, cache hit)."""
+        self.history.add_message("user", user_prompt)
+        self.history.add_message("assistant", reply)
+        self.conversation.add_exchange(user_prompt, reply)
+
+    @staticmethod
+    def _model_error(error: Exception) -> str:
+        print(f"Gemini API Error: {error}")
+        import traceback
+        traceback.print_exc()
+        return "I'm having trouble thinking right now."
+
+    @staticmethod
+    def _split_parts(parts) -> tuple:
+        """Separate a candidate's parts into (function_calls, text)."""
+        function_calls = []
+        text_response = ""
+
+        for part in parts:
+            if hasattr(part, "function_call") and part.function_call:
+                function_calls.append(part.function_call)
+            elif hasattr(part, "text") and part.text:
+                text_response += part.text
+
+        return function_calls, text_response
+
+    def _read_response(self, turn: AgentTurn, response) -> Optional[str]:
+        """Take in a complete model response; returns a reply if it is unusable."""
+        if not response.candidates:
+            return "I couldn't generate a response."
+
+        candidate = response.candidates[0]
+
+        if not candidate.content or not candidate.content.parts:
+            return "I received an empty response."
+
+        turn.model_parts = candidate.content.parts
+        turn.function_calls, turn.text = self._split_parts(turn.model_parts)
+        return None
+
+    def _read_chunk(self, turn: AgentTurn, chunk) -> List[str]:
+        """Take in one streamed chunk; returns the sentences it completed."""
+        if not chunk.candidates:
+            return []
+        candidate = chunk.candidates[0]
+        if not candidate.content or not candidate.content.parts:
+            return []
+
+        sentences = []
+        for part in candidate.content.parts:
+            if hasattr(part, "function_call") and part.function_call:
+                turn.function_calls.append(part.function_call)
+                turn.model_parts.append(part)
+            elif hasattr(part, "text") and part.text:
+                if turn.first_text is None:
+                    turn.first_text = time.perf_counter_ns()
+                    tracer.record("model_first_token", turn.call_start, turn.first_text, iteration=turn.iteration)
+                turn.text += part.text
+                turn.streamed_text += part.text
+                turn.full_response += part.text
+                complete, turn.text = split_sentences(turn.text)
+                sentences.extend(complete)
+        return sentences
+
+    @staticmethod
+    def _end_stream(turn: AgentTurn) -> List[str]:
+        """Close an iteration's stream; returns whatever is left of its text."""
+        # Includes time the consumer spent on earlier sentences
+        tracer.record("model_stream", turn.call_start, time.perf_counter_ns(), iteration=turn.iteration)
+        return [turn.text.strip()] if turn.text.strip() else []
+
+    def _next_step(self, turn: AgentTurn) -> str:
+        """Decide what follows the model output: STEP_RETRY, STEP_TOOLS or STEP_DONE."""
+        if not turn.function_calls:
+            return STEP_DONE
+
+        if self._outside_selection(turn.function_calls, turn.selected_tools):
+            turn.generation_config = self._get_generation_config()
+            turn.selected_tools = None
+            if not turn.streamed_text:
+                turn.iteration -= 1
+                return STEP_RETRY
+            # Its text has been spoken already: keep this step and run the
+            # calls, with every tool offered from here on
+            print("   Text already spoken, running the calls instead of retrying")
+
+        print(f"\n🔧 Tool Execution (Iteration {turn.iteration})")
+        # The model's text and tool calls go back into the conversation; the
+        # streamed text arrived in pieces and is sent as one part
+        parts = turn.model_parts
+        if turn.streamed_text:
+            parts = [types.Part(text=turn.streamed_text)] + parts
+        turn.messages.append({"role": "model", "parts": parts})
+        turn.used_tools.extend(call.name for call in turn.function_calls)
+        return STEP_TOOLS
+
+    @staticmethod
+    def _add_tool_results(turn: AgentTurn, function_responses: List[Dict[str, Any]]):
+        # Responses keep call order
+        turn.messages.append({
+            "role": "user",
+            "parts": function_responses
+        })
+
+    @staticmethod
+    def _cached_sentences(cached: str) -> List[str]:
+        sentences, remainder = split_sentences(cached)
+        if remainder.strip():
+            sentences.append(remainder.strip())
+        return sentences
+
     # ============================================================
     # MAIN AGENT LOOP
     # ============================================================
 
     def run_conversation(self, user_prompt: str) -> str:
 
-        self.history.add_message("user", user_prompt)
+        match = self._route_intent(user_prompt)
+        if match:
+            function_responses = self.tool_executor.execute([self._intent_call(match)])
+            return self._finish_intent(user_prompt, match, function_responses)
+
+        cache_key, cached = self._lookup_cache(user_prompt)
+        if cached is not None:
+            return cached
+
+        turn = self._start_turn(user_prompt, cache_key)
 
-        recent_context = self.history.get_recent_context(num_messages=6)
-
-        # Build Gemini-style messages
-        messages = []
-        
-        for msg in recent_context:
-            role = "user" if msg["role"] == "user" else "model"
-            messages.append({"role": role, "parts": [{"text": msg["content"]}]})
-
-        # Get tools schema and convert to Gemini format
-        tools_schema = self.registry.get_tools_schema()
-        
-        # Convert OpenAI-style tools to Gemini format
-        gemini_tools = None
-        if tools_schema:
-            function_declarations = []
-            for tool in tools_schema:
-                if tool.get("type") == "function":
-                    func_def = tool.get("function", {})
-                    function_declarations.append({
-                        "name": func_def.get("name"),
-                        "description": func_def.get("description", ""),
-                        "parameters": func_def.get("parameters", {})
-                    })
-            
-            if function_declarations:
-                gemini_tools = [{"function_declarations": function_declarations}]
-
-        generation_config = {
-            "temperature": 0.7,
-            "max_output_tokens": 200
-        }
-
-        max_iterations = 10
-        iteration = 0
-
-        while iteration < max_iterations:
-            iteration += 1
+        while turn.iteration < MAX_ITERATIONS:
+            turn.begin_iteration()
 
             try:
                 # Call Gemini API
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=messages,
-                    config=types.GenerateContentConfig(
-                        system_instruction=self.system_instruction,
-                        tools=gemini_tools if gemini_tools else None,
-                        temperature=generation_config["temperature"],
-                        max_output_tokens=generation_config["max_output_tokens"]
+                with tracer.span("model_call", iteration=turn.iteration):
+                    response = self.client.models.generate_content(
+                        model=self.model_name,
+                        contents=turn.messages,
+                        config=turn.generation_config
                     )
-                )
-
             except Exception as e:
-                print(f"Gemini API Error: {e}")
-                import traceback
-                traceback.print_exc()
-                return "I'm having trouble thinking right now."
-
-            if not response.candidates:
-                return "I couldn't generate a response."
-            
-            candidate = response.candidates[0]
-            
-            if not candidate.content or not candidate.content.parts:
-                return "I received an empty response."
-
-            parts = candidate.content.parts
-
-            # Check for function calls
-            function_calls = []
-            text_response = ""
-            
-            for part in parts:
-                if hasattr(part, "function_call") and part.function_call:
-                    function_calls.append(part.function_call)
-                elif hasattr(part, "text") and part.text:
-                    text_response += part.text
-
-            # ============================================================
-            # CASE 1: STRUCTURED TOOL CALLS
-            # ============================================================
-
-            if function_calls:
-                print(f"\n🔧 Tool Execution (Iteration {iteration})")
-
-                # Add model response to messages
-                messages.append({"role": "model", "parts": parts})
-
-                # Execute each function call
-                function_responses = []
-                
-                for func_call in function_calls:
-                    function_name = func_call.name
-                    print(f"   Calling: {function_name}")
-                    
-                    function_to_call = self.registry.get_function(function_name)
-
-                    if not function_to_call:
-                        tool_result = {"error": f"Tool '{function_name}' not found."}
-                    else:
-                        try:
-                            # Gemini provides args as a dict already
-                            function_args = dict(func_call.args) if func_call.args else {}
-                            tool_result = function_to_call(**function_args)
-                            print(f"   Result: {str(tool_result)[:100]}")
-                        except Exception as e:
-                            tool_result = {"error": f"Tool execution error: {str(e)}"}
-                            print(f"   Error: {e}")
-                    
-                    function_responses.append({
-                        "function_response": {
-                            "name": function_name,
-                            "response": tool_result
-                        }
-                    })
-
-                # Add function responses to messages
-                messages.append({
-                    "role": "user",
-                    "parts": function_responses
-                })
+                return self._model_error(e)
 
+            error = self._read_response(turn, response)
+            if error:
+                return error
+
+            step = self._next_step(turn)
+            if step == STEP_RETRY:
+                continue
+            if step == STEP_TOOLS:
+                self._add_tool_results(turn, self.tool_executor.execute(turn.function_calls))
                 continue  # Loop again to get final response
 
-            # ============================================================
-            # CASE 2: NORMAL TEXT RESPONSE
-            # ============================================================
+            if turn.text:
+                self._finish_turn(turn, turn.text)
+                return turn.text
 
-            if text_response:
-                self.history.add_message("assistant", text_response)
-                return text_response
-            
             # If we get here with no text and no function calls, something's wrong
-            return "I'm not sure how to respond to that."
+            return NO_RESPONSE
+
+        return TOO_MANY_STEPS
+
+    # ============================================================
+    # STREAMING AGENT LOOP
+    # ============================================================
+
+    def stream_conversation(self, user_prompt: str) -> Iterator[str]:
+        """
+        Same agent loop as run_conversation, but streams the model output and
+        yields complete sentences as soon as they arrive so speech can start
+        before generation has finished.
+        """
+        match = self._route_intent(user_prompt)
+        if match:
+            function_responses = self.tool_executor.execute([self._intent_call(match)])
+            yield self._finish_intent(user_prompt, match, function_responses)
+            return
+
+        cache_key, cached = self._lookup_cache(user_prompt)
+        if cached is not None:
+            yield from self._cached_sentences(cached)
+            return
+
+        turn = self._start_turn(user_prompt, cache_key)
+
+        while turn.iteration < MAX_ITERATIONS:
+            turn.begin_iteration()
+
+            try:
+                stream = self.client.models.generate_content_stream(
+                    model=self.model_name,
+                    contents=turn.messages,
+                    config=turn.generation_config
+                )
+                for chunk in stream:
+                    yield from self._read_chunk(turn, chunk)
+            except Exception as e:
+                yield self._model_error(e)
+                return
+
+            yield from self._end_stream(turn)
+
+            step = self._next_step(turn)
+            if step == STEP_RETRY:
+                continue
+            if step == STEP_TOOLS:
+                self._add_tool_results(turn, self.tool_executor.execute(turn.function_calls))
+                continue  # Loop again to get final response
+
+            if turn.full_response:
+                self._finish_turn(turn, turn.full_response)
+            else:
+                yield NO_RESPONSE
+            return
 
-        return "I completed as much as I could, but the task required too many steps."
+        yield TOO_MANY_STEPS
@@ -0,0 +1,193 @@
+"""
+SQLite store for conversation history
+Every message ever exchanged, with an FTS5 full-text index over the content,
+an index on timestamps and one row per assistant session. Runs in WAL mode
+with synchronous=NORMAL, so a commit per message doesn't cost an fsync.
+"""
+
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Union
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    ended_at TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER REFERENCES sessions(id),
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_timestamp ON messages(timestamp);
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY,
+    level INTEGER NOT NULL,
+    start TEXT,
+    "end" TEXT,
+    text TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, content='messages', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+"""
+
+TimeBound = Optional[Union[str, datetime]]
+
+
+def fts5_available() -> bool:
+    """Not every SQLite build ships FTS5."""
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def _fts_query(query: str) -> str:
+    """Quote each word so user text can't be parsed as FTS5 syntax (AND of all words)."""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"' for word in words)
+
+
+def _bound(value: TimeBound) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class SQLiteHistoryStore:
+    def __init__(self, db_file: str = "conversation_history.db"):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.row_factory = sqlite3.Row
+        self.session_id: Optional[int] = None
+
+    # ============================================================
+    # WRITES
+    # ============================================================
+
+    def start_session(self) -> int:
+        with self._lock:
+            cursor = self.conn.execute("INSERT INTO sessions(started_at) VALUES (?)",
+                                       (datetime.now().isoformat(),))
+            self.conn.commit()
+            self.session_id = cursor.lastrowid
+            return self.session_id
+
+    def end_session(self):
+        if self.session_id is None:
+            return
+        with self._lock:
+            self.conn.execute("UPDATE sessions SET ended_at = ? WHERE id = ?",
+                              (datetime.now().isoformat(), self.session_id))
+            self.conn.commit()
+
+    def add(self, role: str, content: str, timestamp: str):
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO messages(session_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+                (self.session_id, role, content, timestamp)
+            )
+            self.conn.commit()
+
+    def import_messages(self, messages: List[Dict[str, Any]]):
+        """Bulk insert (used to migrate older history files)."""
+        with self._lock:
+            self.conn.executemany(
+                "INSERT INTO messages(session_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+                [(None, m["role"], m["content"], m.get("timestamp") or datetime.now().isoformat())
+                 for m in messages]
+            )
+            self.conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM messages")
+            self.conn.execute("DELETE FROM summaries")
+            self.conn.commit()
+
+    def save_summary(self, chunks: List[Dict[str, Any]]):
+        """Replace the rolling summary chunks (oldest first)."""
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM summaries")
+                self.conn.executemany(
+                    'INSERT INTO summaries(level, start, "end", text) VALUES (?, ?, ?, ?)',
+                    [(c["level"], c["start"], c["end"], c["text"]) for c in chunks]
+                )
+
+    def close(self):
+        self.end_session()
+        with self._lock:
+            self.conn.close()
+
+    # ============================================================
+    # READS
+    # ============================================================
+
+    def load_summary(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.conn.execute('SELECT level, start, "end", text FROM summaries ORDER BY id').fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """The newest `limit` messages, oldest first."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT role, content, timestamp FROM messages ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def search(self, query: str = "", since: TimeBound = None, until: TimeBound = None,
+               limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Messages matching every word of `query` (best matches first), optionally
+        limited to [since, until]. With an empty query, the newest messages in range.
+        """
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("m.timestamp >= ?")
+            params.append(_bound(since))
+        if until is not None:
+            conditions.append("m.timestamp <= ?")
+            params.append(_bound(until))
+
+        match = _fts_query(query or "")
+        if match:
+            sql = ("SELECT m.id, m.session_id, m.role, m.content, m.timestamp "
+                   "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+                   "WHERE messages_fts MATCH ?")
+            params.insert(0, match)
+            if conditions:
+                sql += " AND " + " AND ".join(conditions)
+            sql += " ORDER BY bm25(messages_fts) LIMIT ?"
+        else:
+            sql = "SELECT m.id, m.session_id, m.role, m.content, m.timestamp FROM messages m"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " ORDER BY m.id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,242 @@
+"""
+Local Intent Router for ANU
+Dispatches trivial one-to-one commands ("volume 50", "next track", "lock screen")
+straight to registry functions, skipping the Gemini round trip.
+Anything that is not a high-confidence match falls back to the LLM.
+
+Only the exact command phrasings in INTENT_GRAMMAR may trigger actions; the
+fuzzy keyword classifier is limited to the read-only tools in
+KEYWORD_TOOLS, so a loose match can never empty the trash or start a camera.
+"""
+
+import re
+import json
+import time
+import bisect
+from typing import List, Dict, Any, Optional
+from core.registry import SkillRegistry
+
+# ============================================================
+# SLOT GRAMMAR
+# ============================================================
+# (tool name, pattern, spoken reply). Patterns must match the whole
+# utterance; named groups become tool arguments and are coerced to the
+# parameter type from the tool schema. Replies are formatted with the
+# arguments and the fields of the tool result.
+
+INTENT_GRAMMAR = [
+    ("set_volume",
+     r"(?:(?:set|change|turn) (?:the )?)?volume (?:to |at )?(?P<level>100|[1-9]?\d)(?: ?%| percent)?",
+     "Volume set to {level} percent."),
+    ("next_track",
+     r"(?:play )?(?:the )?next (?:track|song)|skip(?: this)?(?: track| song)?",
+     "{message}"),
+    ("previous_track",
+     r"(?:play )?(?:the )?(?:previous|last) (?:track|song)|go back(?: a)? (?:track|song)",
+     "{message}"),
+    ("pause_music",
+     r"(?:pause|stop)(?: the)? (?:music|song|playback)",
+     "{message}"),
+    ("take_screenshot",
+     r"(?:take|capture|grab)(?: a| the)? (?:screenshot|screen shot)(?: of (?:the|my) screen)?",
+     "Screenshot saved."),
+    ("get_current_date",
+     r"what(?:'s| is) (?:the |today's )?date(?: today)?|what day is (?:it|today)|what is today",
+     "Today is {date}."),
+    ("get_current_time",
+     r"what(?:'s| is) the time(?: now)?|what time is it(?: now)?|tell me the time",
+     "It's {time}."),
+    ("lock_screen",
+     r"lock(?: the| my)? (?:screen|computer|mac|laptop)",
+     "Screen locked."),
+]
+
+# No-argument tools the keyword classifier may dispatch: read-only lookups,
+# safe to run on a fuzzy match. Everything else needs a grammar match or the LLM.
+KEYWORD_TOOLS = {
+    "get_current_time", "get_current_date", "get_current_datetime",
+    "get_current_location_weather", "get_news_headlines",
+    "get_todays_events", "get_upcoming_events",
+    "check_unread_emails", "get_system_info", "get_running_apps",
+    "tell_joke", "fun_fact", "motivate", "compliment",
+}
+
+# Words that carry no intent for the keyword classifier
+STOPWORDS = {
+    "a", "an", "the", "to", "of", "for", "on", "in", "at", "my", "me", "i",
+    "please", "can", "could", "you", "would", "will", "get", "set", "some",
+    "is", "it", "its", "what", "whats", "now", "just", "and", "with", "or",
+    "this", "that", "current", "your", "give", "share", "s",
+}
+
+# Latency histogram bucket upper bounds, in microseconds
+LATENCY_BUCKETS_US = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS]
+
+
+class IntentRouter:
+    def __init__(self, registry: SkillRegistry, threshold: float = 0.8):
+        self.registry = registry
+        self.threshold = threshold
+
+        self._compiled_version = None
+        self._grammar = []
+        self._keyword_index = []
+
+        self.routed = 0
+        self.fallbacks = 0
+        self._latency_counts = [0] * (len(LATENCY_BUCKETS_US) + 1)
+
+    # ============================================================
+    # COMPILATION
+    # ============================================================
+
+    def _compile(self):
+        """(Re)build grammar and keyword classifier for the registered tools."""
+        if self._compiled_version == self.registry.version:
+            return
+
+        schemas = {}
+        for tool in self.registry.get_tools_schema():
+            func_def = tool.get("function", {})
+            if func_def.get("name"):
+                schemas[func_def["name"]] = func_def
+
+        self._grammar = []
+        for tool_name, pattern, reply in INTENT_GRAMMAR:
+            if tool_name in schemas:
+                properties = schemas[tool_name].get("parameters", {}).get("properties", {})
+                self._grammar.append((tool_name, re.compile(pattern), reply, properties))
+
+        # Keyword classifier: only read-only tools that need no arguments
+        self._keyword_index = []
+        for tool_name, func_def in schemas.items():
+            if tool_name not in KEYWORD_TOOLS or func_def.get("parameters", {}).get("required"):
+                continue
+            name_tokens = set(_tokens(tool_name.replace("_", " ")))
+            desc_tokens = set(_tokens(func_def.get("description", "")))
+            if name_tokens:
+                self._keyword_index.append((tool_name, name_tokens, desc_tokens))
+
+        self._compiled_version = self.registry.version
+
+    # ============================================================
+    # ROUTING
+    # ============================================================
+
+    @staticmethod
+    def _clean(utterance: str) -> str:
+        text = utterance.lower().strip()
+        text = re.sub(r"\b(?:anu|please|hey)\b", " ", text)
+        text = re.sub(r"[^\w\s%']", " ", text)
+        return " ".join(text.split())
+
+    @staticmethod
+    def _coerce(value: str, schema: Dict[str, Any]) -> Any:
+        if schema.get("type") == "integer":
+            return int(value)
+        if schema.get("type") == "number":
+            return float(value)
+        return value
+
+    def _match_grammar(self, text: str) -> Optional[Dict[str, Any]]:
+        for tool_name, pattern, reply, properties in self._grammar:
+            match = pattern.fullmatch(text)
+            if match:
+                args = {
+                    slot: self._coerce(value, properties.get(slot, {}))
+                    for slot, value in match.groupdict().items() if value is not None
+                }
+                return {"tool": tool_name, "args": args, "confidence": 1.0, "reply": reply}
+        return None
+
+    def _match_keywords(self, text: str) -> Optional[Dict[str, Any]]:
+        utterance = set(_tokens(text))
+        if not utterance:
+            return None
+
+        scored = []
+        for tool_name, name_tokens, desc_tokens in self._keyword_index:
+            name_score = len(utterance & name_tokens) / len(utterance | name_tokens)
+            desc_score = len(utterance & desc_tokens) / len(utterance)
+            scored.append((0.75 * name_score + 0.25 * desc_score, tool_name))
+
+        if not scored:
+            return None
+        scored.sort(reverse=True)
+        best_score, best_tool = scored[0]
+        # Ties between tools are ambiguous: halve the confidence
+        if len(scored) > 1 and scored[1][0] == best_score:
+            best_score /= 2
+        return {"tool": best_tool, "args": {}, "confidence": best_score, "reply": "{message}"}
+
+    def classify(self, utterance: str) -> Optional[Dict[str, Any]]:
+        """Return the best local intent match (regardless of threshold)."""
+        self._compile()
+        text = self._clean(utterance)
+        return self._match_grammar(text) or self._match_keywords(text)
+
+    def route(self, utterance: str) -> Optional[Dict[str, Any]]:
+        """
+        Return {"tool", "args", "confidence", "reply"} for a high-confidence
+        match, or None to fall back to the LLM.
+        """
+        start = time.perf_counter()
+        match = self.classify(utterance)
+        self._record_latency((time.perf_counter() - start) * 1_000_000)
+
+        if match and match["confidence"] >= self.threshold:
+            self.routed += 1
+            return match
+
+        self.fallbacks += 1
+        return None
+
+    @staticmethod
+    def format_reply(match: Dict[str, Any], tool_result: Any) -> str:
+        """Build the spoken reply from the reply template and the tool result."""
+        result = tool_result
+        if isinstance(result, str):
+            try:
+                result = json.loads(result)
+            except ValueError:
+                return result
+        if not isinstance(result, dict):
+            return "Done."
+
+        message = str(result.get("message", "Done."))
+        # Tool messages often start with an emoji
+        message = re.sub(r"^[^\w]+", "", message)
+
+        if result.get("status") == "error" or "error" in result:
+            return message if "message" in result else f"Sorry, that didn't work: {result.get('error')}"
+
+        fields = dict(result)
+        fields.update(match["args"])
+        fields["message"] = message
+        try:
+            return match["reply"].format(**fields)
+        except (KeyError, IndexError):
+            return message
+
+    # ============================================================
+    # METRICS
+    # ============================================================
+
+    def _record_latency(self, micros: float):
+        self._latency_counts[bisect.bisect_left(LATENCY_BUCKETS_US, micros)] += 1
+
+    def latency_histogram(self) -> Dict[str, int]:
+        """Routing latency counts keyed by bucket upper bound."""
+        labels = [f"<={b}us" for b in LATENCY_BUCKETS_US] + [f">{LATENCY_BUCKETS_US[-1]}us"]
+        return dict(zip(labels, self._latency_counts))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "routed": self.routed,
+            "fallbacks": self.fallbacks,
+            "latency_histogram": self.latency_histogram()
+        }
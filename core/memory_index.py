@@ -0,0 +1,134 @@
+"""
+Memory similarity index for ANU
+Finds stored memories by meaning-ish similarity instead of exact key match
+("birthday" finds "my_bday"), fully offline. Keys and values are turned into
+hashed word + character-trigram vectors; an inverted index over the hashed
+features answers top-k cosine queries by touching only the postings of the
+query's features, and is updated in place on every remember/forget.
+"""
+
+import math
+import zlib
+from typing import List, Dict, Any, Tuple
+from core.tool_selector import tokenize
+
+# Common abbreviations people (and models) use for memory keys
+ALIASES = {
+    "bday": ["birthday"], "dob": ["birth", "date"], "birthdate": ["birthday"],
+    "addr": ["address"], "fav": ["favorite"], "favourite": ["favorite"],
+    "ph": ["phone"], "mob": ["mobile", "phone"], "tel": ["phone"], "num": ["number"],
+    "no": ["number"], "pwd": ["password"], "pw": ["password"],
+    "mom": ["mother"], "mum": ["mother"], "dad": ["father"], "bf": ["boyfriend"],
+    "gf": ["girlfriend"], "anniv": ["anniversary"], "appt": ["appointment"],
+    "colour": ["color"],
+}
+
+WORD_WEIGHT = 1.0
+TRIGRAM_WEIGHT = 0.5
+# Key text counts more than the value text
+KEY_WEIGHT = 2.0
+
+
+def _hash(feature: str, dims: int) -> int:
+    return zlib.crc32(feature.encode("utf-8")) & (dims - 1)
+
+
+def _terms(text: str) -> List[str]:
+    terms = []
+    for token in tokenize(text):
+        terms.append(token)
+        terms.extend(ALIASES.get(token, []))
+    return terms
+
+
+def vectorize(text: str, dims: int, weight: float = 1.0, vector: Dict[int, float] = None) -> Dict[int, float]:
+    """Add hashed word and character-trigram features of text to vector."""
+    vector = {} if vector is None else vector
+    for term in _terms(text):
+        h = _hash("w:" + term, dims)
+        vector[h] = vector.get(h, 0.0) + WORD_WEIGHT * weight
+        padded = f"#{term}#"
+        for i in range(len(padded) - 2):
+            h = _hash("c:" + padded[i:i + 3], dims)
+            vector[h] = vector.get(h, 0.0) + TRIGRAM_WEIGHT * weight
+    return vector
+
+
+def _normalize(vector: Dict[int, float]) -> Dict[int, float]:
+    norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+    return {h: w / norm for h, w in vector.items()}
+
+
+class MemoryIndex:
+    def __init__(self, dims: int = 1 << 20, max_df_ratio: float = 0.05):
+        self.dims = dims
+        # Features found in more than this share of memories (and more than 50)
+        # carry little signal and are skipped to keep queries fast
+        self.max_df_ratio = max_df_ratio
+        self.vectors: Dict[str, Dict[int, float]] = {}
+        # feature -> {memory key: weight}
+        self.postings: Dict[int, Dict[str, float]] = {}
+        # Indexed values, to tell which entries changed in sync()
+        self.values: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    # ============================================================
+    # UPDATES
+    # ============================================================
+
+    def add(self, key: str, value: Any):
+        """Index (or re-index) one memory."""
+        if key in self.vectors:
+            self.remove(key)
+        value = value if isinstance(value, str) else str(value)
+        vector = vectorize(key, self.dims, KEY_WEIGHT)
+        vectorize(value, self.dims, 1.0, vector)
+        vector = _normalize(vector)
+
+        self.vectors[key] = vector
+        self.values[key] = value
+        for h, w in vector.items():
+            self.postings.setdefault(h, {})[key] = w
+
+    def remove(self, key: str):
+        vector = self.vectors.pop(key, None)
+        self.values.pop(key, None)
+        if vector is None:
+            return
+        for h in vector:
+            posting = self.postings.get(h)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self.postings[h]
+
+    def sync(self, memory: Dict[str, Any]):
+        """Bring the index in line with the memory dict (e.g. after an external edit)."""
+        for key in [k for k in self.vectors if k not in memory]:
+            self.remove(key)
+        for key, value in memory.items():
+            value = value if isinstance(value, str) else str(value)
+            if self.values.get(key) != value:
+                self.add(key, value)
+
+    # ============================================================
+    # QUERIES
+    # ============================================================
+
+    def search(self, query: str, top_k: int = 3, min_score: float = 0.0) -> List[Tuple[float, str]]:
+        """Return up to top_k [(cosine score, key)] best first."""
+        query_vector = _normalize(vectorize(query, self.dims))
+        max_df = max(50, int(len(self.vectors) * self.max_df_ratio))
+
+        scores: Dict[str, float] = {}
+        for h, qw in query_vector.items():
+            posting = self.postings.get(h)
+            if not posting or len(posting) > max_df:
+                continue
+            for key, dw in posting.items():
+                scores[key] = scores.get(key, 0.0) + qw * dw
+
+        ranked = sorted(((s, k) for k, s in scores.items() if s >= min_score), key=lambda item: (-item[0], item[1]))
+        return ranked[:top_k]
@@ -0,0 +1,184 @@
+"""
+Write-behind persistence for ANU
+Moves file writes (memory file, response cache, history inserts) off the
+thread that serves the user. Writes go to a background thread through a
+coalescing queue: if a file is written again before the previous snapshot
+reached disk, only the latest snapshot is written. Files are replaced
+atomically (temp file + fsync + rename). Everything queued is flushed on
+quit and at interpreter exit.
+"""
+
+import os
+import json
+import time
+import atexit
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional, Hashable
+
+
+def atomic_write(path: str, data: str):
+    """Write text to path via a temp file and rename, so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class WriteBehindWriter:
+    def __init__(self):
+        # key -> (write function, payload, time queued); insertion ordered
+        self._pending: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._busy = False
+        # (key, payload) being written right now: still the newest data for
+        # key until the write finishes, so pending_data() keeps returning it
+        self._inflight: Optional[tuple] = None
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._sequence = itertools.count()
+
+        self.submitted = 0
+        self.coalesced = 0
+        self.written = 0
+        self.failures = 0
+        # Time the writes took on this thread instead of the caller's
+        self.saved_seconds = 0.0
+        self.max_lag = 0.0
+
+    # ============================================================
+    # SUBMISSION
+    # ============================================================
+
+    def submit(self, key: Optional[Hashable], write: Callable[[], None], payload: Any = None):
+        """
+        Queue write() to run in the background. A later submit with the same
+        key replaces a queued one (coalescing); key=None is never coalesced.
+        """
+        if key is None:
+            key = ("task", next(self._sequence))
+        with self._cond:
+            if self._closed:
+                # Shutting down: no thread left to hand it to
+                self._run(write)
+                return
+            if key in self._pending:
+                self.coalesced += 1
+                # Keep the original queue time so lag covers the whole wait
+                queued_at = self._pending.pop(key)[2]
+            else:
+                queued_at = time.monotonic()
+            self._pending[key] = (write, payload, queued_at)
+            self.submitted += 1
+            self._ensure_thread()
+            self._cond.notify()
+
+    def write_json(self, path: str, data: Any, **dump_kwargs):
+        """
+        Queue an atomic JSON snapshot of data to path. data must not be
+        mutated afterwards; pass a copy if the caller keeps changing it.
+        """
+        path = os.path.abspath(path)
+        self.submit(("file", path), lambda: atomic_write(path, json.dumps(data, **dump_kwargs)), data)
+
+    def pending_data(self, path: str) -> Any:
+        """The snapshot queued for path but not yet written, or None."""
+        key = ("file", os.path.abspath(path))
+        with self._cond:
+            entry = self._pending.get(key)
+            if entry:
+                return entry[1]
+            if self._inflight and self._inflight[0] == key:
+                return self._inflight[1]
+            return None
+
+    # ============================================================
+    # WORKER
+    # ============================================================
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._worker, name="write-behind", daemon=True)
+            self._thread.start()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                key, (write, payload, queued_at) = self._pending.popitem(last=False)
+                self._inflight = (key, payload)
+                self._busy = True
+
+            self.max_lag = max(self.max_lag, time.monotonic() - queued_at)
+            self.saved_seconds += self._run(write)
+
+            with self._cond:
+                self._busy = False
+                self._inflight = None
+                self._cond.notify_all()
+
+    def _run(self, write: Callable[[], None]) -> float:
+        """Run one write; returns the seconds it took."""
+        start = time.perf_counter()
+        try:
+            write()
+            self.written += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"Error in background write: {e}")
+        return time.perf_counter() - start
+
+    # ============================================================
+    # SHUTDOWN
+    # ============================================================
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is on disk."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._busy:
+                if self._thread is None or not self._thread.is_alive():
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+
+            # No worker (never started or already exited): write inline
+            leftovers = list(self._pending.values())
+            self._pending.clear()
+        for write, _, _ in leftovers:
+            self._run(write)
+        return True
+
+    def close(self):
+        """Flush and stop the worker; later submits are written inline."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "failures": self.failures,
+            "pending": len(self._pending),
+            "latency_saved_ms": round(self.saved_seconds * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1)
+        }
+
+
+# Process-wide writer shared by history, memory and the response cache
+writer = WriteBehindWriter()
+atexit.register(writer.close)
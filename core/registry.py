@@ -1,66 +1,341 @@
 import os
+import time
+import threading
 import importlib.util
 import inspect
-from typing import Dict, List, Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Set
 from .skill import Skill
+from .tool_cache import ToolResultCache
+from .tool_catalog import ToolCatalog
+from .skill_manifest import SkillManifest, LazySkill, MANIFEST_FILENAME
+from .skill_watcher import SkillWatcher
+from .skill_host import SkillHost, RemoteSkill
+from .tracing import tracer
 
 class SkillRegistry:
     def __init__(self):
         self.skills: Dict[str, Skill] = {}
-        self.tools_schema: List[Dict[str, Any]] = []
+        # Tool declarations keyed by name (deduplicated, with owner skill)
+        self.catalog = ToolCatalog()
         self.functions: Dict[str, Callable] = {}
+        # Tools that opted out of parallel execution
+        self.serial_functions: Set[str] = set()
+        # Memoization of tool results, per skill-declared policy
+        self.tool_cache = ToolResultCache()
+        self.cache_policies: Dict[str, Dict[str, Any]] = {}
+        self._wrapped_functions: Dict[str, Callable] = {}
+        self._wrapped_version = None
+        # Bumped whenever the set of tools changes so that consumers
+        # (e.g. the engine's compiled tool declarations) can cache safely.
+        self.version = 0
+        # Seconds spent importing each skill module in the last load_skills()
+        self.load_timings: Dict[str, float] = {}
 
-    def load_skills(self, skills_dir: str, context: Dict[str, Any] = None):
-        """Dynamically load skills from the specified directory."""
+        # Hot reload bookkeeping: which skills each file provided, the file
+        # mtimes seen at load time and the arguments of the last load_skills()
+        self.skill_files: Dict[str, List[str]] = {}
+        self.file_mtimes: Dict[str, float] = {}
+        self._skills_dir = None
+        self._context = None
+        self._lazy = False
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+
+        # Skill modules that run in a worker process (see mark_out_of_process)
+        self.out_of_process: Set[str] = set()
+        self.skill_hosts: Dict[str, SkillHost] = {}
+
+    def load_skills(self, skills_dir: str, context: Dict[str, Any] = None, lazy: bool = False,
+                    max_workers: int = 8):
+        """
+        Dynamically load skills from the specified directory.
+        With lazy=True, skills whose file is unchanged since the last run are
+        registered from the manifest and only imported on first use.
+        The remaining modules are imported and initialized in a thread pool,
+        then registered in filename order so the tool list is deterministic.
+        """
         if not os.path.exists(skills_dir):
             print(f"Skills directory not found: {skills_dir}")
             return
 
-        for filename in os.listdir(skills_dir):
+        manifest = SkillManifest(os.path.join(skills_dir, MANIFEST_FILENAME)) if lazy else None
+        start = time.perf_counter()
+        self._skills_dir, self._context, self._lazy = skills_dir, context, lazy
+
+        # (module_name, file_path, manifest entry or None), in filename order
+        files = []
+        for filename in sorted(os.listdir(skills_dir)):
             if filename.endswith(".py") and filename != "__init__.py":
-                module_name = filename[:-3]
                 file_path = os.path.join(skills_dir, filename)
-                self._load_skill_from_file(module_name, file_path, context)
+                self.file_mtimes[file_path] = os.stat(file_path).st_mtime
+                entry = manifest.lookup(file_path) if manifest else None
+                files.append((filename[:-3], file_path, entry))
+
+        # Import everything the manifest can't describe concurrently
+        pending = [(module_name, file_path) for module_name, file_path, entry in files if entry is None]
+        results = {}
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))),
+                                    thread_name_prefix="skill-loader") as pool:
+                futures = {
+                    module_name: pool.submit(self._timed_instantiate, module_name, file_path, context)
+                    for module_name, file_path in pending
+                }
+                results = {module_name: future.result() for module_name, future in futures.items()}
+
+        # Register in filename order regardless of completion order
+        self.load_timings = {}
+        for module_name, file_path, entry in files:
+            if entry is not None:
+                for info in entry["skills"]:
+                    if module_name in self.out_of_process:
+                        # The worker is started by the first call
+                        host = self.skill_hosts.setdefault(module_name, SkillHost(module_name, file_path))
+                        skill = RemoteSkill(info, host)
+                    else:
+                        skill = LazySkill(info, module_name, file_path, context, loader=self._instantiate_skills)
+                    self._register_unique(skill, file_path)
+                continue
+
+            skills, elapsed, error = results[module_name]
+            self.load_timings[module_name] = elapsed
+            if error:
+                print(f"Failed to load skills from {module_name}: {error}")
+                continue
+            for skill_instance in skills:
+                if self._register_unique(skill_instance, file_path):
+                    print(f"Loaded skill: {skill_instance.name}")
+            if manifest:
+                manifest.update(file_path, skills)
+
+        if manifest:
+            manifest.save()
+
+        self._print_load_report(time.perf_counter() - start)
+
+    def _timed_instantiate(self, module_name: str, file_path: str, context: Dict[str, Any] = None) -> tuple:
+        """Worker for load_skills(): returns (skills, seconds, error)."""
+        start_ns = time.perf_counter_ns()
+        try:
+            skills, error = self._create_skills(module_name, file_path, context), None
+        except Exception as e:
+            skills, error = [], e
+        end_ns = time.perf_counter_ns()
+        tracer.record(f"skill_load:{module_name}", start_ns, end_ns, ok=error is None)
+        return skills, (end_ns - start_ns) / 1e9, error
+
+    def _register_unique(self, skill: Skill, file_path: str) -> bool:
+        """Register a skill unless one with the same name is already loaded."""
+        if skill.name in self.skills:
+            print(f"Skipping duplicate skill '{skill.name}' from {os.path.basename(file_path)}")
+            return False
+        self.register_skill(skill)
+        self.skill_files.setdefault(file_path, []).append(skill.name)
+        return True
 
-    def _load_skill_from_file(self, module_name: str, file_path: str, context: Dict[str, Any] = None):
+    def _print_load_report(self, total: float):
+        if not self.load_timings:
+            return
+        print(f"Skill load times ({len(self.load_timings)} imported, {total * 1000:.0f} ms wall):")
+        for module_name, elapsed in sorted(self.load_timings.items(), key=lambda item: -item[1]):
+            print(f"   {elapsed * 1000:7.1f} ms  {module_name}")
+
+    def _create_skills(self, module_name: str, file_path: str, context: Dict[str, Any] = None) -> List[Skill]:
+        """Instantiate a module's skills, in a worker process if it is marked out-of-process."""
+        if module_name not in self.out_of_process:
+            return self._instantiate_skills(module_name, file_path, context)
+
+        # Start the new worker before retiring the old one, so a module that
+        # fails to import leaves the running version in place
+        host = SkillHost(module_name, file_path)
+        infos = host.start()
+        old_host = self.skill_hosts.get(module_name)
+        self.skill_hosts[module_name] = host
+        if old_host:
+            old_host.stop()
+        return [RemoteSkill(info, host) for info in infos]
+
+    def _instantiate_skills(self, module_name: str, file_path: str, context: Dict[str, Any] = None) -> List[Skill]:
+        """Import a skill module and create its skill instances (without registering them)."""
         spec = importlib.util.spec_from_file_location(module_name, file_path)
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            # First try to find register() function (new simpler pattern)
-            if hasattr(module, 'register'):
+        if not (spec and spec.loader):
+            return []
+
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        # First try to find register() function (new simpler pattern)
+        if hasattr(module, 'register'):
+            try:
+                skill_instance = module.register()  # Call without self
+                return [skill_instance] if skill_instance else []
+            except Exception as e:
+                print(f"Failed to register skill {module_name}: {e}")
+
+        # Fall back to class-based skills
+        skills = []
+        for name, obj in inspect.getmembers(module):
+            if inspect.isclass(obj) and issubclass(obj, Skill) and obj is not Skill:
                 try:
-                    skill_instance = module.register()  # Call without self
-                    if skill_instance:
-                        self.register_skill(skill_instance)
-                        print(f"Loaded skill: {skill_instance.name}")
-                    return  # Successfully registered using function pattern
+                    skill_instance = obj()
+                    if context:
+                        skill_instance.initialize(context)
+                    skills.append(skill_instance)
                 except Exception as e:
-                    print(f"Failed to register skill {module_name}: {e}")
-            
-            # Fall back to class-based skills
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, Skill) and obj is not Skill:
-                    try:
-                        skill_instance = obj()
-                        if context:
-                            skill_instance.initialize(context)
-                        self.register_skill(skill_instance)
-                        print(f"Loaded skill: {skill_instance.name}")
-                    except Exception as e:
-                        print(f"Failed to load skill {name}: {e}")
+                    print(f"Failed to load skill {name}: {e}")
+        return skills
+
+    def _load_skill_from_file(self, module_name: str, file_path: str, context: Dict[str, Any] = None) -> List[Skill]:
+        skills = self._instantiate_skills(module_name, file_path, context)
+        for skill_instance in skills:
+            self.register_skill(skill_instance)
+            print(f"Loaded skill: {skill_instance.name}")
+        return skills
+
+    # ============================================================
+    # HOT RELOAD
+    # ============================================================
+
+    def start_watching(self, interval: float = 1.0) -> SkillWatcher:
+        """Poll the loaded skills directory and hot-reload changed modules."""
+        if self._skills_dir is None:
+            raise RuntimeError("load_skills() must be called before start_watching()")
+        if self._watcher is None:
+            self._watcher = SkillWatcher(self, self._skills_dir, interval, mtimes=self.file_mtimes)
+            self._watcher.start()
+            print(f"👀 Watching {self._skills_dir} for skill changes")
+        return self._watcher
+
+    def stop_watching(self):
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+    def reload_skill_file(self, file_path: str) -> bool:
+        """
+        Re-import one skill module (or drop it if the file is gone) and swap
+        its entries in. The module is imported before anything is replaced,
+        so a broken edit leaves the previous version running.
+        """
+        module_name = os.path.basename(file_path)[:-3]
+        with self._reload_lock:
+            new_skills = []
+            if os.path.exists(file_path):
+                try:
+                    new_skills = self._create_skills(module_name, file_path, self._context)
+                except Exception as e:
+                    print(f"Failed to reload {module_name}, keeping the previous version: {e}")
+                    return False
+
+            self._swap_skills(file_path, new_skills)
+
+            if self._lazy:
+                manifest = SkillManifest(os.path.join(os.path.dirname(file_path), MANIFEST_FILENAME))
+                if os.path.exists(file_path):
+                    manifest.update(file_path, new_skills)
+                else:
+                    manifest.remove(file_path)
+                manifest.save()
+
+        names = ", ".join(skill.name for skill in new_skills) or "none"
+        print(f"Reloaded {module_name} (skills: {names})")
+        return True
+
+    # ============================================================
+    # OUT-OF-PROCESS SKILLS
+    # ============================================================
+
+    def mark_out_of_process(self, *module_names: str):
+        """
+        Run these skill modules (file names without .py) in worker processes.
+        Must be called before load_skills(). Note that the load context
+        (e.g. pause_event) is not available to them.
+        """
+        self.out_of_process.update(module_names)
+
+    def stop_skill_hosts(self):
+        for host in self.skill_hosts.values():
+            host.stop()
+
+    def _swap_skills(self, file_path: str, new_skills: List[Skill]):
+        """
+        Replace the skills a file provided with new_skills. New containers are
+        built and assigned in one step each, so a conversation that is
+        iterating the old ones (or already holds a compiled config) is not
+        disturbed; the version bump afterwards invalidates every cache keyed on it.
+        """
+        old_names = self.skill_files.get(file_path, [])
+        old_functions = set()
+        for name in old_names:
+            old_skill = self.skills.get(name)
+            if old_skill is None:
+                continue
+            old_functions.update(old_skill.get_functions().keys())
+
+        skills = {name: skill for name, skill in self.skills.items() if name not in old_names}
+        functions = {name: func for name, func in self.functions.items() if name not in old_functions}
+        new_tools = {}
+        serial_functions = self.serial_functions - old_functions
+        cache_policies = {name: policy for name, policy in self.cache_policies.items()
+                          if name not in old_functions}
+
+        registered = []
+        for skill in new_skills:
+            if skill.name in skills:
+                print(f"Skipping duplicate skill '{skill.name}' from {os.path.basename(file_path)}")
+                continue
+            skills[skill.name] = skill
+            new_tools[skill.name] = skill.get_tools()
+            skill_functions = skill.get_functions()
+            functions.update(skill_functions)
+            if not getattr(skill, "concurrent", True):
+                serial_functions |= set(skill_functions)
+            cache_policies.update(skill.get_cache_policies())
+            registered.append(skill.name)
+
+        self.skills = skills
+        self.functions = functions
+        self.catalog.replace_owner(old_names, new_tools)
+        self.serial_functions = serial_functions
+        self.cache_policies = cache_policies
+        if registered:
+            self.skill_files[file_path] = registered
+        else:
+            self.skill_files.pop(file_path, None)
+        if os.path.exists(file_path):
+            self.file_mtimes[file_path] = os.stat(file_path).st_mtime
+        else:
+            self.file_mtimes.pop(file_path, None)
+
+        module_name = os.path.basename(file_path)[:-3]
+        if not os.path.exists(file_path) and module_name in self.skill_hosts:
+            self.skill_hosts.pop(module_name).stop()
+
+        # Memoized results may come from the old code
+        self.tool_cache.invalidate(old_functions)
+        self.version += 1
 
     def register_skill(self, skill: Skill):
         self.skills[skill.name] = skill
-        self.tools_schema.extend(skill.get_tools())
-        self.functions.update(skill.get_functions())
+        self.catalog.add_many(skill.get_tools(), owner=skill.name)
+        functions = skill.get_functions()
+        self.functions.update(functions)
+        if not getattr(skill, "concurrent", True):
+            self.serial_functions.update(functions.keys())
+        self.cache_policies.update(skill.get_cache_policies())
+        self.version += 1
     
     def register(self, name: str, func: Callable, description: str, 
-                 parameters: Dict[str, Any], required: List[str]):
+                 parameters: Dict[str, Any], required: List[str], concurrent: bool = True,
+                 cache_policy: Dict[str, Any] = None):
         """Simple function registration for new-style skills"""
         # Add to functions dict
         self.functions[name] = func
+        if not concurrent:
+            self.serial_functions.add(name)
+        if cache_policy:
+            self.cache_policies[name] = cache_policy
         
         # Create tool schema
         tool_schema = {
@@ -75,10 +350,42 @@ class SkillRegistry:
                 }
             }
         }
-        self.tools_schema.append(tool_schema)
+        self.catalog.add(tool_schema)
+        self.version += 1
+
+    @property
+    def tools_schema(self) -> List[Dict[str, Any]]:
+        """Enabled tool declarations (OpenAI shape), one per name."""
+        return self.catalog.openai_tools()
 
     def get_tools_schema(self) -> List[Dict[str, Any]]:
-        return self.tools_schema
+        return self.catalog.openai_tools()
+
+    def set_tool_enabled(self, name: str, enabled: bool) -> bool:
+        """Stop (or resume) advertising a tool to the model without unloading its skill."""
+        if not self.catalog.set_enabled(name, enabled):
+            return False
+        self.version += 1
+        return True
 
     def get_function(self, name: str) -> Callable:
-        return self.functions.get(name)
+        """Return the callable for a tool, wrapped by its cache policy if any."""
+        if self._wrapped_version != self.version:
+            self._wrapped_functions = {}
+            self._wrapped_version = self.version
+
+        wrapped = self._wrapped_functions.get(name)
+        if wrapped is None:
+            func = self.functions.get(name)
+            if func is not None and name in self.catalog and not self.catalog.is_enabled(name):
+                return None
+            policy = self.cache_policies.get(name)
+            if func is None or not policy or inspect.iscoroutinefunction(func):
+                return func
+            wrapped = self.tool_cache.wrap(name, func, policy)
+            self._wrapped_functions[name] = wrapped
+        return wrapped
+
+    def is_concurrent(self, name: str) -> bool:
+        """Whether the tool may run in parallel with other tool calls."""
+        return name not in self.serial_functions
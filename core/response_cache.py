@@ -0,0 +1,155 @@
+"""
+Response Cache for ANU
+Serves repeated tool-free queries ("tell me a joke", "hello anu") without a
+Gemini round trip. Opt-in; persisted to disk so warm hits survive restarts.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Optional, Iterable
+from core.persistence import writer
+
+# Answers built from these tools go stale within minutes and must never be
+# served from the cache.
+TIME_SENSITIVE_TOOLS = {
+    "get_current_time", "get_current_date", "get_current_datetime",
+    "get_weather", "get_current_location_weather",
+    "check_unread_emails", "get_recent_emails", "read_recent_emails", "search_emails",
+    "get_news_headlines", "search_news",
+    "get_todays_events", "get_upcoming_events",
+    "get_running_apps", "get_system_info",
+    "retrieve_memory", "list_all_memories",
+    "list_whatsapp_contacts",
+}
+
+# Tools without side effects whose output does not depend on the clock.
+# A response is only cached if every tool used in the turn is listed here,
+# so cache hits never skip an action (volume, messages, screenshots...).
+PURE_TOOLS = {
+    "tell_joke", "fun_fact", "motivate", "compliment",
+    "calculate", "convert_units", "percentage_calculator", "tip_calculator",
+}
+
+# Prompts whose answer never depends on the conversation so far (normalized,
+# see ResponseCache.normalize). They are keyed on the prompt alone so they
+# hit whatever was said before; every other prompt is keyed on the recent
+# context as well, since "what did I just say" or "what is my name" can
+# look standalone and still depend on it.
+STANDALONE_PROMPTS = {
+    "hello", "hello anu", "hi", "hi anu", "hey anu", "hey",
+    "good morning", "good morning anu", "good afternoon", "good evening",
+    "good night", "good night anu",
+    "thank you", "thanks", "thank you anu", "thanks anu",
+    "how are you", "how are you anu", "who are you", "what can you do",
+    "what is your name", "whats your name",
+    "tell me a joke", "tell me a fun fact", "fun fact", "motivate me",
+    "compliment me", "what time is it", "whats the time",
+    "what is the date", "whats the date", "what day is it",
+}
+
+
+class ResponseCache:
+    def __init__(self, cache_file="response_cache.json", max_entries=256,
+                 ttl=24 * 60 * 60, context_messages=2):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # How many prior history messages are part of the key
+        self.context_messages = context_messages
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.load_cache()
+
+    @staticmethod
+    def normalize(prompt: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace."""
+        prompt = re.sub(r"[^\w\s]", "", prompt.lower())
+        return " ".join(prompt.split())
+
+    @staticmethod
+    def is_standalone(prompt: str) -> bool:
+        """True for known prompts whose answer doesn't depend on earlier turns."""
+        return ResponseCache.normalize(prompt) in STANDALONE_PROMPTS
+
+    def make_key(self, prompt: str, context: List[Dict], tools_version: int) -> str:
+        """
+        Key on the normalized prompt, the tool set and a hash of the recent
+        context. Known standalone prompts leave the context out, so they hit
+        no matter what was said before them.
+        """
+        raw = f"{self.normalize(prompt)}|{tools_version}"
+        if not self.is_standalone(prompt):
+            context_text = "\n".join(f"{m['role']}:{m['content']}" for m in context)
+            raw += "|" + hashlib.sha256(context_text.encode("utf-8")).hexdigest()
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_cacheable(used_tools: Iterable[str]) -> bool:
+        used_tools = set(used_tools)
+        if used_tools & TIME_SENSITIVE_TOOLS:
+            return False
+        return used_tools <= PURE_TOOLS
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if time.time() - entry["created"] > self.ttl:
+            del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry["response"]
+
+    def put(self, key: str, response: str):
+        self.entries[key] = {"response": response, "created": time.time()}
+        self.entries.move_to_end(key)
+
+        # LRU eviction
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+        self.save_cache()
+
+    def clear(self):
+        self.entries.clear()
+        self.save_cache()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self.entries)
+        }
+
+    def save_cache(self):
+        """Save cache entries (in LRU order) to JSON file"""
+        # Entries are never mutated once stored, so a shallow snapshot is enough
+        writer.write_json(self.cache_file, list(self.entries.items()))
+
+    def load_cache(self):
+        """Load cache entries from JSON file, dropping expired ones"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r') as f:
+                    items = json.load(f)
+                now = time.time()
+                self.entries = OrderedDict(
+                    (key, entry) for key, entry in items
+                    if now - entry["created"] <= self.ttl
+                )
+                print(f"Loaded {len(self.entries)} cached responses")
+        except Exception as e:
+            print(f"Error loading response cache: {e}")
+            self.entries = OrderedDict()
@@ -3,6 +3,11 @@ from typing import List, Dict, Any, Callable
 
 class Skill(ABC):
     """Base class for all Skills."""
+
+    # Set to False for skills whose tools must not run in parallel with
+    # each other (e.g. a shared Selenium driver, or anything touching
+    # the pause_event). Such tools are executed one at a time.
+    concurrent = True
     
     @abstractmethod
     def get_tools(self) -> List[Dict[str, Any]]:
@@ -14,6 +19,14 @@ class Skill(ABC):
         """Return a dictionary mapping function names to the actual callables."""
         pass
 
+    def get_cache_policies(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Optional per-function result cache policies, e.g.
+        {"get_weather": {"ttl": 600, "key_args": ["city", "pincode"]},
+         "add_contact": {"cacheable": False, "invalidates": ["list_contacts"]}}
+        """
+        return {}
+
     def initialize(self, context: Dict[str, Any]):
         """
         Initialize the skill with context from the main application.
@@ -0,0 +1,243 @@
+"""
+Out-of-process skill host
+Runs a skill module (camera, vision, WhatsApp/Selenium...) in a long-lived
+worker process and proxies its tool calls over a pipe, so heavy imports
+(cv2, torch) stay out of the assistant's process and a wedged driver can be
+killed without freezing the voice loop.
+
+The worker is started as `python -m core.skill_host <module> <file>`; requests
+and replies are pickled over its stdin/stdout. The worker's own prints go to
+stderr so they can't corrupt the reply stream.
+"""
+
+import os
+import sys
+import queue
+import pickle
+import asyncio
+import inspect
+import threading
+import subprocess
+from typing import List, Dict, Any, Callable, Optional
+from .skill import Skill
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SkillHostError(Exception):
+    pass
+
+
+class SkillHost:
+    def __init__(self, module_name: str, file_path: str, timeout: float = 30.0,
+                 startup_timeout: float = 60.0):
+        self.module_name = module_name
+        self.file_path = os.path.abspath(file_path)
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+
+        self.process: Optional[subprocess.Popen] = None
+        self.skills: List[Dict[str, Any]] = []
+        self._replies: "queue.Queue" = queue.Queue()
+        # One request in flight per worker
+        self._lock = threading.Lock()
+
+        self.starts = 0
+        self.calls = 0
+        self.timeouts = 0
+        self.crashes = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    # ============================================================
+    # PROCESS LIFECYCLE
+    # ============================================================
+
+    def start(self) -> List[Dict[str, Any]]:
+        """Spawn the worker and return the skill descriptions it reports."""
+        with self._lock:
+            return self._start()
+
+    def _start(self) -> List[Dict[str, Any]]:
+        self._kill()
+        self._replies = queue.Queue()
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "core.skill_host", self.module_name, self.file_path],
+            cwd=PROJECT_ROOT,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+        self.starts += 1
+        threading.Thread(target=self._read_replies, args=(self.process, self._replies),
+                         name=f"skill-host-{self.module_name}", daemon=True).start()
+
+        kind, payload = self._wait_reply(self.startup_timeout)
+        if kind != "ready":
+            self._kill()
+            raise SkillHostError(f"{self.module_name} worker failed to start: {payload}")
+        self.skills = payload
+        print(f"🧩 {self.module_name} running out of process (pid {self.process.pid})")
+        return self.skills
+
+    def stop(self):
+        with self._lock:
+            self._kill()
+
+    def _kill(self, force: bool = False):
+        """Stop the worker: close its stdin and let it exit, or kill it outright."""
+        process, self.process = self.process, None
+        if process is None or process.poll() is not None:
+            return
+        try:
+            if force:
+                raise TimeoutError
+            process.stdin.close()
+            process.wait(timeout=2)
+        except Exception:
+            process.kill()
+            process.wait()
+
+    @staticmethod
+    def _read_replies(process: subprocess.Popen, replies: "queue.Queue"):
+        try:
+            while True:
+                replies.put(pickle.load(process.stdout))
+        except Exception:
+            # EOF: the worker exited or crashed
+            replies.put(("exit", process.wait()))
+
+    def _wait_reply(self, timeout: float) -> tuple:
+        try:
+            return self._replies.get(timeout=timeout)
+        except queue.Empty:
+            return ("timeout", None)
+
+    # ============================================================
+    # CALLS
+    # ============================================================
+
+    def call(self, skill_name: str, function_name: str, kwargs: Dict[str, Any],
+             timeout: Optional[float] = None) -> Any:
+        """Run a tool function in the worker, (re)starting it if needed."""
+        timeout = timeout or self.timeout
+        with self._lock:
+            if not self.alive:
+                if self.starts:
+                    print(f"🔁 Restarting {self.module_name} worker")
+                try:
+                    self._start()
+                except Exception as e:
+                    return {"status": "error", "message": f"Skill {skill_name} is unavailable: {e}"}
+
+            self.calls += 1
+            try:
+                pickle.dump(("call", skill_name, function_name, kwargs), self.process.stdin)
+                self.process.stdin.flush()
+            except (OSError, ValueError):
+                self.crashes += 1
+                self._kill()
+                return {"status": "error", "message": f"Skill {skill_name} crashed; it will be restarted."}
+
+            kind, payload = self._wait_reply(timeout)
+            if kind == "result":
+                return payload
+            if kind == "error":
+                raise SkillHostError(payload)
+            if kind == "timeout":
+                # The worker may be wedged (e.g. a hung Chrome driver): replace it
+                self.timeouts += 1
+                self._kill(force=True)
+                return {"status": "error",
+                        "message": f"{function_name} timed out after {timeout:.0f}s; the skill was restarted."}
+            self.crashes += 1
+            self._kill()
+            return {"status": "error", "message": f"Skill {skill_name} crashed (exit code {payload}); it will be restarted."}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "alive": self.alive,
+            "starts": self.starts,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes
+        }
+
+
+class RemoteSkill(Skill):
+    """Proxy registered in place of a skill that runs in a SkillHost."""
+
+    def __init__(self, info: Dict[str, Any], host: SkillHost):
+        self._info = info
+        self.host = host
+        self.concurrent = info.get("concurrent", True)
+
+    @property
+    def name(self) -> str:
+        return self._info["name"]
+
+    def get_tools(self) -> List[Dict[str, Any]]:
+        return self._info["tools"]
+
+    def get_cache_policies(self) -> Dict[str, Dict[str, Any]]:
+        return self._info.get("cache_policies", {})
+
+    def get_functions(self) -> Dict[str, Callable]:
+        return {name: self._make_stub(name) for name in self._info["functions"]}
+
+    def _make_stub(self, function_name: str) -> Callable:
+        def stub(**kwargs):
+            return self.host.call(self.name, function_name, kwargs)
+        stub.__name__ = function_name
+        return stub
+
+
+# ============================================================
+# WORKER PROCESS
+# ============================================================
+
+def _worker_main(module_name: str, file_path: str):
+    # Keep the real stdout for replies; everything the skill prints goes to stderr
+    replies = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+    requests = sys.stdin.buffer
+
+    def send(message):
+        try:
+            data = pickle.dumps(message)
+        except Exception:
+            data = pickle.dumps((message[0], str(message[1])))
+        replies.write(data)
+        replies.flush()
+
+    from core.registry import SkillRegistry
+    from core.skill_manifest import skill_info
+
+    try:
+        skills = SkillRegistry()._instantiate_skills(module_name, file_path)
+    except Exception as e:
+        send(("failed", f"{type(e).__name__}: {e}"))
+        return
+    send(("ready", [skill_info(skill) for skill in skills]))
+
+    functions = {skill.name: skill.get_functions() for skill in skills}
+    while True:
+        try:
+            _, skill_name, function_name, kwargs = pickle.load(requests)
+        except EOFError:
+            # Parent closed the pipe (shutdown, restart or parent exit)
+            return
+
+        try:
+            result = functions[skill_name][function_name](**kwargs)
+            if inspect.iscoroutine(result):
+                result = asyncio.run(result)
+            send(("result", result))
+        except Exception as e:
+            send(("error", f"{type(e).__name__}: {e}"))
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, PROJECT_ROOT)
+    _worker_main(sys.argv[1], sys.argv[2])
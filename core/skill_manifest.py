@@ -0,0 +1,150 @@
+"""
+Skill Manifest for lazy loading
+Caches each skill file's tool schemas in an index file so the registry can
+advertise tools at startup without importing the module. The module is only
+imported on the first call to one of its functions.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import List, Dict, Any, Callable, Optional
+from .skill import Skill
+
+MANIFEST_FILENAME = ".skill_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _file_hash(file_path: str) -> str:
+    with open(file_path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def skill_info(skill: Skill) -> Dict[str, Any]:
+    """Everything needed to register a skill without importing its module."""
+    return {
+        "name": skill.name,
+        "tools": skill.get_tools(),
+        "functions": list(skill.get_functions().keys()),
+        "concurrent": getattr(skill, "concurrent", True),
+        "cache_policies": skill.get_cache_policies()
+    }
+
+
+class SkillManifest:
+    def __init__(self, manifest_path: str):
+        self.manifest_path = manifest_path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.files = data.get("files", {})
+        except Exception as e:
+            print(f"Error loading skill manifest: {e}")
+            self.files = {}
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": MANIFEST_VERSION, "files": self.files}, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving skill manifest: {e}")
+
+    def lookup(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for file_path if it is still up to date, else None."""
+        entry = self.files.get(os.path.basename(file_path))
+        if entry is None:
+            return None
+
+        stat = os.stat(file_path)
+        if entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            return entry
+
+        # Touched but not changed (e.g. git checkout): refresh the stat info
+        if entry["sha1"] == _file_hash(file_path):
+            entry["mtime"] = stat.st_mtime
+            entry["size"] = stat.st_size
+            self.dirty = True
+            return entry
+        return None
+
+    def update(self, file_path: str, skills: List[Skill]):
+        """Record the skills (and their schemas) a freshly imported file provides."""
+        stat = os.stat(file_path)
+        self.files[os.path.basename(file_path)] = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "sha1": _file_hash(file_path),
+            "skills": [skill_info(skill) for skill in skills]
+        }
+        self.dirty = True
+
+    def remove(self, file_path: str):
+        if self.files.pop(os.path.basename(file_path), None) is not None:
+            self.dirty = True
+
+
+class LazySkill(Skill):
+    """
+    Stand-in for a skill described by the manifest. Its functions are stubs
+    that import the module and create the real skill on first call.
+    """
+
+    def __init__(self, info: Dict[str, Any], module_name: str, file_path: str,
+                 context: Optional[Dict[str, Any]], loader: Callable):
+        self._info = info
+        self._module_name = module_name
+        self._file_path = file_path
+        self._context = context
+        # loader(module_name, file_path, context) -> List[Skill]
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._functions: Optional[Dict[str, Callable]] = None
+        self.concurrent = info.get("concurrent", True)
+
+    @property
+    def name(self) -> str:
+        return self._info["name"]
+
+    @property
+    def loaded(self) -> bool:
+        return self._functions is not None
+
+    def get_tools(self) -> List[Dict[str, Any]]:
+        return self._info["tools"]
+
+    def get_cache_policies(self) -> Dict[str, Dict[str, Any]]:
+        return self._info.get("cache_policies", {})
+
+    def get_functions(self) -> Dict[str, Callable]:
+        return {name: self._make_stub(name) for name in self._info["functions"]}
+
+    def _load(self) -> Dict[str, Callable]:
+        with self._lock:
+            if self._functions is None:
+                print(f"Lazy-loading skill: {self.name}")
+                for skill in self._loader(self._module_name, self._file_path, self._context):
+                    if skill.name == self.name:
+                        self._functions = skill.get_functions()
+                        break
+                else:
+                    raise RuntimeError(f"Skill '{self.name}' not found in {self._file_path}")
+        return self._functions
+
+    def _make_stub(self, function_name: str) -> Callable:
+        def stub(**kwargs):
+            return self._load()[function_name](**kwargs)
+        stub.__name__ = function_name
+        return stub
@@ -0,0 +1,72 @@
+"""
+Skill hot-reload watcher
+Polls the skills directory's mtimes on a background thread and asks the
+registry to reload any module that was added, changed or removed. One
+scandir() per interval, so it costs next to nothing when nothing changes.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+
+class SkillWatcher:
+    def __init__(self, registry, skills_dir: str, interval: float = 1.0,
+                 mtimes: Optional[Dict[str, float]] = None):
+        self.registry = registry
+        self.skills_dir = skills_dir
+        self.interval = interval
+        # Baseline; defaults to the current state of the directory
+        self.mtimes = dict(mtimes) if mtimes is not None else self.snapshot()
+        self.reloads = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def snapshot(self) -> Dict[str, float]:
+        """{file_path: mtime} for every skill module in the directory."""
+        mtimes = {}
+        try:
+            with os.scandir(self.skills_dir) as entries:
+                for entry in entries:
+                    # Skip __init__.py and editor temp/lock files (.#foo.py)
+                    if (entry.name.endswith(".py") and entry.name != "__init__.py"
+                            and not entry.name.startswith(".")):
+                        mtimes[entry.path] = entry.stat().st_mtime
+        except OSError as e:
+            print(f"Error scanning skills directory: {e}")
+            return self.mtimes
+        return mtimes
+
+    def poll(self) -> List[str]:
+        """Reload whatever changed since the last poll; returns the changed paths."""
+        current = self.snapshot()
+        changed = sorted(
+            path for path in set(current) | set(self.mtimes)
+            if current.get(path) != self.mtimes.get(path)
+        )
+        for path in changed:
+            print(f"🔄 Skill file changed: {os.path.basename(path)}")
+            self.registry.reload_skill_file(path)
+            self.reloads += 1
+        self.mtimes = current
+        return changed
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="skill-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error in skill watcher: {e}")
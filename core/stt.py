@@ -0,0 +1,268 @@
+"""
+Speech-to-text backends for ANU
+Every engine implements the same small interface, so the assistant can run
+on Google's web API or fully offline:
+
+  - GoogleSTT: speech_recognition's free Google endpoint (network, final only)
+  - VoskSTT: offline Kaldi models via `vosk`, with streaming partial results
+  - WhisperCppSTT: offline whisper.cpp CPU models through its CLI (final only)
+
+A backend decodes one utterance through an STTSession: feed() takes 16-bit
+mono PCM frames as they are captured and may return a partial hypothesis;
+finish() returns the final transcript. Engines that can't stream simply
+buffer the frames and decode on finish().
+
+StreamingTranscriber connects a backend to AudioCapture: it receives speech
+frames from the capture thread, decodes on its own thread, reports partials
+through on_partial and queues final transcripts for listen(), each tagged
+with whether it overlapped ANU's own speech.
+"""
+
+import os
+import json
+import queue
+import tempfile
+import threading
+import subprocess
+from abc import ABC, abstractmethod
+from typing import Callable, Optional, Dict, Any
+
+import speech_recognition as sr
+
+from core.tracing import tracer
+
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+
+class STTSession:
+    """One utterance. The default buffers frames and decodes everything on finish()."""
+
+    def __init__(self, backend: "STTBackend", sample_rate: int):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.frames = []
+
+    def feed(self, frame: bytes) -> Optional[str]:
+        self.frames.append(frame)
+        return None
+
+    def finish(self) -> str:
+        audio = sr.AudioData(b"".join(self.frames), self.sample_rate, SAMPLE_WIDTH)
+        return self.backend.transcribe(audio)
+
+
+class STTBackend(ABC):
+    """Base class for speech-to-text engines."""
+
+    name = "base"
+    # Emits partial hypotheses while the user is still speaking
+    streaming = False
+    # Works without a network connection
+    offline = True
+
+    @abstractmethod
+    def transcribe(self, audio: sr.AudioData) -> str:
+        """Final transcript of a whole utterance ("" if nothing was recognized)."""
+        pass
+
+    def start_stream(self, sample_rate: int) -> STTSession:
+        return STTSession(self, sample_rate)
+
+
+# ============================================================
+# BACKENDS
+# ============================================================
+
+class GoogleSTT(STTBackend):
+    name = "google"
+    offline = False
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        try:
+            return self.recognizer.recognize_google(audio)
+        except sr.UnknownValueError:
+            return ""
+
+
+class VoskSession(STTSession):
+    def __init__(self, backend: "VoskSTT", sample_rate: int):
+        super().__init__(backend, sample_rate)
+        self.recognizer = backend.vosk.KaldiRecognizer(backend.model, sample_rate)
+        # Text of segments Vosk already finalized inside this utterance
+        self.finalized = []
+
+    def feed(self, frame: bytes) -> Optional[str]:
+        if self.recognizer.AcceptWaveform(frame):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+            if text:
+                self.finalized.append(text)
+            return " ".join(self.finalized) or None
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return " ".join(self.finalized + [partial]).strip() or None
+
+    def finish(self) -> str:
+        text = json.loads(self.recognizer.FinalResult()).get("text", "")
+        return " ".join(self.finalized + [text]).strip()
+
+
+class VoskSTT(STTBackend):
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_path: Optional[str] = None):
+        try:
+            import vosk
+        except ImportError:
+            raise ImportError("Vosk STT needs the 'vosk' package: pip install vosk")
+        model_path = model_path or os.environ.get("VOSK_MODEL_PATH", "models/vosk")
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Vosk model not found at {model_path} (set VOSK_MODEL_PATH)")
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        # Loading the model takes a while: once per process
+        self.model = vosk.Model(model_path)
+
+    def start_stream(self, sample_rate: int) -> STTSession:
+        return VoskSession(self, sample_rate)
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        session = self.start_stream(audio.sample_rate)
+        data = audio.get_raw_data(convert_width=SAMPLE_WIDTH)
+        # Feed in 0.25 s pieces, like the live stream would
+        step = audio.sample_rate // 4 * SAMPLE_WIDTH
+        for i in range(0, len(data), step):
+            session.feed(data[i:i + step])
+        return session.finish()
+
+
+class WhisperCppSTT(STTBackend):
+    name = "whisper_cpp"
+
+    def __init__(self, binary: Optional[str] = None, model_path: Optional[str] = None, threads: int = 4):
+        self.binary = binary or os.environ.get("WHISPER_CPP_BIN", "whisper-cli")
+        self.model_path = model_path or os.environ.get("WHISPER_CPP_MODEL", "models/ggml-base.en.bin")
+        self.threads = threads
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"whisper.cpp model not found at {self.model_path} (set WHISPER_CPP_MODEL)")
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        # whisper.cpp wants 16 kHz 16-bit mono WAV
+        wav = audio.get_wav_data(convert_rate=16000, convert_width=SAMPLE_WIDTH)
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(wav)
+            result = subprocess.run(
+                [self.binary, "-m", self.model_path, "-f", path, "-t", str(self.threads),
+                 "-l", "en", "-nt", "-np"],
+                capture_output=True, text=True, check=True
+            )
+        finally:
+            os.remove(path)
+        return " ".join(result.stdout.split())
+
+
+STT_BACKENDS = {
+    "google": GoogleSTT,
+    "vosk": VoskSTT,
+    "whisper_cpp": WhisperCppSTT,
+}
+
+
+def create_stt(name: str, **kwargs) -> STTBackend:
+    if name not in STT_BACKENDS:
+        raise ValueError(f"Unknown STT backend '{name}' (choose from {', '.join(STT_BACKENDS)})")
+    return STT_BACKENDS[name](**kwargs)
+
+
+# ============================================================
+# STREAMING PIPELINE
+# ============================================================
+
+class StreamingTranscriber:
+    """
+    AudioCapture listener: decodes each utterance on a worker thread while it
+    is still being spoken, so the capture thread never waits for STT.
+    """
+
+    def __init__(self, backend: STTBackend, sample_rate: int = 16000,
+                 on_partial: Optional[Callable[[str], None]] = None):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.on_partial = on_partial
+        # ("start" | "frame" | "end", frame bytes / overlapping flag) from the capture thread
+        self._events: "queue.Queue[tuple]" = queue.Queue()
+        # (text, overlapped ANU's speech)
+        self.transcripts: "queue.Queue[tuple]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="stt", daemon=True)
+        self._thread.start()
+
+        self.utterances = 0
+        self.partials = 0
+        self.failures = 0
+
+    # Called by AudioCapture on its thread: just hand the work over
+    def speech_started(self):
+        self._events.put(("start", None))
+
+    def speech_frame(self, frame: bytes):
+        self._events.put(("frame", frame))
+
+    def speech_ended(self, overlapping: bool = False):
+        self._events.put(("end", overlapping))
+
+    def get_transcript(self, timeout: Optional[float] = None) -> Optional[tuple]:
+        """Next (text, overlapping) transcript, or None if none arrived within timeout."""
+        try:
+            return self.transcripts.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def discard(self) -> int:
+        dropped = 0
+        while True:
+            try:
+                self.transcripts.get_nowait()
+            except queue.Empty:
+                return dropped
+            dropped += 1
+
+    def _run(self):
+        session = None
+        last_partial = None
+        while True:
+            kind, data = self._events.get()
+            try:
+                if kind == "start":
+                    session = self.backend.start_stream(self.sample_rate)
+                    last_partial = None
+                elif kind == "frame" and session is not None:
+                    partial = session.feed(data)
+                    if partial and partial != last_partial:
+                        last_partial = partial
+                        self.partials += 1
+                        if self.on_partial:
+                            self.on_partial(partial)
+                elif kind == "end" and session is not None:
+                    with tracer.span("stt", backend=self.backend.name):
+                        text = session.finish()
+                    session = None
+                    self.utterances += 1
+                    if text:
+                        self.transcripts.put((text, data))
+            except Exception as e:
+                self.failures += 1
+                session = None
+                print(f"STT Error ({self.backend.name}): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.backend.name,
+            "utterances": self.utterances,
+            "partials": self.partials,
+            "failures": self.failures,
+            "backlog": self._events.qsize()
+        }
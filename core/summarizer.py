@@ -0,0 +1,163 @@
+"""
+Rolling conversation summary for ANU
+Turns that fall out of the engine's context window are compressed on a
+background thread into a running summary, so long-range facts survive while
+the prompt stays bounded. The summary is a list of timestamped chunks; when
+it outgrows its token budget the oldest chunks are merged into a coarser,
+higher-level chunk (hierarchical summarization).
+
+summarize_fn(lines, max_tokens) -> str does the compression (the engine
+plugs in a Gemini call); without one, or if it fails, an extractive
+fallback keeps the first sentence of each message.
+"""
+
+import re
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+from core.conversation_state import _estimate_tokens
+from core.tracing import tracer
+
+# (timestamp ISO string, lines of text) for one evicted turn
+Turn = Tuple[str, List[str]]
+
+
+def extractive_summary(lines: List[str], max_tokens: int) -> str:
+    """Offline fallback: the first sentence of each line, cut to the budget."""
+    max_chars = max_tokens * 4
+    kept = []
+    used = 0
+    for line in lines:
+        first = re.split(r"(?<=[.!?])\s", line.strip(), maxsplit=1)[0]
+        if len(first) > 160:
+            first = first[:157] + "..."
+        if used + len(first) > max_chars:
+            break
+        kept.append(first)
+        used += len(first) + 2
+    return "; ".join(kept)
+
+
+def _format_range(start: str, end: str) -> str:
+    try:
+        start_dt, end_dt = datetime.fromisoformat(start), datetime.fromisoformat(end)
+    except (TypeError, ValueError):
+        return ""
+    if start_dt.date() == end_dt.date():
+        return f"{start_dt.strftime('%Y-%m-%d %H:%M')}-{end_dt.strftime('%H:%M')}"
+    return f"{start_dt.strftime('%Y-%m-%d %H:%M')} to {end_dt.strftime('%Y-%m-%d %H:%M')}"
+
+
+class RollingSummarizer:
+    def __init__(self, token_budget: int = 400, chunk_tokens: int = 120,
+                 summarize_fn: Optional[Callable[[List[str], int], str]] = None,
+                 on_update: Optional[Callable[[List[Dict[str, Any]]], None]] = None):
+        # Upper bound for the whole summary text
+        self.token_budget = token_budget
+        # Target size of one chunk (an evicted batch or a merge of chunks)
+        self.chunk_tokens = chunk_tokens
+        self.summarize_fn = summarize_fn
+        # Called with the chunks after every change (persistence, engine)
+        self.on_update = on_update
+
+        # Oldest first: {"level", "start", "end", "text"}
+        self.chunks: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarizer")
+        self.summarized_turns = 0
+        self.merges = 0
+
+    def load(self, chunks: List[Dict[str, Any]]):
+        with self._lock:
+            self.chunks = list(chunks)
+
+    def text(self) -> str:
+        """The summary as prompt text, one timestamped chunk per line."""
+        with self._lock:
+            chunks = list(self.chunks)
+        lines = []
+        for chunk in chunks:
+            when = _format_range(chunk["start"], chunk["end"])
+            lines.append(f"[{when}] {chunk['text']}" if when else chunk["text"])
+        return "\n".join(lines)
+
+    # ============================================================
+    # SUMMARIZATION
+    # ============================================================
+
+    def add_turns(self, turns: List[Turn]):
+        """Queue evicted turns for summarization (returns immediately)."""
+        if turns:
+            self._executor.submit(self._process, list(turns))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until every queued batch has been summarized."""
+        self._executor.submit(lambda: None).result(timeout)
+
+    def _summarize(self, lines: List[str], max_tokens: int) -> str:
+        if self.summarize_fn:
+            try:
+                with tracer.span("summarize", lines=len(lines)):
+                    summary = self.summarize_fn(lines, max_tokens)
+                if summary:
+                    return summary.strip()
+            except Exception as e:
+                print(f"Summarization failed, using extractive summary: {e}")
+        return extractive_summary(lines, max_tokens)
+
+    def _process(self, turns: List[Turn]):
+        try:
+            lines = [line for _, turn_lines in turns for line in turn_lines]
+            chunk = {
+                "level": 0,
+                "start": turns[0][0],
+                "end": turns[-1][0],
+                "text": self._summarize(lines, self.chunk_tokens)
+            }
+            with self._lock:
+                self.chunks.append(chunk)
+            self.summarized_turns += len(turns)
+            self._compress()
+
+            if self.on_update:
+                with self._lock:
+                    chunks = list(self.chunks)
+                self.on_update(chunks)
+        except Exception as e:
+            print(f"Error updating conversation summary: {e}")
+
+    def _compress(self):
+        """Merge the oldest chunks into a higher-level one until the summary fits."""
+        while _estimate_tokens(self.text()) > self.token_budget:
+            with self._lock:
+                chunks = list(self.chunks)
+            if len(chunks) == 1:
+                # A single chunk that is still too long: cut it down
+                chunk = dict(chunks[0], text=extractive_summary([chunks[0]["text"]], self.token_budget - 20))
+                with self._lock:
+                    self.chunks = [chunk]
+                return
+
+            # Merge the oldest half (at least two chunks)
+            count = max(2, len(chunks) // 2)
+            oldest = chunks[:count]
+            merged = {
+                "level": max(c["level"] for c in oldest) + 1,
+                "start": oldest[0]["start"],
+                "end": oldest[-1]["end"],
+                "text": self._summarize([c["text"] for c in oldest], self.chunk_tokens)
+            }
+            with self._lock:
+                # Chunks are only appended concurrently, so the oldest are unchanged
+                self.chunks = [merged] + self.chunks[count:]
+            self.merges += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "chunks": len(self.chunks),
+            "summarized_turns": self.summarized_turns,
+            "merges": self.merges,
+            "tokens": _estimate_tokens(self.text()) if self.chunks else 0
+        }
@@ -0,0 +1,127 @@
+"""
+Tool Result Cache for ANU
+Memoizes tool calls (weather, news, running apps...) per skill-declared policy:
+
+    {
+        "ttl": 600,                  # seconds a result stays fresh
+        "key_args": ["city"],        # arguments that form the key (default: all)
+        "cacheable": True,           # False disables caching for the tool
+        "invalidates": ["get_x"]     # tools whose entries this tool clears
+    }
+"""
+
+import json
+import time
+import threading
+import functools
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional, Iterable
+
+
+def _is_error(result: Any) -> bool:
+    """Tool errors are never cached."""
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except ValueError:
+            return False
+    if isinstance(result, dict):
+        return result.get("status") == "error" or "error" in result
+    return False
+
+
+class ToolResultCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(tool_name: str, kwargs: Dict[str, Any], key_args: Optional[Iterable[str]]) -> tuple:
+        if key_args is None:
+            key_args = sorted(kwargs)
+        return (tool_name,) + tuple(
+            (arg, json.dumps(kwargs.get(arg), sort_keys=True, default=str)) for arg in key_args
+        )
+
+    def get(self, key: tuple) -> tuple:
+        """Return (found, result)."""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key: tuple, result: Any, ttl: float):
+        with self._lock:
+            self.entries[key] = (time.monotonic() + ttl, result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tool_names: Iterable[str]):
+        """Drop every entry belonging to the given tools."""
+        tool_names = set(tool_names)
+        with self._lock:
+            stale = [key for key in self.entries if key[0] in tool_names]
+            for key in stale:
+                del self.entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def wrap(self, tool_name: str, func: Callable, policy: Dict[str, Any]) -> Callable:
+        """Return func wrapped according to its cache policy."""
+        cacheable = policy.get("cacheable", True) and policy.get("ttl", 0) > 0
+        invalidates = policy.get("invalidates") or []
+        if not cacheable and not invalidates:
+            return func
+
+        ttl = policy.get("ttl", 0)
+        key_args = policy.get("key_args")
+
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            if not cacheable:
+                result = func(**kwargs)
+                self.invalidate(invalidates)
+                return result
+
+            key = self.make_key(tool_name, kwargs, key_args)
+            found, result = self.get(key)
+            if found:
+                print(f"   (cached result for {tool_name})")
+                return result
+
+            result = func(**kwargs)
+            if not _is_error(result):
+                self.put(key, result, ttl)
+            if invalidates:
+                self.invalidate(invalidates)
+            return result
+
+        return wrapper
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self.entries)
+        }
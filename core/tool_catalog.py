@@ -0,0 +1,186 @@
+"""
+Tool Catalog for ANU
+Registered tool declarations keyed by name: the owning skill, the catalog
+version the tool was added at, an enabled flag and serialized forms for both
+payload shapes (OpenAI/Groq "tools" entries and Gemini function declarations).
+
+Registering a name twice replaces the old declaration instead of shipping both.
+Payload lists are built once per catalog version and shared until the next change.
+"""
+
+import json
+import threading
+from typing import List, Dict, Any, Optional, Iterable
+
+
+class ToolEntry:
+    def __init__(self, schema: Dict[str, Any], owner: Optional[str], version: int, enabled: bool = True):
+        func_def = schema.get("function", {})
+        self.name: str = func_def.get("name")
+        self.owner = owner
+        self.version = version
+        self.enabled = enabled
+
+        # OpenAI/Groq shape, as declared by the skill
+        self.openai: Dict[str, Any] = schema
+        # Gemini FunctionDeclaration shape
+        self.gemini: Dict[str, Any] = {
+            "name": self.name,
+            "description": func_def.get("description", ""),
+            "parameters": func_def.get("parameters", {})
+        }
+        self._openai_json: Optional[str] = None
+
+    @property
+    def openai_json(self) -> str:
+        if self._openai_json is None:
+            self._openai_json = json.dumps(self.openai, sort_keys=True)
+        return self._openai_json
+
+
+class ToolCatalog:
+    def __init__(self):
+        # Insertion-ordered, so payloads keep registration order
+        self.entries: Dict[str, ToolEntry] = {}
+        self.version = 0
+        self._lock = threading.Lock()
+        # Serialized payloads, valid for self._payload_version
+        self._payloads: Dict[str, Any] = {}
+        self._payload_version = None
+
+    # ============================================================
+    # MUTATION
+    # ============================================================
+
+    def add(self, schema: Dict[str, Any], owner: Optional[str] = None) -> Optional[ToolEntry]:
+        """Add (or replace) a tool declaration; non-function schemas are ignored."""
+        if schema.get("type") != "function" or not schema.get("function", {}).get("name"):
+            return None
+        with self._lock:
+            entries = dict(self.entries)
+            entry = self._add(entries, schema, owner, self.version + 1)
+            self._replace(entries)
+            return entry
+
+    def add_many(self, schemas: Iterable[Dict[str, Any]], owner: Optional[str] = None):
+        """Add several declarations as one change."""
+        with self._lock:
+            entries = dict(self.entries)
+            for schema in schemas:
+                if schema.get("type") == "function" and schema.get("function", {}).get("name"):
+                    self._add(entries, schema, owner, self.version + 1)
+            self._replace(entries)
+
+    @staticmethod
+    def _add(entries: Dict[str, ToolEntry], schema: Dict[str, Any], owner: Optional[str],
+             version: int) -> ToolEntry:
+        """Put one declaration into `entries` (a working copy, not yet published)."""
+        name = schema["function"]["name"]
+        existing = entries.get(name)
+        if existing is not None and existing.owner != owner:
+            print(f"Tool '{name}' from {owner} replaces the one from {existing.owner}")
+        # Disabling survives re-registration (e.g. a hot reload)
+        entry = ToolEntry(schema, owner, version, existing.enabled if existing else True)
+        entries[name] = entry
+        return entry
+
+    def replace_owner(self, owners: Iterable[str], schemas_by_owner: Dict[str, List[Dict[str, Any]]]):
+        """Drop every tool owned by `owners`, then add the new ones, as one change."""
+        owners = set(owners)
+        with self._lock:
+            kept = {name: entry for name, entry in self.entries.items() if entry.owner not in owners}
+            disabled = {name for name, entry in self.entries.items() if not entry.enabled}
+            version = self.version + 1
+            for owner, schemas in schemas_by_owner.items():
+                for schema in schemas:
+                    name = schema.get("function", {}).get("name")
+                    if schema.get("type") != "function" or not name:
+                        continue
+                    if name in kept and kept[name].owner != owner:
+                        print(f"Tool '{name}' from {owner} replaces the one from {kept[name].owner}")
+                    kept[name] = ToolEntry(schema, owner, version, name not in disabled)
+            self._replace(kept)
+
+    def remove(self, name: str) -> bool:
+        with self._lock:
+            if name not in self.entries:
+                return False
+            self._replace({k: v for k, v in self.entries.items() if k != name})
+            return True
+
+    def set_enabled(self, name: str, enabled: bool) -> bool:
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                return False
+            if entry.enabled != enabled:
+                entry.enabled = enabled
+                self.version += 1
+            return True
+
+    def _replace(self, entries: Dict[str, ToolEntry]):
+        # Changes are made on a copy and published here in one assignment,
+        # so readers iterating the previous dict are unaffected. The version
+        # moves after the new entries are visible, so payloads cached for it
+        # are never built from the old ones.
+        self.entries = entries
+        self.version += 1
+
+    # ============================================================
+    # LOOKUP / PAYLOADS
+    # ============================================================
+
+    def get(self, name: str) -> Optional[ToolEntry]:
+        return self.entries.get(name)
+
+    def owner_of(self, name: str) -> Optional[str]:
+        entry = self.entries.get(name)
+        return entry.owner if entry else None
+
+    def is_enabled(self, name: str) -> bool:
+        entry = self.entries.get(name)
+        return bool(entry and entry.enabled)
+
+    def names(self, include_disabled: bool = False) -> List[str]:
+        return [name for name, entry in self.entries.items() if include_disabled or entry.enabled]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _cached(self, key: str, build):
+        version = self.version
+        if self._payload_version != version:
+            self._payloads = {}
+            self._payload_version = version
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = build()
+            self._payloads[key] = payload
+        return payload
+
+    def openai_tools(self) -> List[Dict[str, Any]]:
+        """Enabled tools in the OpenAI/Groq `tools` shape."""
+        return self._cached("openai", lambda: [e.openai for e in self.entries.values() if e.enabled])
+
+    def openai_json(self) -> str:
+        """openai_tools() serialized, e.g. for request bodies or cache keys."""
+        return self._cached("openai_json", lambda: "[" + ",".join(
+            e.openai_json for e in self.entries.values() if e.enabled) + "]")
+
+    def gemini_declarations(self, names: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Gemini function declarations for the enabled tools (optionally a subset)."""
+        declarations = self._cached("gemini", lambda: [e.gemini for e in self.entries.values() if e.enabled])
+        if names is None:
+            return declarations
+        names = set(names)
+        return [d for d in declarations if d["name"] in names]
+
+    def gemini_tools(self, names: Optional[Iterable[str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """The Gemini `tools` payload, or None if no tool is enabled."""
+        declarations = self.gemini_declarations(names)
+        if not declarations:
+            return None
+        return [{"function_declarations": declarations}]
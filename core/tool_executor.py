@@ -0,0 +1,209 @@
+"""
+Parallel tool execution for ANU
+Runs the function calls of one model turn concurrently on a bounded thread pool
+"""
+
+import time
+import asyncio
+import threading
+import inspect
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Any
+from core.registry import SkillRegistry
+from core.tracing import tracer
+
+
+class ToolExecutor:
+    def __init__(self, registry: SkillRegistry, max_workers: int = 4, timeout: float = 30.0,
+                 max_abandoned: int = 16):
+        self.registry = registry
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="anu-tool")
+        # Tools that opted out of concurrency share a single worker
+        self._serial_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="anu-tool-serial")
+        # A timed-out tool keeps its worker thread (Python can't kill it); the
+        # pool is replaced so later calls don't queue behind it. Past
+        # max_abandoned hung threads, pools are no longer replaced.
+        self.max_abandoned = max_abandoned
+        self.abandoned = 0
+        self.pool_replacements = 0
+
+    def _call_tool(self, function_name: str, function_args: Dict[str, Any]) -> Any:
+        function_to_call = self.registry.get_function(function_name)
+
+        if not function_to_call:
+            return {"error": f"Tool '{function_name}' not found."}
+
+        try:
+            with tracer.span(f"tool:{function_name}"):
+                tool_result = function_to_call(**function_args)
+                if inspect.iscoroutine(tool_result):
+                    # async def tools called from the synchronous path
+                    tool_result = asyncio.run(tool_result)
+            print(f"   Result ({function_name}): {str(tool_result)[:100]}")
+            return tool_result
+        except Exception as e:
+            print(f"   Error ({function_name}): {e}")
+            return {"error": f"Tool execution error: {str(e)}"}
+
+    @staticmethod
+    def _format_response(function_name: str, tool_result: Any) -> Dict[str, Any]:
+        return {
+            "function_response": {
+                "name": function_name,
+                "response": tool_result
+            }
+        }
+
+    def _timeout_result(self, function_name: str) -> Dict[str, Any]:
+        print(f"   Timeout ({function_name}) after {self.timeout}s")
+        return {"error": f"Tool '{function_name}' timed out after {self.timeout} seconds."}
+
+    def _submit(self, pool: ThreadPoolExecutor, call: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue one call; the entry records when it actually starts running."""
+        call.update(serial=pool is not self._pool, started=threading.Event(), started_at=None)
+
+        def run():
+            call["started_at"] = time.monotonic()
+            call["started"].set()
+            return self._call_tool(call["name"], call["args"])
+
+        call["future"] = pool.submit(run)
+        return call
+
+    def _wait(self, call: Dict[str, Any]) -> Any:
+        """
+        Result of one call. The timeout runs from when the call starts, so
+        calls queued behind a slow one keep their full budget; waiting in
+        the queue gets its own budget of the same length.
+        """
+        if not call["started"].wait(self.timeout):
+            call["future"].cancel()
+            raise FutureTimeoutError()
+        remaining = call["started_at"] + self.timeout - time.monotonic()
+        return call["future"].result(timeout=max(0.0, remaining))
+
+    def _abandon_worker(self, serial: bool, waiting: List[Dict[str, Any]] = ()) -> bool:
+        """
+        Count a worker lost to a hung tool and swap in a fresh pool, moving
+        the calls queued on the old one over. Returns False once too many
+        workers are abandoned (the pool is then left as it is).
+        """
+        self.abandoned += 1
+        if self.abandoned > self.max_abandoned:
+            print(f"   {self.abandoned} tool workers hung, no longer replacing pools")
+            return False
+
+        if serial:
+            wedged = self._serial_pool
+            self._serial_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="anu-tool-serial")
+        else:
+            wedged = self._pool
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="anu-tool")
+        self.pool_replacements += 1
+        # Calls still running on the old pool finish there; queued ones move
+        wedged.shutdown(wait=False, cancel_futures=bool(waiting))
+        for call in waiting:
+            if call["serial"] == serial and call["future"].cancelled():
+                self._submit(self._serial_pool if serial else self._pool, call)
+        return True
+
+    def execute(self, function_calls: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Execute Gemini function calls and return function_response parts
+        in the same order as the calls.
+        """
+        calls = []
+
+        for func_call in function_calls:
+            function_name = func_call.name
+            # Gemini provides args as a dict already
+            function_args = dict(func_call.args) if func_call.args else {}
+            print(f"   Calling: {function_name}")
+
+            if self.registry.is_concurrent(function_name):
+                pool = self._pool
+            else:
+                pool = self._serial_pool
+            calls.append(self._submit(pool, {"name": function_name, "args": function_args}))
+
+        function_responses = []
+        # Pools already replaced in this batch (keyed by serial)
+        replaced = set()
+
+        for i, call in enumerate(calls):
+            try:
+                tool_result = self._wait(call)
+            except FutureTimeoutError:
+                tool_result = self._timeout_result(call["name"])
+                if call["started"].is_set():
+                    # The wedged worker would block later calls on its pool
+                    if call["serial"] in replaced:
+                        self.abandoned += 1
+                    elif self._abandon_worker(call["serial"], calls[i + 1:]):
+                        replaced.add(call["serial"])
+
+            function_responses.append(self._format_response(call["name"], tool_result))
+
+        return function_responses
+
+    async def _call_tool_async(self, function_name: str, function_args: Dict[str, Any]) -> Any:
+        function_to_call = self.registry.get_function(function_name)
+
+        if function_to_call and inspect.iscoroutinefunction(function_to_call):
+            try:
+                with tracer.span(f"tool:{function_name}"):
+                    tool_result = await function_to_call(**function_args)
+                print(f"   Result ({function_name}): {str(tool_result)[:100]}")
+                return tool_result
+            except Exception as e:
+                print(f"   Error ({function_name}): {e}")
+                return {"error": f"Tool execution error: {str(e)}"}
+
+        # Sync tools run on the same pools as the synchronous path
+        if self.registry.is_concurrent(function_name):
+            pool = self._pool
+        else:
+            pool = self._serial_pool
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, self._call_tool, function_name, function_args)
+
+    async def execute_async(self, function_calls: List[Any]) -> List[Dict[str, Any]]:
+        """
+        asyncio version of execute(): async def tools are awaited directly,
+        sync tools run in the executor. Responses keep call order.
+        """
+        async def run_one(function_name: str, function_args: Dict[str, Any]) -> Any:
+            try:
+                return await asyncio.wait_for(
+                    self._call_tool_async(function_name, function_args),
+                    timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                if not inspect.iscoroutinefunction(self.registry.get_function(function_name)):
+                    # A sync tool keeps its pool worker busy
+                    self._abandon_worker(not self.registry.is_concurrent(function_name))
+                return self._timeout_result(function_name)
+
+        names = []
+        calls = []
+        for func_call in function_calls:
+            function_name = func_call.name
+            function_args = dict(func_call.args) if func_call.args else {}
+            print(f"   Calling: {function_name}")
+            names.append(function_name)
+            calls.append(run_one(function_name, function_args))
+
+        results = await asyncio.gather(*calls)
+        return [self._format_response(name, result) for name, result in zip(names, results)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "abandoned_workers": self.abandoned,
+            "pool_replacements": self.pool_replacements
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+        self._serial_pool.shutdown(wait=False)
@@ -0,0 +1,130 @@
+"""
+Tool Selector for ANU
+Scores the registered tools against the user prompt (TF-IDF over tool names,
+descriptions and parameter descriptions) so only the top-k declarations are
+sent to Gemini, which keeps per-request input tokens down.
+"""
+
+import re
+import json
+import math
+from collections import Counter
+from typing import List, Dict, Any, Optional, Set
+
+STOPWORDS = {
+    "a", "an", "the", "to", "of", "for", "on", "in", "at", "my", "me", "i",
+    "please", "can", "could", "you", "would", "will", "is", "it", "its", "and",
+    "or", "with", "this", "that", "be", "by", "from", "as", "if", "e", "g",
+    "what", "whats", "s", "do", "does", "anu", "optional", "default",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for token in re.findall(r"[a-z0-9]+", text.lower().replace("_", " ")):
+        if token in STOPWORDS:
+            continue
+        # Cheap plural folding: "emails" -> "email", "events" -> "event"
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def estimate_tokens(declarations: List[Dict[str, Any]]) -> int:
+    """Rough input-token estimate (~4 characters per token)."""
+    return len(json.dumps(declarations)) // 4
+
+
+class ToolSelector:
+    def __init__(self, top_k: int = 10, min_score: float = 0.1, context_weight: float = 0.5):
+        self.top_k = top_k
+        # Below this best score nothing looks relevant: send the full set
+        self.min_score = min_score
+        self.context_weight = context_weight
+
+        self._indexed_version = None
+        self._vectors: Dict[str, Dict[str, float]] = {}
+        self._idf: Dict[str, float] = {}
+
+        self.requests = 0
+        self.fallbacks = 0
+        self.tokens_saved = 0
+
+    @staticmethod
+    def _tool_text(func_def: Dict[str, Any]) -> str:
+        parts = [func_def.get("name", ""), func_def.get("name", ""), func_def.get("description", "")]
+        properties = func_def.get("parameters", {}).get("properties", {})
+        for param_name, param in properties.items():
+            parts.append(param_name)
+            parts.append(str(param.get("description", "")))
+        return " ".join(parts)
+
+    def index(self, tools_schema: List[Dict[str, Any]], version: int):
+        """Build TF-IDF vectors for the tools; no-op if version is unchanged."""
+        if self._indexed_version == version:
+            return
+
+        documents = {}
+        for tool in tools_schema:
+            func_def = tool.get("function", {})
+            if func_def.get("name"):
+                documents[func_def["name"]] = Counter(tokenize(self._tool_text(func_def)))
+
+        num_docs = len(documents)
+        doc_freq = Counter()
+        for counts in documents.values():
+            doc_freq.update(counts.keys())
+        self._idf = {term: math.log((num_docs + 1) / (df + 1)) + 1 for term, df in doc_freq.items()}
+
+        self._vectors = {}
+        for name, counts in documents.items():
+            vector = {term: tf * self._idf[term] for term, tf in counts.items()}
+            norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            self._vectors[name] = {term: w / norm for term, w in vector.items()}
+
+        self._indexed_version = version
+
+    def score(self, prompt: str, context: Optional[List[str]] = None) -> List[tuple]:
+        """Return [(score, tool_name)] sorted by descending relevance."""
+        query = Counter()
+        for term in tokenize(prompt):
+            query[term] += 1.0
+        for text in context or []:
+            for term in tokenize(text):
+                query[term] += self.context_weight
+
+        weighted = {t: w * self._idf[t] for t, w in query.items() if t in self._idf}
+        norm = math.sqrt(sum(w * w for w in weighted.values())) or 1.0
+
+        scores = []
+        for name, vector in self._vectors.items():
+            score = sum(w * vector.get(term, 0.0) for term, w in weighted.items()) / norm
+            scores.append((score, name))
+        scores.sort(key=lambda item: (-item[0], item[1]))
+        return scores
+
+    def select(self, prompt: str, context: Optional[List[str]] = None) -> Optional[Set[str]]:
+        """
+        Return the names of the top-k tools for this prompt, or None when the
+        full set should be sent (nothing scored as relevant).
+        """
+        scores = self.score(prompt, context)
+        if not scores or scores[0][0] < self.min_score:
+            return None
+        return {name for _, name in scores[:self.top_k]}
+
+    def record(self, full_declarations: List[Dict[str, Any]], sent_declarations: List[Dict[str, Any]]) -> int:
+        """Record a request's savings; returns the estimated tokens saved."""
+        saved = estimate_tokens(full_declarations) - estimate_tokens(sent_declarations)
+        self.requests += 1
+        self.tokens_saved += saved
+        return saved
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "fallbacks": self.fallbacks,
+            "tokens_saved": self.tokens_saved,
+            "avg_tokens_saved": self.tokens_saved / self.requests if self.requests else 0
+        }
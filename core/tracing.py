@@ -0,0 +1,135 @@
+"""
+Lightweight span tracing for ANU
+Times the voice pipeline (STT, model iterations, tool calls, history writes, TTS)
+into a ring buffer that can be exported as JSONL or Chrome trace-event JSON
+(open in chrome://tracing or https://ui.perfetto.dev).
+
+Cheap enough to leave on: a span is two perf_counter_ns() calls and a deque append.
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+
+class Tracer:
+    def __init__(self, max_spans: int = 20000, enabled: bool = True):
+        self.enabled = enabled
+        # Ring buffer of finished spans; deque.append is thread-safe
+        self.spans = deque(maxlen=max_spans)
+        self.trace_id = 0
+        self._trace_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def new_trace(self, name: str = "turn") -> int:
+        """Start a new trace (e.g. one user turn); later spans belong to it."""
+        with self._lock:
+            self.trace_id += 1
+            self._trace_names[self.trace_id] = name
+            # Keep the name table bounded along with the span buffer
+            if len(self._trace_names) > 1000:
+                oldest = min(self._trace_names)
+                del self._trace_names[oldest]
+            return self.trace_id
+
+    def record(self, name: str, start_ns: int, end_ns: int, **attrs):
+        """Record a span measured by the caller (perf_counter_ns timestamps)."""
+        if not self.enabled:
+            return
+        self.spans.append((self.trace_id, name, start_ns, end_ns, threading.get_ident(), attrs))
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.spans.append((self.trace_id, name, start, time.perf_counter_ns(), threading.get_ident(), attrs))
+
+    def traced(self, name: Optional[str] = None):
+        """Decorator form of span()."""
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # ============================================================
+    # QUERY / EXPORT
+    # ============================================================
+
+    def recent_traces(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Group the buffered spans by trace, most recent last."""
+        traces: Dict[int, Dict[str, Any]] = {}
+        for trace_id, name, start, end, tid, attrs in list(self.spans):
+            trace = traces.setdefault(trace_id, {
+                "trace_id": trace_id,
+                "name": self._trace_names.get(trace_id, "startup"),
+                "spans": []
+            })
+            trace["spans"].append({
+                "name": name,
+                "start_ms": start / 1e6,
+                "duration_ms": (end - start) / 1e6,
+                "thread": tid,
+                **({"attrs": attrs} if attrs else {})
+            })
+        return [traces[k] for k in sorted(traces)][-limit:]
+
+    def export_jsonl(self, path: str):
+        """One JSON object per span."""
+        with open(path, 'w') as f:
+            for trace_id, name, start, end, tid, attrs in list(self.spans):
+                f.write(json.dumps({
+                    "trace_id": trace_id,
+                    "name": name,
+                    "start_ms": start / 1e6,
+                    "duration_ms": (end - start) / 1e6,
+                    "thread": tid,
+                    "attrs": attrs
+                }, default=str) + "\n")
+
+    def export_chrome(self, path: str):
+        """Chrome trace-event format (complete 'X' events)."""
+        pid = os.getpid()
+        events = []
+        for trace_id, name, start, end, tid, attrs in list(self.spans):
+            events.append({
+                "name": name,
+                "cat": self._trace_names.get(trace_id, "startup"),
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": (end - start) / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": dict(attrs, trace_id=trace_id)
+            })
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+    def dump(self, prefix: str = "anu_trace"):
+        """Write both export formats; used by main.py --trace on exit."""
+        if not self.spans:
+            return
+        try:
+            self.export_jsonl(f"{prefix}.jsonl")
+            self.export_chrome(f"{prefix}.json")
+            print(f"Trace written to {prefix}.jsonl and {prefix}.json ({len(self.spans)} spans)")
+        except Exception as e:
+            print(f"Error writing trace: {e}")
+
+
+# Process-wide tracer used by the pipeline
+tracer = Tracer()
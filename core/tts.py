@@ -0,0 +1,382 @@
+"""
+Text-to-speech worker for ANU
+One long-lived thread owns the synthesis backend and speaks queued
+utterances in priority order, so speak() returns immediately. Voices are
+detected once when the backend starts. interrupt() (barge-in, pause)
+stops the current utterance and drops everything queued.
+
+Backends:
+  - SayBackend: macOS `say` (pyttsx3's run loop conflicts with the Qt loop
+    there); one process per utterance, terminated on interrupt
+  - Pyttsx3Backend: one pyttsx3 engine, created on the worker thread
+
+With a TTSAudioCache (core/tts_cache.py), repeated phrases are rendered to a
+WAV file once and afterwards played straight from the cache through the
+platform's audio player, skipping synthesis.
+"""
+
+import os
+import sys
+import time
+import shutil
+import queue
+import itertools
+import threading
+import subprocess
+from concurrent.futures import Future
+from typing import Optional
+
+from core.tracing import tracer
+from core.tts_cache import cache_key
+
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 5
+# Cache pre-warming: only runs when nothing else is queued
+PRIORITY_BACKGROUND = 9
+
+
+class AudioPlayer:
+    """Plays WAV files with the platform's player; stop() cuts playback off."""
+
+    # Linux players in order of preference
+    LINUX_PLAYERS = [
+        ["aplay", "-q"],
+        ["paplay"],
+        ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"],
+    ]
+
+    def __init__(self):
+        self._process: Optional[subprocess.Popen] = None
+        self.command = None
+        if sys.platform == "darwin":
+            self.command = ["afplay"]
+        elif sys.platform != "win32":
+            for command in self.LINUX_PLAYERS:
+                if shutil.which(command[0]):
+                    self.command = command
+                    break
+
+    @property
+    def available(self) -> bool:
+        return sys.platform == "win32" or self.command is not None
+
+    def play(self, path: str):
+        if sys.platform == "win32":
+            import winsound
+            winsound.PlaySound(path, winsound.SND_FILENAME)
+            return
+        self._process = subprocess.Popen(self.command + [path])
+        self._process.wait()
+        self._process = None
+
+    def stop(self):
+        if sys.platform == "win32":
+            import winsound
+            winsound.PlaySound(None, 0)
+            return
+        process = self._process
+        if process and process.poll() is None:
+            process.terminate()
+
+
+class SayBackend:
+    # (voice, rate) in order of preference
+    VOICE_OPTIONS = [
+        ("Veena", 180),    # Indian English
+        ("Nicky", 185),    # Cute, young sounding
+        ("Samantha", 175), # Natural fallback
+    ]
+
+    def __init__(self):
+        self.voice, self.rate = "Samantha", 175
+        self._process: Optional[subprocess.Popen] = None
+        self.player = AudioPlayer()
+
+    def start(self):
+        # Listing voices takes a few hundred ms: do it once, not per utterance
+        try:
+            available = subprocess.run(["say", "-v", "?"], capture_output=True, text=True).stdout.lower()
+        except Exception as e:
+            print(f"TTS voice detection error: {e}")
+            available = ""
+        for voice, rate in self.VOICE_OPTIONS:
+            if voice.lower() in available:
+                self.voice, self.rate = voice, rate
+                break
+        print(f"Voice set to: {self.voice}")
+
+    def say(self, text: str):
+        # Arguments are passed without a shell, so no quoting is needed
+        self._process = subprocess.Popen(["say", "-v", self.voice, "-r", str(self.rate), text])
+        self._process.wait()
+        self._process = None
+
+    def voice_params(self):
+        return self.voice, self.rate, None
+
+    def render(self, text: str, path: str):
+        """Synthesize text into a 16-bit mono WAV file instead of the speakers."""
+        subprocess.run(["say", "-v", self.voice, "-r", str(self.rate), "-o", path,
+                        "--file-format=WAVE", "--data-format=LEI16@22050", text], check=True)
+
+    def play(self, path: str):
+        self.player.play(path)
+
+    def stop(self):
+        process = self._process
+        if process and process.poll() is None:
+            process.terminate()
+        self.player.stop()
+
+
+class Pyttsx3Backend:
+    # (voice name, rate, volume) in order of preference
+    # Preferences: Veena (Indian), Nicky (faster, cuter), Samantha (most natural), Karen (Australian)
+    PREFERRED_VOICES = [
+        ("Veena", 175, 0.98),      # Indian English - if available (High priority!)
+        ("Nicky", 180, 0.98),      # Young, cute sounding
+        ("Samantha", 170, 0.98),   # Natural, slightly faster for cuteness
+        ("Karen", 175, 0.98),      # Australian English (similar to Indian English)
+        ("Moira", 175, 0.98),      # Irish accent, very sweet
+        ("Tessa", 175, 0.98),      # South African, pleasant
+    ]
+
+    def __init__(self):
+        self.engine = None
+        self._stop_requested = False
+        self.player = AudioPlayer()
+
+    def start(self):
+        import pyttsx3
+        # pyttsx3 engines belong to the thread that created them
+        self.engine = pyttsx3.init()
+        self.engine.connect('started-word', self._on_word)
+        self._set_female_voice()
+
+    def _set_female_voice(self):
+        voices = self.engine.getProperty('voices')
+        for voice_name, rate, volume in self.PREFERRED_VOICES:
+            for voice in voices:
+                if voice_name in voice.name:
+                    self.engine.setProperty('voice', voice.id)
+                    self.engine.setProperty('rate', rate)
+                    self.engine.setProperty('volume', volume)
+                    try:
+                        self.engine.setProperty('pitch', 1.2)  # Higher pitch for cute voice
+                    except Exception:
+                        pass  # Some engines don't support pitch
+                    print(f"Voice set to: {voice_name} (Classic Indian girl with cute voice)")
+                    return
+
+        # Last fallback to any female voice
+        for voice in voices:
+            if "female" in voice.name.lower() or "female" in str(voice.gender).lower():
+                self.engine.setProperty('voice', voice.id)
+                self.engine.setProperty('rate', 165)
+                self.engine.setProperty('volume', 0.95)
+                return
+
+    def _on_word(self, name, location, length):
+        # engine.stop() is only safe from inside the engine's own loop
+        if self._stop_requested:
+            self.engine.stop()
+
+    def say(self, text: str):
+        self._stop_requested = False
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def voice_params(self):
+        try:
+            pitch = self.engine.getProperty('pitch')
+        except Exception:
+            pitch = None
+        return self.engine.getProperty('voice'), self.engine.getProperty('rate'), pitch
+
+    def render(self, text: str, path: str):
+        self._stop_requested = False
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+
+    def play(self, path: str):
+        self.player.play(path)
+
+    def stop(self):
+        self._stop_requested = True
+        self.player.stop()
+
+
+def default_backend():
+    # On macOS with a GUI/Threading environment, pyttsx3's loop often conflicts
+    # with the main thread event loop (PyQt), so use the system 'say' command
+    return SayBackend() if sys.platform == "darwin" else Pyttsx3Backend()
+
+
+class TTSWorker:
+    def __init__(self, backend=None, cache=None):
+        self.backend = backend or default_backend()
+        self.cache = None
+        self.set_cache(cache)
+        # (priority, sequence, text, future, generation); sequence keeps FIFO
+        # order within a priority, generation invalidates pre-interrupt items.
+        # Pre-warm jobs have no future and don't count as speaking.
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._current: Optional[Future] = None
+        # Utterances queued or playing; guarded by _idle
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._generation = 0
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.spoken = 0
+        self.interrupted = 0
+
+    def set_cache(self, cache):
+        """Attach a TTSAudioCache; needs a backend that can render and play files."""
+        player = getattr(self.backend, "player", None)
+        self.cache = cache if hasattr(self.backend, "render") and player and player.available else None
+
+    @property
+    def is_speaking(self) -> bool:
+        """True while an utterance is playing or waiting in the queue."""
+        return self._pending > 0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="tts", daemon=True)
+                self._thread.start()
+
+    def say(self, text: str, priority: int = PRIORITY_NORMAL) -> Future:
+        """Queue text to be spoken; the future resolves to True once spoken (False if interrupted)."""
+        self.start()
+        future = Future()
+        with self._idle:
+            self._pending += 1
+        self._queue.put((priority, next(self._sequence), text, future, self._generation))
+        return future
+
+    def prewarm(self, phrases):
+        """Render known phrases into the audio cache in the background."""
+        if self.cache is None:
+            return
+        self.start()
+        for text in phrases:
+            self.cache.pin(text)
+            self._queue.put((PRIORITY_BACKGROUND, next(self._sequence), text, None, self._generation))
+
+    def _finish(self, future: Future, completed: bool):
+        future.set_result(completed)
+        with self._idle:
+            self._pending -= 1
+            self._idle.notify_all()
+
+    def interrupt(self):
+        """Barge-in: stop the current utterance and drop everything queued."""
+        self._generation += 1
+        dropped = 0
+        prewarm = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[3] is None:
+                prewarm.append(item[:4] + (self._generation,))
+                continue
+            self._finish(item[3], False)
+            dropped += 1
+        # Pre-warming isn't speech: keep it queued
+        for item in prewarm:
+            self._queue.put(item)
+        if self._current is not None:
+            self.backend.stop()
+            dropped += 1
+        self.interrupted += dropped
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is playing or queued."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self.is_speaking:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    # ============================================================
+    # WORKER
+    # ============================================================
+
+    def _render(self, text: str, key: str) -> Optional[str]:
+        """Synthesize text into the cache; returns the cached file path."""
+        tmp_path = os.path.join(self.cache.cache_dir, f".{key}.tmp.wav")
+        start = time.perf_counter()
+        try:
+            with tracer.span("tts_render", chars=len(text)):
+                self.backend.render(text, tmp_path)
+            return self.cache.put(key, tmp_path, text, time.perf_counter() - start)
+        except Exception as e:
+            print(f"TTS cache render error: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+    def _speak(self, text: str, generation: int):
+        if self.cache is None:
+            self.backend.say(text)
+            return
+
+        key = cache_key(text, *self.backend.voice_params())
+        path = self.cache.get(key)
+        if path is None and self.cache.should_store(text):
+            path = self._render(text, key)
+            if generation != self._generation:
+                # Interrupted while rendering
+                return
+        if path is not None:
+            try:
+                self.backend.play(path)
+                return
+            except Exception as e:
+                print(f"TTS playback error, synthesizing instead: {e}")
+        self.backend.say(text)
+
+    def _run(self):
+        try:
+            self.backend.start()
+        except Exception as e:
+            print(f"TTS Error: {e}")
+
+        while True:
+            _, _, text, future, generation = self._queue.get()
+            if future is None:
+                # Pre-warm: render into the cache unless it's already there
+                try:
+                    key = cache_key(text, *self.backend.voice_params())
+                    if key not in self.cache.entries:
+                        self._render(text, key)
+                except Exception as e:
+                    print(f"TTS cache render error: {e}")
+                continue
+            if generation != self._generation:
+                # Queued before an interrupt that raced with this get()
+                self._finish(future, False)
+                continue
+
+            self._current = future
+            start_ns = time.perf_counter_ns()
+            try:
+                self._speak(text, generation)
+            except Exception as e:
+                print(f"TTS Error: {e}")
+            finally:
+                tracer.record("tts", start_ns, time.perf_counter_ns(), chars=len(text))
+                completed = generation == self._generation
+                self._current = None
+                if completed:
+                    self.spoken += 1
+                self._finish(future, completed)
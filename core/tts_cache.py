@@ -0,0 +1,154 @@
+"""
+Rendered speech cache for ANU
+ANU repeats a handful of lines all the time (greeting, "Task completed.",
+goodbye, error messages). Rendered audio is kept as 16-bit PCM WAV files,
+content-addressed by text + voice + rate + pitch, so a repeat plays straight
+from disk instead of being synthesized again. The cache directory is bounded
+in bytes with least-recently-used eviction.
+
+A phrase is only rendered into the cache once it has been heard before (or
+was pinned with prewarm), so one-off model answers don't churn the cache.
+The cache is used from the TTS thread only.
+"""
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from core.persistence import writer
+
+# Longer text is a one-off answer, not a stock phrase
+MAX_TEXT_CHARS = 200
+# Phrases remembered as seen once, oldest forgotten first
+MAX_SEEN = 1000
+
+
+def cache_key(text: str, voice: Any, rate: Any, pitch: Any) -> str:
+    raw = json.dumps([text, str(voice), rate, pitch])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class TTSAudioCache:
+    def __init__(self, cache_dir: str = "tts_cache", max_bytes: int = 20 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, "index.json")
+        # key -> {"bytes", "synth_ms", "text"}; least recently used first
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.total_bytes = 0
+        # Phrases seen once this session (bounded, oldest first), and
+        # phrases always worth caching
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._pinned = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.saved_ms = 0.0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        index = writer.pending_data(self.index_file)
+        if index is None and os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error loading TTS cache index: {e}")
+        for key, entry in (index or {}).items():
+            if os.path.exists(self.path(key)):
+                self.entries[key] = entry
+                self.total_bytes += entry["bytes"]
+
+        # Drop audio files the index doesn't know about (e.g. crash mid-store)
+        for item in os.scandir(self.cache_dir):
+            if item.name.endswith(".wav") and item.name[:-4] not in self.entries:
+                try:
+                    os.remove(item.path)
+                except OSError:
+                    pass
+
+    def _save_index(self):
+        writer.write_json(self.index_file, dict(self.entries))
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    # ============================================================
+    # LOOKUP / STORE
+    # ============================================================
+
+    def pin(self, text: str):
+        """Always cache this phrase (used for pre-warming)."""
+        self._pinned.add(text)
+
+    def should_store(self, text: str) -> bool:
+        """Admit a phrase on its second use, or right away if pinned."""
+        if len(text) > MAX_TEXT_CHARS:
+            return False
+        if text in self._pinned or text in self._seen:
+            return True
+        self._seen[text] = None
+        if len(self._seen) > MAX_SEEN:
+            self._seen.popitem(last=False)
+        return False
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached audio for key (marking it recently used), or None."""
+        entry = self.entries.get(key)
+        if entry is None or not os.path.exists(self.path(key)):
+            if entry is not None:
+                self._drop(key)
+                self._save_index()
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        self.saved_ms += entry["synth_ms"]
+        self._save_index()
+        return self.path(key)
+
+    def put(self, key: str, rendered_path: str, text: str, synth_seconds: float) -> Optional[str]:
+        """Move a freshly rendered file into the cache; returns its cached path."""
+        size = os.path.getsize(rendered_path)
+        if size == 0 or size > self.max_bytes:
+            os.remove(rendered_path)
+            return None
+        if key in self.entries:
+            self._drop(key)
+        os.replace(rendered_path, self.path(key))
+        self.entries[key] = {"bytes": size, "synth_ms": round(synth_seconds * 1000, 1), "text": text}
+        self.total_bytes += size
+        self.stores += 1
+
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+        self._save_index()
+        return self.path(key)
+
+    def _drop(self, key: str):
+        entry = self.entries.pop(key)
+        self.total_bytes -= entry["bytes"]
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "synthesis_saved_ms": round(self.saved_ms, 1)
+        }
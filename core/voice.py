@@ -1,122 +1,133 @@
-import os
-import sys
-import pyttsx3
-import speech_recognition as sr
+import re
+from collections import deque
+from core.tts import TTSWorker, PRIORITY_NORMAL
+from core.tts_cache import TTSAudioCache
+from core.audio_capture import AudioCapture
+from core.stt import create_stt, GoogleSTT, StreamingTranscriber
+from core.wake_word import WakeWordDetector, WakeWordGate
+from core.tracing import tracer
 
-# Initialize engine globally to avoid re-initialization issues
-engine = pyttsx3.init()
+# Lines ANU says all the time; rendered into the audio cache at startup
+COMMON_PHRASES = [
+    "Hello! I'm ANU, your AI assistant. How can I help you today?",
+    "Task completed.",
+    "I'm experiencing a system error. Please try again.",
+    "Goodbye! Have a wonderful day!",
+]
 
-# Set voice to classic Indian girl with cute voice
-def set_female_voice():
-    voices = engine.getProperty('voices')
-    
-    # Try voices optimized for cute, sweet Indian girl sound
-    # Preferences: Veena (Indian), Nicky (faster, cuter), Samantha (most natural), Karen (Australian)
-    preferred_voices = [
-        ("Veena", 175, 0.98),      # Indian English - if available (High priority!)
-        ("Nicky", 180, 0.98),      # Young, cute sounding
-        ("Samantha", 170, 0.98),   # Natural, slightly faster for cuteness
-        ("Karen", 175, 0.98),      # Australian English (similar to Indian English)
-        ("Moira", 175, 0.98),      # Irish accent, very sweet
-        ("Tessa", 175, 0.98),      # South African, pleasant
-    ]
-    
-    for voice_name, rate, volume in preferred_voices:
-        for voice in voices:
-            if voice_name in voice.name:
-                engine.setProperty('voice', voice.id)
-                engine.setProperty('rate', rate)  # Balanced for cute, energetic tone
-                engine.setProperty('volume', volume)  # Full, clear volume
-                # Higher pitch for cuter, more youthful sound
-                try:
-                    engine.setProperty('pitch', 1.2)  # Higher pitch for cute voice
-                except:
-                    pass  # Some engines don't support pitch
-                print(f"Voice set to: {voice_name} (Classic Indian girl with cute voice)")
-                return
-    
-    # Last fallback to any female voice
-    for voice in voices:
-        if "female" in voice.name.lower() or "female" in str(voice.gender).lower():
-             engine.setProperty('voice', voice.id)
-             engine.setProperty('rate', 165)
-             engine.setProperty('volume', 0.95)
-             return
+# One long-lived TTS thread owns the synthesis backend (see core/tts.py)
+tts = TTSWorker()
+
+# What ANU said last, to recognize its own voice picked up by the microphone
+recent_speech = deque(maxlen=8)
+# Share of a transcript's words ANU just said that marks it as an echo
+ECHO_WORD_SHARE = 0.6
 
-set_female_voice()
+def use_speech_cache(cache_dir="tts_cache"):
+    """Play repeated phrases from rendered audio (creates cache_dir)."""
+    tts.set_cache(TTSAudioCache(cache_dir))
 
-# Global flag to check if Jarvis is speaking
-is_speaking = False
+def prewarm_speech(phrases=COMMON_PHRASES):
+    """Render stock phrases into the audio cache in the background."""
+    tts.prewarm(phrases)
 
-def speak(text):
-    global is_speaking
+def is_speaking():
+    """True while anything is playing or queued for speech."""
+    return tts.is_speaking
+
+def stop_speaking():
+    """Barge-in: cut off the current utterance and drop queued ones."""
+    tts.interrupt()
+
+def speak(text, priority=PRIORITY_NORMAL):
+    """
+    Queue text for speech and return immediately. Returns a Future that
+    resolves to True once spoken (False if interrupted); call .result()
+    to block until then.
+    """
     if "{" in text and "}" in text and "status" in text:
         text = "Task completed."
     
     # Print first so user sees it even if audio fails
     print(f"ANU: {text}")
+    recent_speech.append(text)
+    return tts.say(text, priority)
 
-    # Set flag to True before speaking
-    is_speaking = True
-    
+def is_echo(transcript):
+    """True if a transcript heard over ANU's speech is mostly ANU's own words."""
+    words = re.findall(r"[a-z']+", transcript.lower())
+    if not words:
+        return True
+    spoken = set(re.findall(r"[a-z']+", " ".join(recent_speech).lower()))
+    return sum(w in spoken for w in words) / len(words) >= ECHO_WORD_SHARE
+
+def speak_stream(sentences, should_stop=None):
+    """
+    Speak sentences from an iterator (e.g. AnuEngine.stream_conversation)
+    as they arrive. Each sentence is queued on the TTS thread, so the model
+    keeps streaming while earlier sentences are being spoken. Returns once
+    the iterator is exhausted; speech may still be playing.
+    """
+    stopped = False
     try:
-        # On macOS with a GUI/Threading environment, pyttsx3's loop often conflicts 
-        # with the main thread event loop (PyQt). Default to system 'say' command on macOS
-        # to avoid hangs/crashes unless we are strictly in a non-GUI text mode.
-        if sys.platform == "darwin":
-            try:
-                # Escape quotes to prevent shell injection/errors
-                clean_text = text.replace('"', '\\"').replace("'", "")
-                # Try Veena (Indian English) first, then Nicky (cute), then Samantha
-                # Rate 175-180 for energetic, cute tone with higher pitch
-                # Try voices in priority order
-                voice_options = [
-                    ("Veena", 180),    # Indian English
-                    ("Nicky", 185),    # Cute, young sounding
-                    ("Samantha", 175), # Natural fallback
-                ]
-                
-                # Check which voices are available
-                available_voices = os.popen('say -v "?"').read().lower()
-                
-                for voice, rate in voice_options:
-                    if voice.lower() in available_voices:
-                        os.system(f'say -v {voice} -r {rate} "{clean_text}"')
-                        return
-                
-                # Ultimate fallback
-                os.system(f'say -v Samantha -r 175 "{clean_text}"')
-                return
-            except Exception as e2:
-                print(f"TTS Fallback Error: {e2}")
-                # Fall through to pyttsx3 if 'say' fails (unlikely)
-    
-        # Try pyttsx3
-        try:
-            engine.say(text)
-            engine.runAndWait()
-        except Exception as e:
-            print(f"TTS Error: {e}")
-            
-    finally:
-        # Ensure flag is reset to False even if errors occur
-        is_speaking = False
+        for sentence in sentences:
+            if stopped:
+                # Keep draining so the stream can finish, but stay quiet
+                continue
+            if should_stop and should_stop():
+                stopped = True
+                stop_speaking()
+                continue
+            speak(sentence)
+    except Exception as e:
+        print(f"Stream Error: {e}")
 
-def listen():
-    global is_speaking
-    # if system is speaking, don't listen
-    if is_speaking:
-        return "none"
+# One microphone stream for the whole session (see core/audio_capture.py);
+# utterances that overlap ANU's own speech are tagged, see listen()
+capture = AudioCapture(playing=lambda: tts.is_speaking)
+# Speech frames are decoded while the user talks (see core/stt.py)
+transcriber = StreamingTranscriber(GoogleSTT(), sample_rate=capture.sample_rate)
+# Only speech that starts with the wake word reaches STT (see core/wake_word.py)
+wake_gate = WakeWordGate(transcriber, WakeWordDetector.from_dir(sample_rate=capture.sample_rate))
+capture.add_listener(wake_gate)
 
-    r = sr.Recognizer()
-    with sr.Microphone() as source:
-        print("Listening...")
-        r.pause_threshold = 0.8
-        r.adjust_for_ambient_noise(source)
-        try:
-            audio = r.listen(source, timeout=5)
-            print("Recognizing...")
-            query = r.recognize_google(audio)
-            return query.lower()
-        except Exception:
+def use_wake_word(enabled=True):
+    """Gate STT behind the wake word spotter (needs enrolled templates)."""
+    if enabled and not wake_gate.detector.active:
+        print("No wake word templates yet (python -m core.wake_word enroll): every utterance goes to STT")
+    wake_gate.enabled = enabled and wake_gate.detector.active
+
+def use_stt(name, on_partial=None):
+    """Switch the speech-to-text backend; stays on Google if it can't be loaded."""
+    try:
+        transcriber.backend = create_stt(name)
+        print(f"Speech recognition: {name}")
+    except Exception as e:
+        print(f"Could not load {name} STT, using Google: {e}")
+    transcriber.on_partial = on_partial
+
+def discard_input():
+    """Forget speech captured but not yet handled (e.g. while paused)."""
+    capture.discard()
+    transcriber.discard()
+
+def listen(timeout=5):
+    """
+    Transcribe the next captured utterance, or "none" if nothing was heard.
+    Speech heard while ANU was talking is dropped if it is only ANU's own
+    voice; otherwise it is the user talking over ANU, which (once the wake
+    word gate let it through) cuts ANU off.
+    """
+    capture.start()
+    with tracer.span("listen"):
+        result = transcriber.get_transcript(timeout=timeout)
+    if not result:
+        return "none"
+    query, overlapping = result
+    if overlapping:
+        if is_echo(query):
+            print(f"Ignored echo: {query}")
             return "none"
+        if wake_gate.enabled and tts.is_speaking:
+            stop_speaking()
+    return query.lower()
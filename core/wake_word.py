@@ -0,0 +1,366 @@
+"""
+Wake word spotter for ANU
+A lightweight keyword spotter for "anu" that runs on the captured speech
+frames, so full speech recognition only runs on utterances addressed to
+ANU instead of on all background chatter.
+
+Frames are turned into MFCCs incrementally (25 ms windows, 10 ms hop) and
+the most recent ~1.5 s is matched against recorded templates of the wake
+word with subsequence DTW (the word may start anywhere in the window).
+Templates are 16-bit mono WAV recordings in assets/wake_word/; record some
+with:
+
+    python -m core.wake_word enroll
+
+WakeWordGate sits between AudioCapture and the STT listener: speech is held
+back until the wake word is heard, then the whole utterance (wake word
+included) and any follow-up utterances within a short window go to STT.
+"""
+
+import os
+import sys
+import time
+import wave
+from collections import deque
+from typing import Callable, List, Optional, Dict, Any
+
+import numpy as np
+
+WAKE_WORD_DIR = os.path.join("assets", "wake_word")
+# The default threshold is calibrated from template-to-template distances,
+# which needs at least two recordings
+MIN_TEMPLATES = 2
+# Fallback when that calibration isn't possible: a loose bound that rather
+# wakes too often than misses the wake word. With one template it still lets
+# about half of the confusable words in benchmark_wake_word.py --synthetic
+# through, so enroll more samples or pass threshold= explicitly.
+FALLBACK_THRESHOLD = 6.0
+
+
+# ============================================================
+# FEATURES
+# ============================================================
+
+def _mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+
+class MFCCExtractor:
+    """Streaming MFCCs: push() PCM as it arrives, get one feature row per hop."""
+
+    def __init__(self, sample_rate: int = 16000, win_ms: int = 25, hop_ms: int = 10,
+                 n_fft: int = 512, n_mels: int = 26, n_ceps: int = 13):
+        self.win = sample_rate * win_ms // 1000
+        self.hop = sample_rate * hop_ms // 1000
+        self.n_fft = n_fft
+        self.window = np.hamming(self.win)
+
+        # Triangular mel filterbank, 0 Hz to Nyquist
+        points = _mel_to_hz(np.linspace(_mel(0.0), _mel(sample_rate / 2), n_mels + 2))
+        bins = np.floor((n_fft + 1) * points / sample_rate).astype(int)
+        self.filters = np.zeros((n_mels, n_fft // 2 + 1))
+        for m in range(1, n_mels + 1):
+            left, center, right = bins[m - 1], bins[m], bins[m + 1]
+            for k in range(left, center):
+                self.filters[m - 1, k] = (k - left) / max(1, center - left)
+            for k in range(center, right):
+                self.filters[m - 1, k] = (right - k) / max(1, right - center)
+
+        # DCT-II matrix (orthonormal), keeping the first n_ceps coefficients
+        n = np.arange(n_mels)
+        self.dct = np.cos(np.pi / n_mels * (n + 0.5)[None, :] * np.arange(n_ceps)[:, None])
+        self.dct *= np.sqrt(2.0 / n_mels)
+        self.dct[0] /= np.sqrt(2.0)
+
+        self.reset()
+
+    def reset(self):
+        self._samples = np.zeros(0)
+        self._last = 0.0
+
+    def push(self, pcm: bytes) -> np.ndarray:
+        """Feature rows for every complete window in the audio pushed so far."""
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.float64) / 32768.0
+        if samples.size:
+            # Pre-emphasis, carried across frame boundaries
+            emphasized = np.append(samples[0] - 0.97 * self._last, samples[1:] - 0.97 * samples[:-1])
+            self._last = samples[-1]
+            self._samples = np.concatenate((self._samples, emphasized))
+
+        count = 0 if self._samples.size < self.win else 1 + (self._samples.size - self.win) // self.hop
+        if count == 0:
+            return np.zeros((0, self.dct.shape[0]))
+        idx = np.arange(self.win)[None, :] + self.hop * np.arange(count)[:, None]
+        frames = self._samples[idx] * self.window
+        self._samples = self._samples[count * self.hop:]
+
+        power = np.abs(np.fft.rfft(frames, self.n_fft)) ** 2 / self.n_fft
+        energies = np.log(np.maximum(power @ self.filters.T, 1e-10))
+        return energies @ self.dct.T
+
+    def features(self, pcm: bytes) -> np.ndarray:
+        """MFCCs of a whole clip."""
+        self.reset()
+        rows = self.push(pcm)
+        self.reset()
+        return rows
+
+
+def trim_silence(pcm: bytes, sample_rate: int = 16000, floor_db: float = 20.0) -> bytes:
+    """
+    Cut leading/trailing audio that is more than floor_db below the loudest
+    10 ms or close to the background noise (keeping a 50 ms margin).
+    """
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float64)
+    step = sample_rate // 100
+    count = len(samples) // step
+    if count == 0:
+        return pcm
+    rms = np.sqrt((samples[:count * step].reshape(count, step) ** 2).mean(axis=1))
+    threshold = max(rms.max() * 10 ** (-floor_db / 20), np.percentile(rms, 10) * 3)
+    loud = np.nonzero(rms >= threshold)[0]
+    start = max(0, loud[0] - 5) * step
+    end = min(count, loud[-1] + 6) * step
+    return samples[start:end].astype("<i2").tobytes()
+
+
+def template_features(pcm: bytes, extractor: MFCCExtractor) -> np.ndarray:
+    """MFCCs of a wake word recording, with the silence around it removed."""
+    return extractor.features(trim_silence(pcm))
+
+
+def _normalize(features: np.ndarray) -> np.ndarray:
+    """
+    Drop c0 (loudness) and subtract the cepstral mean of the louder half of
+    the rows, i.e. of the speech rather than the silence around it. This
+    removes microphone/channel colouring without depending on how much
+    silence the window happens to hold.
+    """
+    if not len(features):
+        return features
+    loud = features[:, 0] >= np.median(features[:, 0])
+    return features[:, 1:] - features[loud, 1:].mean(axis=0)
+
+
+def subsequence_dtw(template: np.ndarray, window: np.ndarray) -> float:
+    """
+    Cost of the best alignment of the whole template with any stretch of the
+    window, per template frame. Rows are computed with a prefix-min scan, so
+    only the loop over template frames runs in Python.
+    """
+    cost = np.sqrt(((template[:, None, :] - window[None, :, :]) ** 2).sum(axis=2))
+    # Free start: the template may begin at any window frame
+    row = cost[0].copy()
+    for i in range(1, len(template)):
+        # Best way into each column from the previous row (diagonal or vertical)
+        previous = np.minimum(row, np.concatenate(([np.inf], row[:-1])))
+        # Horizontal moves: D[j] = min over k <= j of previous[k] + sum(cost[i, k..j])
+        prefix = np.cumsum(cost[i])
+        row = prefix + np.minimum.accumulate(previous - prefix + cost[i])
+    # Free end
+    return float(row.min() / len(template))
+
+
+# ============================================================
+# DETECTOR
+# ============================================================
+
+class WakeWordDetector:
+    def __init__(self, templates: List[np.ndarray], threshold: Optional[float] = None,
+                 sample_rate: int = 16000, frame_ms: int = 30, check_ms: int = 150):
+        self.extractor = MFCCExtractor(sample_rate)
+        self.templates = [_normalize(t) for t in templates if len(t)]
+        self.sample_rate = sample_rate
+        # Match against a window a bit longer than the longest template
+        longest = max((len(t) for t in self.templates), default=50)
+        self.window_rows = int(longest * 1.5)
+        # Only score once every template can fit the window (see score())
+        self.min_rows = max(self.window_rows // 3, (longest + 1) // 2)
+        self.check_frames = max(1, check_ms // frame_ms)
+        if threshold is None and 0 < len(self.templates) < MIN_TEMPLATES:
+            print(f"⚠️ Only {len(self.templates)} wake word template(s): using the loose fallback threshold")
+        self.threshold = threshold if threshold is not None else self._default_threshold()
+        self.reset()
+
+    @classmethod
+    def from_dir(cls, directory: str = WAKE_WORD_DIR, **kwargs) -> "WakeWordDetector":
+        """Load every WAV template in directory (none: the detector is inactive)."""
+        extractor = MFCCExtractor(kwargs.get("sample_rate", 16000))
+        templates = []
+        if os.path.isdir(directory):
+            for name in sorted(os.listdir(directory)):
+                if name.lower().endswith(".wav"):
+                    templates.append(template_features(read_wav(os.path.join(directory, name)), extractor))
+        return cls(templates, **kwargs)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.templates)
+
+    def _default_threshold(self) -> float:
+        """A bit above how far the templates are from each other."""
+        if len(self.templates) < MIN_TEMPLATES:
+            return FALLBACK_THRESHOLD
+        distances = [subsequence_dtw(a, b) for i, a in enumerate(self.templates)
+                     for j, b in enumerate(self.templates) if i != j and len(b) >= len(a) // 2]
+        return max(distances) * 1.7 if distances else FALLBACK_THRESHOLD
+
+    def reset(self):
+        """Start of a new speech segment."""
+        self.extractor.reset()
+        self._rows = deque(maxlen=self.window_rows)
+        self._frames = 0
+
+    def score(self) -> float:
+        """Best (lowest) template distance over the current window."""
+        window = _normalize(np.array(self._rows))
+        return min((subsequence_dtw(t, window) for t in self.templates if len(t) <= len(window) * 2),
+                   default=float("inf"))
+
+    def process(self, frame: bytes) -> Optional[float]:
+        """Feed one frame; returns the match distance when the wake word is heard."""
+        self._rows.extend(self.extractor.push(frame))
+        self._frames += 1
+        if self._frames % self.check_frames or len(self._rows) < self.min_rows:
+            return None
+        distance = self.score()
+        return distance if distance <= self.threshold else None
+
+    def detect(self, pcm: bytes, frame_bytes: int = 960) -> Optional[float]:
+        """Run over a whole clip; the first match distance, or None."""
+        self.reset()
+        for i in range(0, len(pcm), frame_bytes):
+            distance = self.process(pcm[i:i + frame_bytes])
+            if distance is not None:
+                return distance
+        return None
+
+
+class WakeWordGate:
+    """
+    AudioCapture listener in front of the STT listener. Holds each speech
+    segment back until the wake word is heard in it; speech within
+    follow_up_s of the last accepted utterance goes straight through.
+    """
+
+    def __init__(self, downstream, detector: WakeWordDetector, follow_up_s: float = 8.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.downstream = downstream
+        self.detector = detector
+        self.follow_up_s = follow_up_s
+        # Seconds; benchmarks pass an audio-time clock to run faster than real time
+        self.clock = clock
+        # Without templates (or when disabled) everything goes to STT
+        self.enabled = detector.active
+
+        self._buffer: List[bytes] = []
+        self._forwarding = False
+        self._open_until = float("-inf")
+
+        self.segments = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.cpu_seconds = 0.0
+
+    def speech_started(self):
+        self.segments += 1
+        self._buffer = []
+        self._forwarding = not self.enabled or self.clock() < self._open_until
+        if self._forwarding:
+            self.downstream.speech_started()
+        else:
+            self.detector.reset()
+
+    def speech_frame(self, frame: bytes):
+        if self._forwarding:
+            self.downstream.speech_frame(frame)
+            return
+
+        start = time.thread_time()
+        self._buffer.append(frame)
+        distance = self.detector.process(frame)
+        self.cpu_seconds += time.thread_time() - start
+        if distance is not None:
+            print(f"Wake word detected ({distance:.2f})")
+            self._forwarding = True
+            self.downstream.speech_started()
+            for held in self._buffer:
+                self.downstream.speech_frame(held)
+            self._buffer = []
+
+    def speech_ended(self, overlapping: bool = False):
+        if self._forwarding:
+            self.accepted += 1
+            self.downstream.speech_ended(overlapping)
+            self._open_until = self.clock() + self.follow_up_s
+        else:
+            # Never reached STT
+            self.rejected += 1
+        self._buffer = []
+        self._forwarding = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "templates": len(self.detector.templates),
+            "segments": self.segments,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "spotter_cpu_ms": round(self.cpu_seconds * 1000, 1)
+        }
+
+
+# ============================================================
+# TEMPLATE FILES
+# ============================================================
+
+def read_wav(path: str) -> bytes:
+    with wave.open(path, 'rb') as f:
+        if f.getsampwidth() != 2 or f.getnchannels() != 1:
+            raise ValueError(f"{path}: wake word templates must be 16-bit mono WAV")
+        return f.readframes(f.getnframes())
+
+
+def write_wav(path: str, pcm: bytes, sample_rate: int = 16000):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm)
+
+
+def enroll(count: int = 5, directory: str = WAKE_WORD_DIR):
+    """Record `count` samples of the wake word from the microphone."""
+    from core.audio_capture import AudioCapture
+
+    if count < MIN_TEMPLATES:
+        raise ValueError(f"Record at least {MIN_TEMPLATES} samples so the threshold can be calibrated")
+    os.makedirs(directory, exist_ok=True)
+    capture = AudioCapture(silence_ms=400, max_utterance_s=2.0)
+    capture.start()
+    existing = len([n for n in os.listdir(directory) if n.endswith(".wav")])
+    for i in range(count):
+        print(f"Say 'ANU' ({i + 1}/{count})...")
+        audio = capture.get_utterance(timeout=10)
+        if audio is None:
+            print("Didn't hear anything, skipping")
+            continue
+        path = os.path.join(directory, f"anu_{existing + i + 1:02d}.wav")
+        write_wav(path, audio.frame_data, audio.sample_rate)
+        print(f"Saved {path}")
+    capture.stop()
+
+    total = len([n for n in os.listdir(directory) if n.endswith(".wav")])
+    if total < MIN_TEMPLATES:
+        print(f"Only {total} sample(s) in {directory}; enroll again to reach {MIN_TEMPLATES}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "enroll":
+        enroll(int(sys.argv[2]) if len(sys.argv) > 2 else 5)
+    else:
+        print("Usage: python -m core.wake_word enroll [count]")
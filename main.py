@@ -3,10 +3,20 @@ import sys
 import argparse
 import threading 
 import time
+import atexit
 from dotenv import load_dotenv
-from core.voice import speak, listen
+from core.voice import (speak, speak_stream, listen, stop_speaking, prewarm_speech, tts, use_stt,
+                        use_speech_cache, use_wake_word, discard_input, capture, transcriber, wake_gate)
+from core.stt import STT_BACKENDS
 from core.registry import SkillRegistry
 from core.engine import AnuEngine
+from core.conversation_history import ConversationHistory
+from core.async_engine import AsyncAnuEngine
+from core.response_cache import ResponseCache
+from core.intent_router import IntentRouter
+from core.tool_selector import ToolSelector
+from core.tracing import tracer
+from core.persistence import writer
 from gui.app import run_gui as run_gui_app
 
 # Load Env
@@ -16,25 +26,45 @@ if not os.environ.get("GEMINI_API_KEY"):
     print("Error: GEMINI_API_KEY not found.")
     sys.exit(1)
 
-def anu_loop(pause_event, registry, args):
+# Skill modules hosted in worker processes unless --in-process-skills is given
+OUT_OF_PROCESS_SKILLS = ("camera_skill", "vision_skill", "whatsapp_skill")
+
+def anu_loop(pause_event, registry, history, args):
     """
     Main loop for ANU, running in a separate thread.
     Checks pause_event to determine if it should listen/process.
     """
     # Initialize Engine
-    anu = AnuEngine(registry)
+    response_cache = ResponseCache() if args.response_cache else None
+    intent_router = None if args.no_fast_path else IntentRouter(registry)
+    tool_selector = ToolSelector(top_k=args.tool_top_k) if args.tool_top_k else None
+    engine_class = AsyncAnuEngine if args.async_engine else AnuEngine
+    anu = engine_class(registry, response_cache=response_cache, intent_router=intent_router,
+                       tool_selector=tool_selector, history=history)
 
     if args.text:
         print("ANU: Hello! I'm ANU, your AI assistant. How can I help you today? (Text Mode)")
     else:
+        # Streaming engines show what they heard so far while the user talks
+        use_stt(args.stt, on_partial=lambda partial: print(f"   ...{partial}"))
+        use_wake_word(not args.no_wake_word)
+        use_speech_cache()
         speak("Hello! I'm ANU, your AI assistant. How can I help you today?")
+        # Render the other stock phrases while idle
+        prewarm_speech()
 
     while True:
         # Check for pause
         if pause_event.is_set():
+            # Barge-in: pausing cuts off whatever ANU is saying
+            stop_speaking()
+            # Whatever was said while paused isn't meant for ANU
+            discard_input()
             time.sleep(0.5)
             continue
 
+        tracer.new_trace("turn")
+
         if args.text:
             try:
                 user_query = input("YOU: ").lower()
@@ -51,7 +81,23 @@ def anu_loop(pause_event, registry, args):
         
         if "quit" in user_query: 
             print("Shutting down ANU...")
-            speak("Goodbye! Have a wonderful day!")
+            if anu.response_cache:
+                print(f"Response cache: {anu.response_cache.stats()}")
+            if anu.tool_selector:
+                print(f"Tool selection: {anu.tool_selector.stats()}")
+            print(f"Tool result cache: {registry.tool_cache.stats()}")
+            print(f"Tool workers: {anu.tool_executor.stats()}")
+            # Make sure queued history/memory/cache writes reach disk
+            writer.flush()
+            print(f"Background writes: {writer.stats()}")
+            if tts.cache:
+                print(f"Speech cache: {tts.cache.stats()}")
+            if not args.text:
+                print(f"Speech recognition: {transcriber.stats()}")
+                print(f"Wake word: {wake_gate.stats()}")
+                print(f"Microphone: {capture.stats()}")
+            # Let the goodbye finish before the loop exits
+            speak("Goodbye! Have a wonderful day!").result(timeout=10)
             break
         
         # Wake word / Command filtering Logic
@@ -63,52 +109,96 @@ def anu_loop(pause_event, registry, args):
         
         is_direct = any(cmd in user_query for cmd in direct_commands)
         
+        # The spotter already heard the wake word (STT often spells "anu" differently)
+        wake_word_heard = not args.text and wake_gate.enabled
+
         # Changed wake word from "jarvis" to "anu"
-        if "anu" not in user_query and not is_direct:
+        if "anu" not in user_query and not is_direct and not wake_word_heard:
             print(f"Ignored: {user_query}")
             continue
             
         clean_query = user_query.replace("anu", "").strip()
         
+        turn_start = time.perf_counter_ns()
         try:
             print(f"Thinking: {clean_query}")
-            response = anu.run_conversation(clean_query)
-            
-            # Check pause before speaking response
-            if pause_event.is_set():
+
+            if args.no_stream:
+                response = anu.run_conversation(clean_query)
+
+                # Check pause before speaking response
+                if pause_event.is_set():
+                    continue
+
+                if response:
+                    if args.text:
+                        print(f"ANU: {response}")
+                    else:
+                        speak(response)
                 continue
 
-            if response:
-                if args.text:
-                    print(f"ANU: {response}")
-                else:
-                    speak(response)
+            sentences = anu.stream_conversation(clean_query)
+            if args.text:
+                prefix = "ANU: "
+                for sentence in sentences:
+                    print(f"{prefix}{sentence}", end="", flush=True)
+                    prefix = " "
+                print()
+            else:
+                # Start speaking the first sentence while the rest streams in
+                speak_stream(sentences, should_stop=pause_event.is_set)
         except Exception as e:
             print(f"Main Loop Error: {e}")
             if args.text:
                 print("ANU: I'm experiencing a system error. Please try again.")
             else:
                 speak("I'm experiencing a system error. Please try again.")
+        finally:
+            tracer.record("respond", turn_start, time.perf_counter_ns(), query=clean_query)
 
 def main():
     print("Starting ANU...")
     parser = argparse.ArgumentParser(description="ANU - AI Assistant")
     parser.add_argument("--text", action="store_true", help="Run in text mode (no voice I/O)")
+    parser.add_argument("--async-engine", action="store_true", help="Use the asyncio engine (shared client session)")
+    parser.add_argument("--response-cache", action="store_true", help="Cache responses to repeated tool-free queries")
+    parser.add_argument("--no-fast-path", action="store_true", help="Send every command to the LLM (disable local intent routing)")
+    parser.add_argument("--tool-top-k", type=int, default=0, help="Send only the K most relevant tool declarations (0 = all)")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for the full response before speaking")
+    parser.add_argument("--eager-skills", action="store_true", help="Import every skill at startup instead of on first use")
+    parser.add_argument("--hot-reload", action="store_true", help="Reload skills/ modules when their files change")
+    parser.add_argument("--in-process-skills", action="store_true", help="Run camera/vision/WhatsApp skills in the main process")
+    parser.add_argument("--stt", choices=sorted(STT_BACKENDS), default=os.environ.get("ANU_STT", "google"),
+                        help="Speech-to-text engine (vosk and whisper_cpp run offline)")
+    parser.add_argument("--no-wake-word", action="store_true", help="Send every utterance to STT (no keyword spotter)")
+    parser.add_argument("--trace", action="store_true", help="Dump latency traces (anu_trace.jsonl / anu_trace.json) on exit")
     args = parser.parse_args()
 
+    if args.trace:
+        # The only dump, so quitting by voice or closing the window both write it once
+        atexit.register(tracer.dump)
+
     # 1. Setup Pause Event
     pause_event = threading.Event()
-    context = {"pause_event": pause_event}
+    # Shared by the engine and the history search skill
+    history = ConversationHistory()
+    context = {"pause_event": pause_event, "history": history}
 
     # 2. Initialize Registry and Load Skills
     print("Loading skills...")
     registry = SkillRegistry()
+    if not args.in_process_skills:
+        # Heavy imports (cv2, torch) and the Selenium driver live in worker processes
+        registry.mark_out_of_process(*OUT_OF_PROCESS_SKILLS)
+        atexit.register(registry.stop_skill_hosts)
     skills_dir = os.path.join(os.path.dirname(__file__), "skills")
-    registry.load_skills(skills_dir, context=context)
+    registry.load_skills(skills_dir, context=context, lazy=not args.eager_skills)
+    if args.hot_reload:
+        registry.start_watching()
     
     # 3. Start ANU Loop in Background Thread
     print("Starting ANU...")
-    t = threading.Thread(target=anu_loop, args=(pause_event, registry, args), daemon=True)
+    t = threading.Thread(target=anu_loop, args=(pause_event, registry, history, args), daemon=True)
     t.start()
     
     # 4. Start GUI in Main Thread (Required for PyQt)
@@ -119,6 +119,15 @@ class AdvancedSystemOpsSkill(Skill):
             "get_system_info": self.get_system_info
         }
 
+    def get_cache_policies(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "get_running_apps": {"ttl": 10},
+            "get_system_info": {"ttl": 60},
+            # Opening/closing apps changes what is running
+            "open_application": {"cacheable": False, "invalidates": ["get_running_apps"]},
+            "close_application": {"cacheable": False, "invalidates": ["get_running_apps"]}
+        }
+
     # ---------------- INTERNAL HELPERS ---------------- #
 
     def ensure_macos(self):
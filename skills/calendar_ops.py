@@ -322,5 +322,12 @@ def register():
                 "get_todays_events": get_todays_events,
                 "get_upcoming_events": get_upcoming_events
             }
+        
+        def get_cache_policies(self):
+            return {
+                "get_todays_events": {"ttl": 60},
+                "get_upcoming_events": {"ttl": 60},
+                "add_calendar_event": {"cacheable": False, "invalidates": ["get_todays_events", "get_upcoming_events"]}
+            }
     
     return CalendarSkill()
@@ -7,6 +7,9 @@ class CameraSkill(Skill):
     """
     Skill for capturing photos using the default camera.
     """
+
+    # Single camera device
+    concurrent = False
     
     @property
     def name(self):
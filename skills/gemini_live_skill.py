@@ -24,6 +24,9 @@ class GeminiLiveSkill(Skill):
     Allows real-time video+audio conversation.
     """
 
+    # Toggles the pause_event
+    concurrent = False
+
     @property
     def name(self):
         return "gemini_live_skill"
@@ -0,0 +1,100 @@
+import json
+from typing import List, Dict, Any, Callable
+from core.skill import Skill
+
+class HistorySkill(Skill):
+    """Skill for searching past conversations."""
+
+    def __init__(self):
+        # The ConversationHistory the engine writes to (from the load context)
+        self.history = None
+
+    @property
+    def name(self) -> str:
+        return "history_skill"
+
+    def initialize(self, context: Dict[str, Any]):
+        self.history = context.get("history")
+
+    def get_tools(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": "search_conversation_history",
+                    "description": "Search everything the user and ANU have said in past conversations, e.g. 'what did I say about the trip last week'",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "Words to look for in past messages"
+                            },
+                            "since": {
+                                "type": "string",
+                                "description": "Only messages on or after this date/time (ISO format, e.g. '2025-01-31' or '2025-01-31T18:00') (optional)"
+                            },
+                            "until": {
+                                "type": "string",
+                                "description": "Only messages on or before this date/time (ISO format) (optional)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of messages to return (default 5)"
+                            }
+                        },
+                        "required": ["query"]
+                    }
+                }
+            }
+        ]
+
+    def get_functions(self) -> Dict[str, Callable]:
+        return {
+            "search_conversation_history": self.search_conversation_history
+        }
+
+    def search_conversation_history(self, query: str, since: str = None, until: str = None, limit: int = 5) -> str:
+        """
+        Full-text search over the stored conversation history.
+
+        Args:
+            query: Words to search for
+            since: Optional lower time bound (ISO)
+            until: Optional upper time bound (ISO)
+            limit: Maximum number of results
+
+        Returns:
+            JSON string with the matching messages
+        """
+        try:
+            if self.history is None:
+                return json.dumps({
+                    "status": "error",
+                    "message": "Conversation history is not available"
+                })
+
+            # A bare date as the upper bound means the whole day
+            if until and len(until) == 10:
+                until += "T23:59:59.999999"
+
+            results = self.history.search(query, since, until, int(limit or 5))
+            if not results:
+                return json.dumps({
+                    "status": "not_found",
+                    "message": f"I couldn't find anything about '{query}' in our past conversations"
+                })
+
+            return json.dumps({
+                "status": "success",
+                "count": len(results),
+                "messages": [
+                    {"role": r["role"], "content": r["content"], "timestamp": r["timestamp"]}
+                    for r in results
+                ]
+            })
+        except Exception as e:
+            return json.dumps({
+                "status": "error",
+                "message": f"Failed to search conversation history: {str(e)}"
+            })
@@ -1,7 +1,25 @@
 import os
 import json
+import copy
+import functools
+import threading
 from typing import List, Dict, Any, Callable
 from core.skill import Skill
+from core.persistence import writer
+from core.memory_index import MemoryIndex
+
+# Cosine score from which a similar key is treated as the memory asked for
+MATCH_THRESHOLD = 0.35
+# Lower bar for listing "did you mean" suggestions
+SUGGEST_THRESHOLD = 0.15
+
+def _synchronized(method):
+    """Run a tool under the skill's lock: the executor may call tools in parallel."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class MemorySkill(Skill):
     """Skill for persistent memory storage and retrieval."""
@@ -10,6 +28,11 @@ class MemorySkill(Skill):
         # Store memory in user's home directory
         self.memory_file = os.path.expanduser("~/.jarvic_memory.json")
         self._ensure_memory_file()
+        # Similarity index over keys and values, kept in step with the file
+        self.index = MemoryIndex()
+        self._indexed_mtime = None
+        # Tools load, change and save the whole file; serialize them
+        self._lock = threading.RLock()
     
     @property
     def name(self) -> str:
@@ -22,7 +45,10 @@ class MemorySkill(Skill):
                 json.dump({}, f)
 
     def _load_memory(self) -> dict:
-        """Load memory from file."""
+        """Load memory from file (or the snapshot still waiting to be written)."""
+        pending = writer.pending_data(self.memory_file)
+        if pending is not None:
+            return copy.deepcopy(pending)
         try:
             with open(self.memory_file, 'r') as f:
                 return json.load(f)
@@ -30,9 +56,21 @@ class MemorySkill(Skill):
             return {}
 
     def _save_memory(self, memory: dict):
-        """Save memory to file."""
-        with open(self.memory_file, 'w') as f:
-            json.dump(memory, f, indent=2)
+        """Save memory to file in the background."""
+        writer.write_json(self.memory_file, memory, indent=2)
+
+    def _sync_index(self, memory: dict):
+        """Rebuild the parts of the index that changed since the file was last indexed."""
+        if writer.pending_data(self.memory_file) is not None:
+            # Our own write is queued; remember/forget already updated the index
+            return
+        try:
+            mtime = os.path.getmtime(self.memory_file)
+        except OSError:
+            mtime = None
+        if mtime != self._indexed_mtime or len(self.index) != len(memory):
+            self.index.sync(memory)
+            self._indexed_mtime = mtime
 
     def get_tools(self) -> List[Dict[str, Any]]:
         return [
@@ -74,6 +112,27 @@ class MemorySkill(Skill):
                     }
                 }
             },
+            {
+                "type": "function",
+                "function": {
+                    "name": "search_memories",
+                    "description": "Find stored memories related to a topic when the exact memory key is unknown",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "What to look for (e.g., 'birthday', 'wifi password')"
+                            },
+                            "top_k": {
+                                "type": "integer",
+                                "description": "Maximum number of memories to return (default 3)"
+                            }
+                        },
+                        "required": ["query"]
+                    }
+                }
+            },
             {
                 "type": "function",
                 "function": {
@@ -109,10 +168,21 @@ class MemorySkill(Skill):
         return {
             "remember_fact": self.remember_fact,
             "retrieve_memory": self.retrieve_memory,
+            "search_memories": self.search_memories,
             "list_all_memories": self.list_all_memories,
             "forget_fact": self.forget_fact
         }
 
+    def get_cache_policies(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "retrieve_memory": {"ttl": 300},
+            "search_memories": {"ttl": 300},
+            "list_all_memories": {"ttl": 300},
+            "remember_fact": {"cacheable": False, "invalidates": ["retrieve_memory", "search_memories", "list_all_memories"]},
+            "forget_fact": {"cacheable": False, "invalidates": ["retrieve_memory", "search_memories", "list_all_memories"]}
+        }
+
+    @_synchronized
     def remember_fact(self, key: str, value: str) -> str:
         """
         Store a fact in memory.
@@ -126,8 +196,10 @@ class MemorySkill(Skill):
         """
         try:
             memory = self._load_memory()
+            self._sync_index(memory)
             memory[key] = value
             self._save_memory(memory)
+            self.index.add(key, value)
             
             return json.dumps({
                 "status": "success",
@@ -141,6 +213,7 @@ class MemorySkill(Skill):
                 "message": f"Failed to store memory: {str(e)}"
             })
 
+    @_synchronized
     def retrieve_memory(self, item_name: str) -> str:
         """
         Retrieve a fact from memory.
@@ -160,17 +233,72 @@ class MemorySkill(Skill):
                     "item_name": item_name,
                     "value": memory[item_name]
                 })
-            else:
+
+            # No exact key: fall back to the closest stored memory, so the
+            # model doesn't have to guess other key spellings
+            self._sync_index(memory)
+            matches = [(score, key) for score, key in self.index.search(item_name, top_k=3) if key in memory]
+            if matches and matches[0][0] >= MATCH_THRESHOLD:
+                score, key = matches[0]
                 return json.dumps({
-                    "status": "not_found",
-                    "message": f"I don't remember anything about '{item_name}'"
+                    "status": "success",
+                    "item_name": key,
+                    "value": memory[key],
+                    "requested": item_name,
+                    "similarity": round(score, 2)
                 })
+
+            result = {
+                "status": "not_found",
+                "message": f"I don't remember anything about '{item_name}'"
+            }
+            suggestions = [key for score, key in matches if score >= SUGGEST_THRESHOLD]
+            if suggestions:
+                result["similar_keys"] = suggestions
+            return json.dumps(result)
         except Exception as e:
             return json.dumps({
                 "status": "error",
                 "message": f"Failed to recall memory: {str(e)}"
             })
 
+    @_synchronized
+    def search_memories(self, query: str, top_k: int = 3) -> str:
+        """
+        Find the memories most similar to a query.
+
+        Args:
+            query: Topic to look for
+            top_k: Maximum number of results
+
+        Returns:
+            JSON string with the matching memories, best first
+        """
+        try:
+            memory = self._load_memory()
+            self._sync_index(memory)
+            matches = [
+                {"key": key, "value": memory[key], "similarity": round(score, 2)}
+                for score, key in self.index.search(query, top_k=int(top_k or 3), min_score=SUGGEST_THRESHOLD)
+                if key in memory
+            ]
+            if not matches:
+                return json.dumps({
+                    "status": "not_found",
+                    "message": f"I don't have any memories related to '{query}'"
+                })
+            return json.dumps({
+                "status": "success",
+                "count": len(matches),
+                "memories": matches
+            })
+        except Exception as e:
+            return json.dumps({
+                "status": "error",
+                "message": f"Failed to search memories: {str(e)}"
+            })
+
+    @_synchronized
     def list_all_memories(self) -> str:
         """
         List all stored memories.
@@ -199,6 +327,7 @@ class MemorySkill(Skill):
                 "message": f"Failed to list memories: {str(e)}"
             })
 
+    @_synchronized
     def forget_fact(self, key: str) -> str:
         """
         Delete a memory.
@@ -213,8 +342,10 @@ class MemorySkill(Skill):
             memory = self._load_memory()
             
             if key in memory:
+                self._sync_index(memory)
                 del memory[key]
                 self._save_memory(memory)
+                self.index.remove(key)
                 
                 return json.dumps({
                     "status": "success",
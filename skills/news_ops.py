@@ -226,5 +226,11 @@ def register():
                 "get_news_headlines": get_news_headlines,
                 "search_news": search_news
             }
+        
+        def get_cache_policies(self):
+            return {
+                "get_news_headlines": {"ttl": 900},
+                "search_news": {"ttl": 900}
+            }
     
     return NewsSkill()
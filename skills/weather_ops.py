@@ -57,6 +57,12 @@ class WeatherSkill(Skill):
             "get_current_location_weather": self.get_current_location_weather
         }
 
+    def get_cache_policies(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "get_weather": {"ttl": 600, "key_args": ["city", "pincode"]},
+            "get_current_location_weather": {"ttl": 600}
+        }
+
     def get_weather(self, city: str, pincode: str = None) -> str:
         """
         Fetch weather data for a specific city or pincode.
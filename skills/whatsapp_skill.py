@@ -10,6 +10,9 @@ class WhatsappSkill(Skill):
     Skill for sending WhatsApp messages using Selenium and a local contact list.
     """
 
+    # Single shared Chrome driver
+    concurrent = False
+
     def __init__(self):
         self.contacts_path = os.path.join(
             os.path.dirname(os.path.dirname(__file__)),
@@ -102,6 +105,14 @@ class WhatsappSkill(Skill):
             "import_device_contacts": self.import_device_contacts
         }
 
+    def get_cache_policies(self):
+        """Contact list only changes through the tools below"""
+        return {
+            "list_whatsapp_contacts": {"ttl": 3600},
+            "add_whatsapp_contact": {"cacheable": False, "invalidates": ["list_whatsapp_contacts"]},
+            "import_device_contacts": {"cacheable": False, "invalidates": ["list_whatsapp_contacts"]}
+        }
+
     def _load_contacts(self):
         try:
             if not os.path.exists(self.contacts_path):